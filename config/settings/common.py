@@ -108,7 +108,7 @@ LOCAL_APPS = [
     'datahub.activity_stream.apps.ActivityStreamConfig',
     'datahub.user_event_log',
     'datahub.activity_feed',
-    'datahub.dataset',
+    'datahub.dataset.apps.DatasetConfig',
 ]
 
 MI_APPS = [
@@ -361,13 +361,47 @@ ES_VERIFY_CERTS = env.bool('ES_VERIFY_CERTS', True)
 ES_INDEX_PREFIX = env('ES_INDEX_PREFIX')
 ES_INDEX_SETTINGS = {}
 ES_BULK_MAX_CHUNK_BYTES = 10 * 1024 * 1024  # 10MB
+# How long alias-to-index resolutions are cached for when syncing objects (0 to disable)
+ES_ALIAS_CACHE_TIMEOUT = env.int('ES_ALIAS_CACHE_TIMEOUT', default=60)  # seconds
+# Number of partitions (parallel Celery tasks) to split each model into when resyncing after a
+# mapping migration
+ES_RESYNC_PARTITIONS = env.int('ES_RESYNC_PARTITIONS', default=1)
+# Whether to disable refreshes and replicas for new indices while they are populated during
+# a mapping migration (documents changed during the migration are then only visible in
+# searches once the migration completes)
+ES_MIGRATION_BULK_LOAD_MODE = env.bool('ES_MIGRATION_BULK_LOAD_MODE', default=False)
+# Number of segments to force merge new indices to before completing a mapping migration in
+# bulk load mode (0 to disable)
+ES_MIGRATION_FORCE_MERGE_MAX_NUM_SEGMENTS = env.int(
+    'ES_MIGRATION_FORCE_MERGE_MAX_NUM_SEGMENTS',
+    default=0,
+)
+# Number of threads sending bulk requests while the next batches are fetched from the database
+# during full syncs (0 to fetch and send batches serially)
+ES_BULK_SYNC_CONCURRENCY = env.int('ES_BULK_SYNC_CONCURRENCY', default=0)
+# Maximum number of fetched batches waiting to be sent to Elasticsearch during pipelined syncs
+ES_BULK_SYNC_MAX_PENDING_BATCHES = env.int('ES_BULK_SYNC_MAX_PENDING_BATCHES', default=2)
 ES_SEARCH_REQUEST_TIMEOUT = env.int('ES_SEARCH_REQUEST_TIMEOUT', default=20)  # seconds
 ES_SEARCH_REQUEST_WARNING_THRESHOLD = env.int(
     'ES_SEARCH_REQUEST_WARNING_THRESHOLD',
     default=10,  # seconds
 )
-SEARCH_EXPORT_MAX_RESULTS = 5000
+# How long (in seconds) to cache search results for, for views that opt in (0 to disable)
+SEARCH_RESULT_CACHE_TIMEOUT = env.int('SEARCH_RESULT_CACHE_TIMEOUT', default=30)
+# Percentage of search queries to execute with the Elasticsearch profile API enabled (for the
+# slow query log)
+SEARCH_QUERY_PROFILE_SAMPLE_RATE = env.float('SEARCH_QUERY_PROFILE_SAMPLE_RATE', default=0)
+# Number of the slowest query shapes to keep in the slow query log (0 to disable)
+SEARCH_SLOW_QUERY_LOG_SIZE = env.int('SEARCH_SLOW_QUERY_LOG_SIZE', default=100)
+# Minimum time a search query must take to be added to the slow query log
+SEARCH_SLOW_QUERY_LOG_THRESHOLD = env.int(
+    'SEARCH_SLOW_QUERY_LOG_THRESHOLD',
+    default=1000,  # milliseconds
+)
+SEARCH_EXPORT_MAX_RESULTS = env.int('SEARCH_EXPORT_MAX_RESULTS', default=5000)
 SEARCH_EXPORT_SCROLL_CHUNK_SIZE = 1000
+# Number of search export rows to fetch from the database in each query
+SEARCH_EXPORT_DB_CHUNK_SIZE = 500
 SEARCH_CONFIGURE_CONNECTION_ON_READY = True
 SEARCH_CONNECT_SIGNAL_RECEIVERS_ON_READY = True
 CHAR_FIELD_MAX_LENGTH = 255
@@ -441,6 +475,22 @@ if REDIS_BASE_URL:
                 'simulate': False,
             }
         },
+        'sync_all_pending_search_objects': {
+            'task': 'datahub.search.tasks.sync_all_pending_objects',
+            'schedule': 60.0,  # Every 60 seconds
+        },
+        'delete_all_pending_search_documents': {
+            'task': 'datahub.search.tasks.delete_all_pending_documents',
+            'schedule': 60.0,  # Every 60 seconds
+        },
+        'prune_slow_search_queries': {
+            'task': 'datahub.search.tasks.prune_slow_search_queries',
+            'schedule': crontab(minute='*/15'),
+        },
+        'backfill_activity_stream_activities': {
+            'task': 'datahub.activity_stream.tasks.backfill_activities',
+            'schedule': crontab(minute=30, hour=2),
+        },
     }
 
     if env.bool('ENABLE_DAILY_HIERARCHY_ROLLOUT', False):
@@ -463,6 +513,9 @@ if REDIS_BASE_URL:
         CELERY_BEAT_SCHEDULE['sync_es'] = {
             'task': 'datahub.search.tasks.sync_all_models',
             'schedule': crontab(minute=0, hour=1),
+            'kwargs': {
+                'incremental': env.bool('ENABLE_INCREMENTAL_DAILY_ES_SYNC', False),
+            },
         }
 
     if env.bool('ENABLE_SPI_REPORT_GENERATION', False):
@@ -473,7 +526,7 @@ if REDIS_BASE_URL:
 
     if env.bool('ENABLE_MI_DASHBOARD_FEED', False):
         CELERY_BEAT_SCHEDULE['mi_dashboard_feed'] = {
-            'task': 'datahub.mi_dashboard.tasks.mi_investment_project_etl_pipeline',
+            'task': 'datahub.mi_dashboard.tasks.run_mi_pipelines',
             'schedule': crontab(minute=0, hour=1),
         }
 
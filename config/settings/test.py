@@ -41,6 +41,12 @@ ES_INDEX_SETTINGS = {
     # This disables automatic refresh in tests to avoid inadvertently relying on it.
     'refresh_interval': -1,
 }
+# Indices and aliases are frequently recreated during tests, so alias resolutions are not
+# cached by default
+ES_ALIAS_CACHE_TIMEOUT = 0
+SEARCH_RESULT_CACHE_TIMEOUT = 0
+# Many search tests don't use the database, so the slow query log is disabled by default
+SEARCH_SLOW_QUERY_LOG_SIZE = 0
 DOCUMENT_BUCKET = 'test-bucket'
 AV_V2_SERVICE_URL = 'http://av-service/'
 
@@ -22,6 +22,7 @@ class InteractionActivityViewSet(ActivityViewSet):
     Interaction ViewSet for the activity stream
     """
 
+    activity_type = 'interaction'
     pagination_class = InteractionCursorPagination
     serializer_class = InteractionActivitySerializer
     queryset = get_base_interaction_queryset()
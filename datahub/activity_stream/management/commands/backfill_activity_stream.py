@@ -0,0 +1,38 @@
+from logging import getLogger
+
+from django.core.management.base import BaseCommand
+
+from datahub.activity_stream.registry import ACTIVITY_VIEW_SETS
+from datahub.activity_stream.tasks import backfill_activities
+
+logger = getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Command to render and store activity stream activities that are missing or out of date."""
+
+    def add_arguments(self, parser):
+        """Handle arguments."""
+        parser.add_argument(
+            '--activity-type',
+            action='append',
+            choices=list(ACTIVITY_VIEW_SETS),
+            help='Activity type to backfill. If empty, it backfills all',
+        )
+        parser.add_argument(
+            '--foreground',
+            action='store_true',
+            help='If specified, the command runs in the foreground without needing Celery '
+                 'running. (By default, it runs asynchronously using Celery.)',
+        )
+
+    def handle(self, *args, **options):
+        """Handle."""
+        task_kwargs = {'activity_types': options['activity_type']}
+
+        if options['foreground']:
+            backfill_activities.apply(kwargs=task_kwargs, throw=True)
+            logger.info('Activity stream backfill complete!')
+        else:
+            backfill_activities.apply_async(kwargs=task_kwargs)
+            logger.info('Activity stream backfill scheduled')
@@ -0,0 +1,147 @@
+"""
+Materialised (pre-rendered) activities for the activity stream endpoints.
+
+Rendering activities requires a query with many joins and prefetches, and serialising nested
+objects. As the activity stream service scrapes the endpoints frequently (the last page in
+particular), rendered activities are stored in the MaterialisedActivity model.
+
+The endpoints only fetch the fields needed for pagination for each page of objects (using an
+index range scan), and then read the activities for the page from MaterialisedActivity.
+Activities that are missing or out of date (according to the object's modified_on value and
+the view set's activity_version) are rendered and stored on the fly.
+
+Activities are also rendered in the background when objects are saved (see
+datahub.activity_stream.signal_receivers), and missing activities can be rendered using the
+backfill_activity_stream management command.
+
+Note that changes to related objects (for example, a company's name) are only reflected in
+an activity when the object itself is next modified.
+"""
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from datahub.activity_stream.models import MaterialisedActivity
+from datahub.core.utils import slice_iterable_into_chunks
+
+VERSION_FIELD = 'modified_on'
+BACKFILL_BATCH_SIZE = 500
+
+
+def get_page_queryset(view_set):
+    """
+    Returns a queryset for paginating the objects of an activity view set.
+
+    Only the fields needed for pagination and checking the version of materialised activities
+    are fetched.
+    """
+    model = view_set.queryset.model
+    return model._default_manager.only(VERSION_FIELD, *view_set.pagination_class.ordering)
+
+
+def get_activities(view_set, objects):
+    """
+    Gets the activities for objects (in the same order).
+
+    Materialised activities are used where they are up to date; other activities are rendered
+    and materialised.
+
+    :param view_set:    the activity view set class
+    :param objects:     objects from get_page_queryset()
+    """
+    objects = list(objects)
+    materialised_activities = MaterialisedActivity.objects.filter(
+        activity_type=view_set.activity_type,
+        activity_version=view_set.activity_version,
+        object_id__in=[obj.pk for obj in objects],
+    ).values_list('object_id', 'version', 'activity')
+
+    activities = {}
+    for object_id, version, activity in materialised_activities:
+        activities[object_id] = (version, activity)
+
+    stale_pks = [
+        obj.pk for obj in objects
+        if obj.pk not in activities or activities[obj.pk][0] != getattr(obj, VERSION_FIELD)
+    ]
+    activities = {pk: activity for pk, (_, activity) in activities.items()}
+
+    if stale_pks:
+        activities.update(materialise_activities(view_set, stale_pks))
+
+    # Objects deleted since the page was fetched are skipped
+    return [activities[obj.pk] for obj in objects if obj.pk in activities]
+
+
+def materialise_activities(view_set, pks):
+    """
+    Renders and stores the activities for the objects with the specified primary keys.
+
+    :returns: dict of primary key to rendered activity
+    """
+    instances = view_set.queryset.filter(pk__in=pks)
+    activities = {
+        instance.pk: (getattr(instance, VERSION_FIELD), view_set.serializer_class(instance).data)
+        for instance in instances
+    }
+
+    materialised_activities = [
+        MaterialisedActivity(
+            activity_type=view_set.activity_type,
+            object_id=pk,
+            version=version,
+            activity_version=view_set.activity_version,
+            activity=activity,
+        )
+        for pk, (version, activity) in activities.items()
+    ]
+
+    with transaction.atomic():
+        MaterialisedActivity.objects.filter(
+            activity_type=view_set.activity_type,
+            object_id__in=activities.keys(),
+        ).delete()
+        # Conflicts are possible if the same objects are being materialised concurrently, in
+        # which case the other entries are kept
+        MaterialisedActivity.objects.bulk_create(materialised_activities, ignore_conflicts=True)
+
+    return {pk: activity for pk, (_, activity) in activities.items()}
+
+
+def delete_materialised_activity(view_set, pk):
+    """Deletes the materialised activity for an object (e.g. when the object is deleted)."""
+    MaterialisedActivity.objects.filter(
+        activity_type=view_set.activity_type,
+        object_id=pk,
+    ).delete()
+
+
+def get_stale_queryset(view_set):
+    """
+    Returns a queryset of objects whose activities are missing or out of date.
+
+    (Objects with a null modified_on value, and objects whose activities were rendered with a
+    different activity_version, are always included.)
+    """
+    up_to_date_activities = MaterialisedActivity.objects.filter(
+        activity_type=view_set.activity_type,
+        activity_version=view_set.activity_version,
+        object_id=OuterRef('pk'),
+        version=OuterRef(VERSION_FIELD),
+    )
+    model = view_set.queryset.model
+    return model._default_manager.filter(~Exists(up_to_date_activities))
+
+
+def materialise_stale_activities(view_set, batch_size=BACKFILL_BATCH_SIZE):
+    """
+    Renders and stores activities that are missing or out of date, in batches.
+
+    :returns: the number of activities materialised
+    """
+    stale_pks = get_stale_queryset(view_set).order_by('pk').values_list('pk', flat=True)
+    num_materialised = 0
+
+    for batch in slice_iterable_into_chunks(list(stale_pks), batch_size):
+        num_materialised += len(materialise_activities(view_set, batch))
+
+    return num_materialised
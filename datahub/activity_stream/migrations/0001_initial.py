@@ -0,0 +1,35 @@
+# Generated by Django 3.0.5 on 2020-04-24 14:02
+
+import django.contrib.postgres.fields.jsonb
+import rest_framework.utils.encoders
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaterialisedActivity',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('activity_type', models.CharField(max_length=255)),
+                ('object_id', models.UUIDField()),
+                ('version', models.DateTimeField(blank=True, null=True)),
+                ('activity_version', models.PositiveIntegerField()),
+                ('activity', django.contrib.postgres.fields.jsonb.JSONField(encoder=rest_framework.utils.encoders.JSONEncoder)),
+                ('rendered_on', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'materialised activities',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='materialisedactivity',
+            constraint=models.UniqueConstraint(fields=('activity_type', 'object_id'), name='unique_activity_type_object_id'),
+        ),
+    ]
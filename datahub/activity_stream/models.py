@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.contrib.postgres.fields import JSONField
+from django.db import models
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class MaterialisedActivity(models.Model):
+    """
+    A pre-rendered activity (in Activity Streams format) for an object.
+
+    There is at most one entry per activity type and object. version is the value of the
+    object's modified_on field when the activity was rendered, and activity_version is the
+    activity_version of the view set at that time. Both are used to tell if the entry is out
+    of date.
+
+    Entries are managed by datahub.activity_stream.materialisation.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    activity_type = models.CharField(max_length=settings.CHAR_FIELD_MAX_LENGTH)
+    object_id = models.UUIDField()
+    version = models.DateTimeField(null=True, blank=True)
+    activity_version = models.PositiveIntegerField()
+    # DRF's encoder is used so that stored activities are identical to freshly rendered ones
+    activity = JSONField(encoder=JSONEncoder)
+    rendered_on = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        """Human-friendly string representation."""
+        return f'{self.activity_type} – {self.object_id}'
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['activity_type', 'object_id'],
+                name='unique_activity_type_object_id',
+            ),
+        ]
+        verbose_name_plural = 'materialised activities'
@@ -0,0 +1,28 @@
+from datahub.activity_stream.company_referral.views import CompanyReferralActivityViewSet
+from datahub.activity_stream.interaction.views import InteractionActivityViewSet
+from datahub.activity_stream.investment.views import IProjectCreatedViewSet
+from datahub.activity_stream.omis.views import OMISOrderAddedViewSet
+
+ACTIVITY_VIEW_SETS = {
+    view_set.activity_type: view_set
+    for view_set in (
+        CompanyReferralActivityViewSet,
+        InteractionActivityViewSet,
+        IProjectCreatedViewSet,
+        OMISOrderAddedViewSet,
+    )
+}
+
+
+def get_activity_view_set(activity_type):
+    """Gets an activity view set by its activity type."""
+    return ACTIVITY_VIEW_SETS[activity_type]
+
+
+def get_activity_view_sets_for_model(model):
+    """Gets the activity view sets for a model."""
+    return [
+        view_set
+        for view_set in ACTIVITY_VIEW_SETS.values()
+        if view_set.queryset.model is model
+    ]
@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from datahub.activity_stream.materialisation import delete_materialised_activity
+from datahub.activity_stream.registry import (
+    ACTIVITY_VIEW_SETS,
+    get_activity_view_sets_for_model,
+)
+from datahub.activity_stream.tasks import materialise_activity_task
+
+
+def materialise_activities_on_save(sender, instance, **kwargs):
+    """
+    Renders the activities for a saved object in the background, once the transaction has been
+    committed.
+    """
+    for view_set in get_activity_view_sets_for_model(sender):
+        transaction.on_commit(
+            lambda activity_type=view_set.activity_type: materialise_activity_task.apply_async(
+                args=(activity_type, str(instance.pk)),
+            ),
+        )
+
+
+def delete_materialised_activities_on_delete(sender, instance, **kwargs):
+    """Deletes the materialised activities for a deleted object."""
+    for view_set in get_activity_view_sets_for_model(sender):
+        delete_materialised_activity(view_set, instance.pk)
+
+
+for _model in {view_set.queryset.model for view_set in ACTIVITY_VIEW_SETS.values()}:
+    post_save.connect(
+        materialise_activities_on_save,
+        sender=_model,
+        dispatch_uid=f'materialise_activities_on_save_{_model._meta.label_lower}',
+    )
+    post_delete.connect(
+        delete_materialised_activities_on_delete,
+        sender=_model,
+        dispatch_uid=f'delete_materialised_activities_on_delete_{_model._meta.label_lower}',
+    )
@@ -0,0 +1,38 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+from datahub.activity_stream.materialisation import (
+    materialise_activities,
+    materialise_stale_activities,
+)
+from datahub.activity_stream.registry import ACTIVITY_VIEW_SETS, get_activity_view_set
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(acks_late=True, max_retries=15, autoretry_for=(Exception,), retry_backoff=1)
+def materialise_activity_task(activity_type, pk):
+    """
+    Renders and stores the activity for a single object.
+
+    If an error occurs, the task will be automatically retried with an exponential back-off.
+    The wait between attempts is approximately 2 ** attempt_num seconds (with some jitter
+    added).
+    """
+    view_set = get_activity_view_set(activity_type)
+    materialise_activities(view_set, [pk])
+
+
+@shared_task(acks_late=True, priority=9, queue='long-running')
+def backfill_activities(activity_types=None):
+    """
+    Task that renders and stores activities that are missing or out of date.
+
+    acks_late is set to True so that the task restarts if interrupted.
+
+    priority is set to the lowest priority (for Redis, 0 is the highest priority).
+    """
+    for activity_type in activity_types or ACTIVITY_VIEW_SETS:
+        view_set = get_activity_view_set(activity_type)
+        num_materialised = materialise_stale_activities(view_set)
+        logger.info(f'{num_materialised} {activity_type} activities materialised')
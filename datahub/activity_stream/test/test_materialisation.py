@@ -0,0 +1,112 @@
+import pytest
+from rest_framework import status
+
+from datahub.activity_stream.interaction.views import InteractionActivityViewSet
+from datahub.activity_stream.materialisation import (
+    get_stale_queryset,
+    materialise_stale_activities,
+)
+from datahub.activity_stream.models import MaterialisedActivity
+from datahub.activity_stream.test import hawk
+from datahub.activity_stream.test.utils import get_url
+from datahub.interaction.test.factories import CompanyInteractionFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _get_interaction_activities(api_client):
+    response = hawk.get(api_client, get_url('api-v3:activity-stream:interactions'))
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()['orderedItems']
+
+
+def test_activities_are_materialised_when_listed(api_client):
+    """Test that listing activities stores the rendered activities."""
+    interaction = CompanyInteractionFactory()
+
+    activities = _get_interaction_activities(api_client)
+
+    materialised_activity = MaterialisedActivity.objects.get()
+    assert materialised_activity.activity_type == 'interaction'
+    assert materialised_activity.object_id == interaction.pk
+    assert materialised_activity.version == interaction.modified_on
+    assert materialised_activity.activity_version == InteractionActivityViewSet.activity_version
+    assert materialised_activity.activity == activities[0]
+
+
+def test_up_to_date_materialised_activities_are_used(api_client):
+    """Test that up-to-date materialised activities are returned without being re-rendered."""
+    CompanyInteractionFactory()
+    _get_interaction_activities(api_client)
+    MaterialisedActivity.objects.update(activity={'id': 'materialised'})
+
+    assert _get_interaction_activities(api_client) == [{'id': 'materialised'}]
+
+
+def test_out_of_date_materialised_activities_are_re_rendered(api_client):
+    """Test that activities are re-rendered if the object has been modified since."""
+    interaction = CompanyInteractionFactory()
+    _get_interaction_activities(api_client)
+    MaterialisedActivity.objects.update(activity={'id': 'materialised'})
+
+    interaction.subject = 'new subject'
+    interaction.save()
+
+    activities = _get_interaction_activities(api_client)
+    assert activities[0]['object']['dit:subject'] == 'new subject'
+
+    materialised_activity = MaterialisedActivity.objects.get()
+    assert materialised_activity.version == interaction.modified_on
+    assert materialised_activity.activity == activities[0]
+
+
+def test_materialised_activities_are_re_rendered_when_activity_version_changes(
+    api_client,
+    monkeypatch,
+):
+    """
+    Test that activities rendered with a different activity_version are treated as out of
+    date.
+    """
+    interaction = CompanyInteractionFactory()
+    _get_interaction_activities(api_client)
+    MaterialisedActivity.objects.update(activity={'id': 'materialised'})
+
+    monkeypatch.setattr(InteractionActivityViewSet, 'activity_version', 2)
+
+    assert list(get_stale_queryset(InteractionActivityViewSet)) == [interaction]
+
+    activities = _get_interaction_activities(api_client)
+    assert activities[0]['object']['dit:subject'] == interaction.subject
+
+    materialised_activity = MaterialisedActivity.objects.get()
+    assert materialised_activity.activity_version == 2
+    assert materialised_activity.activity == activities[0]
+    assert not get_stale_queryset(InteractionActivityViewSet).exists()
+
+
+def test_materialised_activity_is_deleted_with_object(api_client):
+    """Test that deleting an object deletes its materialised activity."""
+    interaction = CompanyInteractionFactory()
+    _get_interaction_activities(api_client)
+
+    interaction.delete()
+
+    assert not MaterialisedActivity.objects.exists()
+
+
+def test_materialise_stale_activities(api_client):
+    """Test that missing and out-of-date activities are materialised by the backfill."""
+    interactions = CompanyInteractionFactory.create_batch(2)
+    _get_interaction_activities(api_client)
+
+    interactions[0].save()
+    new_interaction = CompanyInteractionFactory()
+
+    assert set(get_stale_queryset(InteractionActivityViewSet)) == {
+        interactions[0],
+        new_interaction,
+    }
+    assert materialise_stale_activities(InteractionActivityViewSet, batch_size=1) == 2
+    assert not get_stale_queryset(InteractionActivityViewSet).exists()
+    assert MaterialisedActivity.objects.count() == 3
@@ -1,4 +1,5 @@
 from config.settings.types import HawkScope
+from datahub.activity_stream.materialisation import get_activities, get_page_queryset
 from datahub.core.auth import PaaSIPAuthentication
 from datahub.core.hawk_receiver import (
     HawkAuthentication,
@@ -13,8 +14,28 @@ class ActivityViewSet(HawkResponseSigningMixin, CoreViewSet):
     Generic view for activities.
 
     Sets up authentication, permission and scope.
+
+    Activities are served from materialised activities where possible (see
+    datahub.activity_stream.materialisation).
     """
 
     authentication_classes = (PaaSIPAuthentication, HawkAuthentication)
     permission_classes = (HawkScopePermission,)
     required_hawk_scope = HawkScope.activity_stream
+    # Identifies the activities of the view set in MaterialisedActivity
+    activity_type = None
+    # Increment this when the serializer output changes, so that materialised activities are
+    # re-rendered
+    activity_version = 1
+
+    def list(self, request, *args, **kwargs):
+        """
+        Lists activities.
+
+        Only the fields needed for pagination are fetched for the page of objects, and the
+        activities themselves are then read from materialised activities.
+        """
+        queryset = self.filter_queryset(get_page_queryset(type(self)))
+        page = self.paginate_queryset(queryset)
+        activities = get_activities(type(self), page)
+        return self.get_paginated_response(activities)
@@ -1,16 +1,18 @@
+from collections import Counter
 from contextlib import ExitStack
 from functools import reduce
 from logging import getLogger
 from operator import and_
 
 from django.apps import apps
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, CommandError
 from django.db.models import Q, Subquery
 from django.db.transaction import atomic
 from django.template.defaultfilters import capfirst
 
 from datahub.cleanup.query_utils import get_relations_to_delete, get_unreferenced_objects_query
 from datahub.core.exceptions import SimulationRollback
+from datahub.core.utils import slice_iterable_into_chunks
 from datahub.search.deletion import update_es_after_deletions
 
 logger = getLogger(__name__)
@@ -46,6 +48,14 @@ class BaseCleanupCommand(BaseCommand):
             help='Only prints the SQL query and number of matching records. Does not delete '
                  'records or simulate deletions.',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Deletes records in batches of this size, each in its own transaction (rather '
+                 'than all records in a single transaction). Batches that have been deleted stay '
+                 'deleted if the command is interrupted, so running it again resumes the '
+                 'deletion.',
+        )
 
     def handle(self, *args, **options):
         """Main logic for the actual command."""
@@ -53,6 +63,11 @@ class BaseCleanupCommand(BaseCommand):
         only_print_queries = options['only_print_queries']
         model_name = options['model_label']
 
+        batch_size = options['batch_size']
+
+        if batch_size is not None and batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer.')
+
         model = apps.get_model(model_name)
         qs = self._get_query(model)
 
@@ -60,6 +75,10 @@ class BaseCleanupCommand(BaseCommand):
             self._print_queries(model, qs)
             return
 
+        if batch_size:
+            self._delete_in_batches(qs, batch_size, is_simulation)
+            return
+
         try:
             with ExitStack() as stack:
                 if not is_simulation:
@@ -68,9 +87,7 @@ class BaseCleanupCommand(BaseCommand):
                 stack.enter_context(atomic())
                 total_deleted, deletions_by_model = qs.delete()
 
-                logger.info(f'{total_deleted} records deleted. Breakdown by model:')
-                for deletion_model, model_deletion_count in deletions_by_model.items():
-                    logger.info(f'{deletion_model}: {model_deletion_count}')
+                _log_deletions(total_deleted, deletions_by_model)
 
                 if is_simulation:
                     logger.info(f'Rolling back deletions...')
@@ -78,6 +95,51 @@ class BaseCleanupCommand(BaseCommand):
         except SimulationRollback:
             logger.info(f'Deletions rolled back')
 
+    def _delete_in_batches(self, qs, batch_size, is_simulation):
+        """
+        Deletes the records matching a query in batches, each in its own transaction.
+
+        The primary keys of the matching records are read once using a server-side cursor,
+        rather than the (expensive) query being run again for each batch. Each batch is
+        checked against the query again when it's deleted, so records that have stopped
+        matching the query in the meantime (e.g. because they've been modified) are not deleted.
+
+        Cascaded relations are deleted along with each batch (by the Django deletion
+        collector, which uses a single DELETE query for relations that have no signal receivers
+        or relations of their own). Elasticsearch documents are queued for deletion once each
+        batch has been committed.
+        """
+        total_deletions_by_model = Counter()
+        pks = qs.values_list('pk', flat=True).iterator(chunk_size=batch_size)
+
+        for batch_num, batch_pks in enumerate(
+            slice_iterable_into_chunks(pks, batch_size),
+            start=1,
+        ):
+            try:
+                with ExitStack() as stack:
+                    if not is_simulation:
+                        stack.enter_context(update_es_after_deletions())
+
+                    stack.enter_context(atomic())
+                    batch_deleted, deletions_by_model = qs.filter(pk__in=batch_pks).delete()
+                    total_deletions_by_model.update(deletions_by_model)
+
+                    if is_simulation:
+                        raise SimulationRollback()
+            except SimulationRollback:
+                pass
+
+            logger.info(
+                f'Batch {batch_num}: {batch_deleted} records deleted '
+                f'({sum(total_deletions_by_model.values())} in total)',
+            )
+
+        _log_deletions(sum(total_deletions_by_model.values()), total_deletions_by_model)
+
+        if is_simulation:
+            logger.info(f'Deletions rolled back')
+
     def _print_queries(self, model, qs):
         # relationships that would get deleted in cascade
         for related in get_relations_to_delete(model):
@@ -125,5 +187,11 @@ def _print_query(model, qs, relation=None):
     logger.info(qs.query)
 
 
+def _log_deletions(total_deleted, deletions_by_model):
+    logger.info(f'{total_deleted} records deleted. Breakdown by model:')
+    for deletion_model, model_deletion_count in deletions_by_model.items():
+        logger.info(f'{deletion_model}: {model_deletion_count}')
+
+
 def _join_cleanup_filters(filters):
     return reduce(and_, (filter_.as_q() for filter_ in filters), Q())
@@ -15,3 +15,13 @@ def test_fails_with_invalid_model(cleanup_command_cls):
     """Test that if an invalid value for model is passed in, the command errors."""
     with pytest.raises(CommandError):
         management.call_command(cleanup_command_cls(), 'invalid')
+
+
+@pytest.mark.parametrize('cleanup_command_cls', COMMAND_CLASSES, ids=str)
+@pytest.mark.parametrize('batch_size', (0, -1))
+def test_fails_with_invalid_batch_size(cleanup_command_cls, batch_size):
+    """Test that if a batch size less than one is passed in, the command errors."""
+    model_label = next(iter(cleanup_command_cls.CONFIGS))
+
+    with pytest.raises(CommandError):
+        management.call_command(cleanup_command_cls(), model_label, batch_size=batch_size)
@@ -836,6 +836,77 @@ def test_simulate(
         assert es_with_signals.count(read_alias, doc_type=search_app.name)['count'] == 3
 
 
+@freeze_time(FROZEN_TIME)
+@pytest.mark.parametrize('model_name,config', delete_old_records.Command.CONFIGS.items())
+@pytest.mark.django_db
+def test_run_in_batches(
+    model_name,
+    config,
+    track_return_values,
+    es_with_signals,
+    es_collector_context_manager,
+):
+    """Test that if --batch-size is passed in, records are deleted in batches."""
+    delete_return_value_tracker = track_return_values(QuerySet, 'delete')
+    command = delete_old_records.Command()
+
+    mapping = MAPPING[model_name]
+    model_factory = mapping['factory']
+    has_search_app = not mapping.get('has_no_search_app')
+
+    with es_collector_context_manager as collector:
+        for _ in range(5):
+            _create_model_obj(model_factory, **mapping['expired_objects_kwargs'][0])
+        _create_model_obj(model_factory, **mapping['unexpired_objects_kwargs'][0])
+
+        collector.flush_and_refresh()
+
+    model = apps.get_model(model_name)
+
+    management.call_command(command, model_name, batch_size=2)
+    es_with_signals.indices.refresh()
+
+    return_values = delete_return_value_tracker.return_values
+    assert [deletions_by_model[model._meta.label] for _, deletions_by_model in return_values] == [
+        2,
+        2,
+        1,
+    ]
+    assert model.objects.count() == 1
+
+    if has_search_app:
+        search_app = get_search_app_by_model(model)
+        read_alias = search_app.es_model.get_read_alias()
+        assert es_with_signals.count(read_alias, doc_type=search_app.name)['count'] == 1
+
+
+@freeze_time(FROZEN_TIME)
+@pytest.mark.usefixtures('disconnect_delete_search_signal_receivers')
+@pytest.mark.django_db
+def test_simulate_in_batches(track_return_values, caplog):
+    """
+    Test that if --simulate and --batch-size are passed in, each batch is deleted and rolled
+    back.
+    """
+    caplog.set_level('INFO')
+    delete_return_value_tracker = track_return_values(QuerySet, 'delete')
+    command = delete_old_records.Command()
+
+    model_name = 'interaction.Interaction'
+    mapping = MAPPING[model_name]
+
+    for _ in range(3):
+        _create_model_obj(mapping['factory'], **mapping['expired_objects_kwargs'][0])
+
+    management.call_command(command, model_name, simulate=True, batch_size=2)
+
+    return_values = delete_return_value_tracker.return_values
+    assert [deletions_by_model[model_name] for _, deletions_by_model in return_values] == [2, 1]
+    assert apps.get_model(model_name).objects.count() == 3
+    assert 'Batch 2: 1 records deleted' in caplog.text
+    assert 'Deletions rolled back' in caplog.text
+
+
 @freeze_time(FROZEN_TIME)
 @pytest.mark.parametrize('model_name,config', delete_old_records.Command.CONFIGS.items())
 @pytest.mark.django_db
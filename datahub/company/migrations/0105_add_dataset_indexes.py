@@ -0,0 +1,21 @@
+# Generated by Django 3.0.5 on 2020-04-20 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0104_company_dnb_investigation_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='companyexportcountry',
+            index=models.Index(fields=['created_on', 'id'], name='company_com_created_1fbb71_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='companyexportcountryhistory',
+            index=models.Index(fields=['history_date', 'history_id'], name='company_com_history_01fc1b_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.0.5 on 2020-04-22 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0105_add_dataset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['modified_on', 'id'], name='company_com_modifie_16ce27_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['modified_on', 'id'], name='company_con_modifie_c95a28_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='companyexportcountry',
+            index=models.Index(fields=['modified_on', 'id'], name='company_com_modifie_aeaadb_idx'),
+        ),
+    ]
@@ -303,6 +303,7 @@ class Company(ArchivableModel, BaseModel):
         indexes = [
             # For datasets app which includes API endpoints to be consumed by data-flow
             models.Index(fields=('created_on', 'id')),
+            models.Index(fields=('modified_on', 'id')),
         ]
 
     @property
@@ -568,6 +569,11 @@ class CompanyExportCountry(BaseModel):
                 name='unique_country_company',
             ),
         ]
+        indexes = [
+            # For datasets app which includes API endpoints to be consumed by data-flow
+            models.Index(fields=('created_on', 'id')),
+            models.Index(fields=('modified_on', 'id')),
+        ]
         verbose_name_plural = 'company export countries'
 
     def __str__(self):
@@ -623,6 +629,10 @@ class CompanyExportCountryHistory(models.Model):
     )
 
     class Meta:
+        indexes = [
+            # For datasets app which includes API endpoints to be consumed by data-flow
+            models.Index(fields=('history_date', 'history_id')),
+        ]
         verbose_name_plural = 'company export country history'
 
     def __str__(self):
@@ -96,6 +96,7 @@ class Contact(ArchivableModel, BaseModel):
         indexes = [
             # For datasets app which includes API endpoints to be consumed by data-flow
             models.Index(fields=('created_on', 'id')),
+            models.Index(fields=('modified_on', 'id')),
         ]
 
     @property
@@ -66,6 +66,12 @@ class CompanyReferral(BaseModel):
     subject = models.CharField(max_length=settings.CHAR_FIELD_MAX_LENGTH)
     notes = models.TextField()
 
+    class Meta:
+        indexes = [
+            # For activity stream
+            models.Index(fields=('modified_on', 'id')),
+        ]
+
     def __str__(self):
         """Human-friendly representation (for admin etc.)."""
         return f'{self.company} – {self.subject}'
@@ -1,8 +1,11 @@
+import io
 import logging
 from functools import partial
+from tempfile import TemporaryFile
 
 from django.conf import settings
 from django.core.cache import cache
+from django.http import FileResponse, HttpResponse
 from mohawk import Receiver
 from mohawk.exc import HawkFail
 from rest_framework.authentication import BaseAuthentication
@@ -14,6 +17,9 @@ logger = logging.getLogger(__name__)
 
 NO_CREDENTIALS_MESSAGE = 'Authentication credentials were not provided.'
 INCORRECT_CREDENTIALS_MESSAGE = 'Incorrect authentication credentials.'
+# The amount of streamed content kept in memory while a streaming response is being signed.
+# Content beyond this is written to a temporary file.
+STREAMING_RESPONSE_MAX_MEMORY_SIZE = 10 * 1024 * 1024
 
 
 class HawkAuthentication(BaseAuthentication):
@@ -59,8 +65,14 @@ class HawkResponseSigningMixin:
         If the request was authenticated using Hawk, this adds a post-render callback to the
         response which sets the Server-Authorization header, so that the originator of the
         request can authenticate the response.
+
+        Streaming responses are signed straight away instead (see _sign_streaming_response()).
         """
         finalized_response = super().finalize_response(request, response, *args, **kwargs)
+
+        if finalized_response.streaming:
+            return _sign_streaming_response(request, finalized_response)
+
         callback = partial(_sign_rendered_response, request)
         finalized_response.add_post_render_callback(callback)
         return finalized_response
@@ -132,6 +144,108 @@ def _authorise(request):
     )
 
 
+class _StreamingContentReader:
+    """
+    File-like object that reads the content of a streaming response.
+
+    This allows mohawk to hash the content incrementally as it's generated (mohawk reads
+    file-like content in small blocks).
+
+    The content is also kept so that it can be sent once the response has been signed. Up to
+    max_memory_size bytes are kept in memory; if the content is larger than that, it's written
+    to a temporary file instead.
+    """
+
+    def __init__(self, streaming_content, max_memory_size):
+        """Initialises the reader."""
+        self.file = None
+        self._chunks = iter(streaming_content)
+        self._max_memory_size = max_memory_size
+        self._kept_chunks = []
+        self._kept_size = 0
+        self._current_chunk = b''
+        self._offset = 0
+
+    def read(self, size=-1):
+        """Reads up to size bytes of content (or all remaining content if size is negative)."""
+        if size < 0:
+            return b''.join(iter(partial(self.read, io.DEFAULT_BUFFER_SIZE), b''))
+
+        while self._offset >= len(self._current_chunk):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return b''
+
+            self._keep(chunk)
+            self._current_chunk = chunk
+            self._offset = 0
+
+        data = self._current_chunk[self._offset:self._offset + size]
+        self._offset += len(data)
+        return data
+
+    def get_kept_content(self):
+        """Returns the content kept in memory (only valid if self.file is None)."""
+        return b''.join(self._kept_chunks)
+
+    def _keep(self, chunk):
+        if self.file is None and self._kept_size + len(chunk) > self._max_memory_size:
+            self.file = TemporaryFile()
+            self.file.writelines(self._kept_chunks)
+            self._kept_chunks = []
+
+        if self.file is None:
+            self._kept_chunks.append(chunk)
+        else:
+            self.file.write(chunk)
+
+        self._kept_size += len(chunk)
+
+
+def _sign_streaming_response(request, streaming_response):
+    """
+    Signs a streaming response.
+
+    As the Server-Authorization header includes a hash of the content, the whole of the
+    content has to be generated before the response can be sent. The content is hashed as it's
+    generated (in a single pass), and is kept in memory if it's small, or in a temporary file if
+    it's large (so that memory usage is bounded).
+    """
+    if not isinstance(request.successful_authenticator, HawkAuthentication):
+        return streaming_response
+
+    reader = _StreamingContentReader(
+        streaming_response.streaming_content,
+        STREAMING_RESPONSE_MAX_MEMORY_SIZE,
+    )
+
+    try:
+        server_authorization = request.auth.respond(
+            content=reader,
+            content_type=streaming_response['Content-Type'],
+        )
+    except Exception:
+        if reader.file:
+            reader.file.close()
+        raise
+    finally:
+        streaming_response.close()
+
+    if reader.file is None:
+        response = HttpResponse(reader.get_kept_content())
+    else:
+        reader.file.seek(0)
+        # FileResponse closes the file once the response has been sent
+        response = FileResponse(reader.file)
+
+    response.status_code = streaming_response.status_code
+    for header, value in streaming_response.items():
+        response[header] = value
+
+    response['Server-Authorization'] = server_authorization
+    return response
+
+
 def _sign_rendered_response(request, response):
     if isinstance(request.successful_authenticator, HawkAuthentication):
         response['Server-Authorization'] = request.auth.respond(
@@ -35,3 +35,11 @@ def incr(*args, **kwargs):
     creating a new `StatsClient`.
     """
     statsd().incr(*args, **kwargs)
+
+
+def timing(*args, **kwargs):
+    """
+    Records the given duration (in milliseconds) for the given stat
+    after creating a new `StatsClient`.
+    """
+    statsd().timing(*args, **kwargs)
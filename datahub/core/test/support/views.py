@@ -1,3 +1,4 @@
+from django.http import StreamingHttpResponse
 from django.template.response import TemplateResponse
 from oauth2_provider.contrib.rest_framework.permissions import IsAuthenticatedOrTokenHasScope
 from rest_framework.response import Response
@@ -71,6 +72,20 @@ class HawkViewWithScope(HawkResponseSigningMixin, APIView):
         return Response({'content': 'hawk-test-view-with-scope'})
 
 
+class HawkStreamingView(HawkResponseSigningMixin, APIView):
+    """View using Hawk authentication that returns a streaming response."""
+
+    authentication_classes = (HawkAuthentication,)
+    permission_classes = ()
+
+    def get(self, request):
+        """Simple test view with fixed streamed content."""
+        return StreamingHttpResponse(
+            (f'chunk-{index};'.encode() for index in range(100)),
+            content_type='text/plain',
+        )
+
+
 class PaasIPView(APIView):
     """View using PaaS IP Authentication."""
 
@@ -1,4 +1,5 @@
 import datetime
+from unittest import mock
 
 import mohawk
 import pytest
@@ -23,6 +24,10 @@ def _url_incorrect_path():
     return 'http://testserver' + reverse('test-hawk-without-scope') + 'incorrect/'
 
 
+def _url_streaming():
+    return 'http://testserver' + reverse('test-hawk-streaming')
+
+
 def _url_with_scope():
     return 'http://testserver' + reverse('test-hawk-with-scope')
 
@@ -251,6 +256,48 @@ class TestHawkResponseSigningMixin:
                 content_type='incorrect',
             )
 
+    @pytest.mark.parametrize(
+        'max_memory_size,expected_streaming',
+        (
+            # Small content is kept in memory
+            (10 * 1024 * 1024, False),
+            # Larger content is written to a temporary file and streamed from that
+            (100, True),
+        ),
+    )
+    def test_signs_streaming_responses(self, api_client, max_memory_size, expected_streaming):
+        """Test that streaming responses are signed and their content is returned intact."""
+        sender = _auth_sender(url=_url_streaming)
+
+        with mock.patch(
+            'datahub.core.hawk_receiver.STREAMING_RESPONSE_MAX_MEMORY_SIZE',
+            max_memory_size,
+        ):
+            response = api_client.get(
+                _url_streaming(),
+                content_type='',
+                HTTP_AUTHORIZATION=sender.request_header,
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming == expected_streaming
+
+        content = b''.join(response.streaming_content) if expected_streaming else response.content
+        assert content == b''.join(f'chunk-{index};'.encode() for index in range(100))
+        assert response['Content-Type'] == 'text/plain'
+
+        sender.accept_response(
+            response_header=response['Server-Authorization'],
+            content=content,
+            content_type=response['Content-Type'],
+        )
+        with pytest.raises(mohawk.exc.MisComputedContentHash):
+            sender.accept_response(
+                response_header=response['Server-Authorization'],
+                content='incorrect',
+                content_type=response['Content-Type'],
+            )
+
     def test_does_not_sign_non_hawk_requests(self):
         """Test that a 403 is returned if the request is not authenticated using Hawk."""
         from rest_framework.test import force_authenticate
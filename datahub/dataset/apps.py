@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class DatasetConfig(AppConfig):
+    """Django App Config for the Dataset app."""
+
+    name = 'datahub.dataset'
+
+    def ready(self):
+        """Registers the signals for this app.
+
+        This is the preferred way to register signals in the Django documentation.
+        """
+        import datahub.dataset.signal_receivers  # noqa: F401
@@ -2,6 +2,7 @@ import pytest
 from django.urls import reverse
 from freezegun import freeze_time
 
+from datahub.company.models import CompanyExportCountry
 from datahub.company.test.factories import CompanyExportCountryFactory
 from datahub.core.test_utils import format_date_or_datetime
 from datahub.dataset.core.test import BaseDatasetViewTest
@@ -66,3 +67,33 @@ class TestCompanyExportCountryDatasetView(BaseDatasetViewTest):
 
         for i in range(len(expected_list)):
             assert response_results[i]['id'] == str(expected_list[i].id)
+
+    def test_records_without_created_on_are_returned_last(self, data_flow_api_client):
+        """
+        Test that records with a null created_on are returned last, and that pagination
+        works across and within them.
+        """
+        with_created_on = self.factory.create_batch(2)
+        without_created_on = self.factory.create_batch(3)
+        CompanyExportCountry.objects.filter(
+            pk__in=[obj.pk for obj in without_created_on],
+        ).update(created_on=None)
+
+        results = []
+        path = f'{self.view_url}?page_size=2'
+        while path:
+            response = data_flow_api_client.get(path)
+            assert response.status_code == 200
+            response_data = response.json()
+            results.extend(response_data['results'])
+            next_url = response_data['next']
+            path = next_url and next_url.replace('http://testserver', '')
+
+        expected_ids = [
+            *[
+                str(obj.pk)
+                for obj in sorted(with_created_on, key=lambda obj: (obj.created_on, obj.pk))
+            ],
+            *sorted(str(obj.pk) for obj in without_created_on),
+        ]
+        assert [result['id'] for result in results] == expected_ids
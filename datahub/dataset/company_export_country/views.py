@@ -10,6 +10,8 @@ class CompanyExportCountryDatasetView(BaseDatasetView):
     then be queried to create custom reports for users.
     """
 
+    modified_on_field = 'modified_on'
+
     def get_dataset(self):
         """Returns list of company_export_country records"""
         return CompanyExportCountry.objects.values(
@@ -14,6 +14,7 @@ class CompanyExportCountryHistoryDatasetView(BaseDatasetView):
     """
 
     pagination_class = CompanyExportCountryHistoryDatasetViewCursorPagination
+    modified_on_field = 'history_date'
 
     def get_dataset(self):
         """Returns list of company_export_country_history records"""
@@ -15,6 +15,8 @@ class ContactsDatasetView(BaseDatasetView):
     table to get more meaningful insight.
     """
 
+    modified_on_field = 'modified_on'
+
     def get_dataset(self):
         """Returns list of Contacts Dataset records"""
         return Contact.objects.annotate(
@@ -1,16 +1,260 @@
-from rest_framework.pagination import CursorPagination
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date
 
+from django.core.exceptions import ValidationError
+from django.db.models import BooleanField, F, Func, Value
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import NotFound
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.urls import replace_query_param
 
-class DatasetCursorPagination(CursorPagination):
+
+class DatasetCursorPagination:
     """
-    Cursor Pagination for dataset api endpoints
+    Keyset (cursor) pagination for dataset API endpoints.
+
+    Each page is fetched using a row comparison on the ordering fields
+    (e.g. `(created_on, id) > (<last created_on>, <last id>)`), so fetching a page is an index
+    range scan and doesn't get slower the further into the dataset it is. (There is no offset
+    fallback, so the last ordering field must be unique; there should also be an index on the
+    ordering fields.)
+
+    Rows are fetched using a server-side cursor and the page is streamed as JSON row by row,
+    rather than the whole page being loaded and rendered in memory first.
+
+    The response has the same structure as DRF's CursorPagination, but only forward
+    pagination is supported (so `previous` is always null).
     """
 
     ordering = ('created_on', 'pk')
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 10000
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+    # The number of rows fetched from the server-side cursor at a time
+    chunk_size = 2000
+    # The number of rows that are serialised before being sent to the client
+    stream_batch_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Returns an iterator over the rows of the requested page.
+
+        Rows are only fetched from the database as the iterator is consumed.
+        """
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.has_next = False
+        self.last_position = None
+
+        self._model_fields = [_get_model_field(queryset.model, name) for name in self.ordering]
+        self._aliases = [f'_cursor_{index}' for index in range(len(self.ordering))]
+
+        position = self.decode_cursor(request)
+        return self._iter_page(queryset, position)
+
+    def get_paginated_response(self, data):
+        """Returns a response that streams the page as JSON."""
+        return StreamingHttpResponse(
+            self._stream_json(data),
+            content_type='application/json',
+        )
+
+    def get_page_size(self, request):
+        """Gets the page size from the query string, falling back to the default."""
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size <= 0:
+            return self.page_size
+
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self):
+        """
+        Gets the URL of the next page.
+
+        This is only known once the current page has been fully consumed.
+        """
+        if not self.has_next:
+            return None
+
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            self.encode_cursor(self.last_position),
+        )
+
+    def get_previous_link(self):
+        """Always returns None as only forward pagination is supported."""
+        return None
+
+    def decode_cursor(self, request):
+        """
+        Decodes the cursor in the query string to the values of the ordering fields of the last
+        row of the previous page.
+
+        Returns None if there is no cursor (i.e. for the first page).
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            values = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+
+            return tuple(
+                None if value is None else field.to_python(value)
+                for field, value in zip(self._model_fields, values)
+            )
+        # binascii.Error and UnicodeError are subclasses of ValueError
+        except (ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position):
+        """Encodes the values of the ordering fields of a row as a cursor."""
+        values = [_cursor_value_to_json(value) for value in position]
+        encoded = json.dumps(values, separators=(',', ':')).encode('utf-8')
+        return urlsafe_b64encode(encoded).decode('ascii')
+
+    def _iter_page(self, queryset, position):
+        queryset = queryset.annotate(
+            **{alias: F(name) for alias, name in zip(self._aliases, self.ordering)},
+        ).order_by(*self.ordering)
+
+        remaining = self.page_size
+
+        for page_queryset in self._get_querysets_after(queryset, position):
+            # One extra row is fetched to determine if there is a next page
+            rows = page_queryset[:remaining + 1].iterator(chunk_size=self.chunk_size)
+
+            for row in rows:
+                if not remaining:
+                    self.has_next = True
+                    return
+
+                self.last_position = self._pop_position(row)
+                remaining -= 1
+                yield row
+
+    def _get_querysets_after(self, queryset, position):
+        """
+        Returns the querysets (in order) that contain the rows after a particular position.
+
+        Normally, this is a single queryset using a row comparison. However, the first
+        ordering field may be nullable (for example, created_on); null values come last in the
+        ordering, and aren't matched by the row comparison, so are fetched separately.
+        """
+        if position is None:
+            return [queryset]
+
+        first_field_name, *other_field_names = self.ordering
+        first_model_field, *other_model_fields = self._model_fields
+        first_value, *other_values = position
+        querysets = []
+
+        if first_value is not None:
+            querysets.append(
+                queryset.filter(_row_greater_than(self.ordering, self._model_fields, position)),
+            )
+
+        if first_model_field.null:
+            null_queryset = queryset.filter(**{f'{first_field_name}__isnull': True})
+
+            if first_value is None:
+                null_queryset = null_queryset.filter(
+                    _row_greater_than(other_field_names, other_model_fields, other_values),
+                )
+
+            querysets.append(null_queryset)
+
+        return querysets
+
+    def _pop_position(self, row):
+        if isinstance(row, dict):
+            return tuple(row.pop(alias) for alias in self._aliases)
+
+        return tuple(getattr(row, alias) for alias in self._aliases)
+
+    def _stream_json(self, rows):
+        encoder = JSONEncoder(
+            ensure_ascii=not api_settings.UNICODE_JSON,
+            allow_nan=not api_settings.STRICT_JSON,
+            separators=(',', ':'),
+        )
+        batch = ['{"results":[']
+        separator = ''
+
+        for row in rows:
+            batch.append(separator)
+            batch.append(encoder.encode(row))
+            separator = ','
+
+            if len(batch) >= self.stream_batch_size * 2:
+                yield ''.join(batch).encode('utf-8')
+                batch = []
+
+        # The next link can only be generated once all rows have been consumed
+        batch.append(f'],"next":{encoder.encode(self.get_next_link())},"previous":null}}')
+        yield ''.join(batch).encode('utf-8')
+
+
+class _RowGreaterThan(Func):
+    """
+    Row value comparison i.e. `(lhs_1, lhs_2, ...) > (rhs_1, rhs_2, ...)`.
+
+    The source expressions are the left-hand side expressions followed by the right-hand side
+    expressions.
+    """
+
+    output_field = BooleanField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        """Generates the SQL for the comparison."""
+        sql_parts = []
+        params = []
+
+        for expression in self.get_source_expressions():
+            expression_sql, expression_params = compiler.compile(expression)
+            sql_parts.append(expression_sql)
+            params.extend(expression_params)
+
+        num_columns = len(sql_parts) // 2
+        lhs_sql = ', '.join(sql_parts[:num_columns])
+        rhs_sql = ', '.join(sql_parts[num_columns:])
+        return f'({lhs_sql}) > ({rhs_sql})', params
+
+
+def _row_greater_than(field_names, model_fields, values):
+    return _RowGreaterThan(
+        *[F(field_name) for field_name in field_names],
+        *[
+            Value(value, output_field=model_field)
+            for model_field, value in zip(model_fields, values)
+        ],
+    )
+
+
+def _get_model_field(model, field_name):
+    if field_name == 'pk':
+        return model._meta.pk
+
+    return model._meta.get_field(field_name)
+
+
+def _cursor_value_to_json(value):
+    # date also covers datetime
+    if isinstance(value, date):
+        return value.isoformat()
+
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
 
-    # We need to unset the pagination `offset_cutoff` value as we hit an issue
-    # with pagination ordering when the model has many thousands of duplicate
-    # `created_on` dates. Effectively, if the number of duplicate timestamps
-    # is greater than the `offset_cutoff` the `next_page` in the response would
-    # point to the current page creating an infinite loop.
-    offset_cutoff = None
+    return str(value)
@@ -1,6 +1,7 @@
 from unittest import mock
 
 import pytest
+from freezegun import freeze_time
 from rest_framework import status
 
 
@@ -58,3 +59,43 @@ class BaseDatasetViewTest:
         response = data_flow_api_client.get(self.view_url)
         assert response.status_code == status.HTTP_200_OK
         assert response.json()['next'] is not None
+
+    def test_page_size(self, data_flow_api_client):
+        """Test that the page size can be specified in the query string."""
+        self.factory.create_batch(2 + 1)
+        response = data_flow_api_client.get(self.view_url, params={'page_size': 2})
+        assert response.status_code == status.HTTP_200_OK
+
+        response_data = response.json()
+        assert len(response_data['results']) == 2
+        assert response_data['next'] is not None
+
+    def test_following_next_links_returns_all_records(self, data_flow_api_client):
+        """
+        Test that following the next links returns all records in order, including when
+        records have the same creation timestamp.
+        """
+        with freeze_time('2020-01-01 12:00:00'):
+            self.factory.create_batch(3)
+        self.factory.create_batch(2)
+
+        response = data_flow_api_client.get(self.view_url, params={'page_size': 10000})
+        assert response.status_code == status.HTTP_200_OK
+        expected_results = response.json()['results']
+
+        results = []
+        path = f'{self.view_url}?page_size=2'
+        while path:
+            response = data_flow_api_client.get(path)
+            assert response.status_code == status.HTTP_200_OK
+            response_data = response.json()
+            results.extend(response_data['results'])
+            next_url = response_data['next']
+            path = next_url and next_url.replace('http://testserver', '')
+
+        assert results == expected_results
+
+    def test_invalid_cursor(self, data_flow_api_client):
+        """Test that an invalid cursor returns a 404."""
+        response = data_flow_api_client.get(self.view_url, params={'cursor': 'invalid'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
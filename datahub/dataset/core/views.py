@@ -1,3 +1,7 @@
+from itertools import islice
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import DateTimeField
 from rest_framework.views import APIView
 
 from config.settings.types import HawkScope
@@ -9,29 +13,72 @@ from datahub.core.hawk_receiver import (
 )
 from datahub.dataset.core.pagination import DatasetCursorPagination
 
+MODIFIED_SINCE_QUERY_PARAM = 'modified_since'
+MODIFIED_SINCE_NOT_SUPPORTED_MESSAGE = 'This dataset does not support filtering by modified_since.'
+
 
 class BaseDatasetView(HawkResponseSigningMixin, APIView):
     """
     Base API view to be used for creating endpoints for consumption
     by Data Flow and insertion into Data Workspace.
+
+    If modified_on_field is set, the modified_since query parameter can be used to only return
+    records modified on or after a particular date and time (in which case, records are ordered
+    by modified_on_field). Deleted records are available from the deleted records dataset.
     """
 
     authentication_classes = (PaaSIPAuthentication, HawkAuthentication)
     permission_classes = (HawkScopePermission, )
     required_hawk_scope = HawkScope.data_flow_api
     pagination_class = DatasetCursorPagination
+    # The maximum number of records passed to _enrich_data() at a time
+    enrichment_batch_size = 100
+    # The field that the modified_since query parameter filters on (None if not supported)
+    modified_on_field = None
 
     def get(self, request):
         """Endpoint which serves all records for a specific Dataset"""
         dataset = self.get_dataset()
         paginator = self.pagination_class()
+
+        modified_since = self._get_modified_since(request)
+        if modified_since is not None:
+            dataset = dataset.filter(**{f'{self.modified_on_field}__gte': modified_since})
+            paginator.ordering = (self.modified_on_field, 'pk')
+
         page = paginator.paginate_queryset(dataset, request, view=self)
-        self._enrich_data(page)
-        return paginator.get_paginated_response(page)
+        return paginator.get_paginated_response(self._iter_enriched_data(page))
+
+    def _get_modified_since(self, request):
+        value = request.query_params.get(MODIFIED_SINCE_QUERY_PARAM)
+        if value is None:
+            return None
+
+        if not self.modified_on_field:
+            raise ValidationError({
+                MODIFIED_SINCE_QUERY_PARAM: [MODIFIED_SINCE_NOT_SUPPORTED_MESSAGE],
+            })
+
+        try:
+            return DateTimeField().run_validation(value)
+        except ValidationError as exc:
+            raise ValidationError({MODIFIED_SINCE_QUERY_PARAM: exc.detail})
+
+    def _iter_enriched_data(self, page):
+        """
+        Passes the records in the page to _enrich_data() in batches, as they are streamed.
+        """
+        records = iter(page)
+        while True:
+            batch = list(islice(records, self.enrichment_batch_size))
+            if not batch:
+                return
+
+            yield from self._enrich_data(batch)
 
     def _enrich_data(self, dataset):
         """
-        Hook for enriching the paged dataset before returning a response.
+        Hook for enriching a batch of records from the paged dataset before they are returned.
         By default it does nothing but can be changed in subclasses to make
         calls to external APIs if required.
         """
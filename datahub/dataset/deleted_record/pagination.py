@@ -0,0 +1,9 @@
+from datahub.dataset.core.pagination import DatasetCursorPagination
+
+
+class DeletedRecordsDatasetViewCursorPagination(DatasetCursorPagination):
+    """
+    Cursor Pagination for DeletedRecordsDatasetView
+    """
+
+    ordering = ('deleted_on', 'pk')
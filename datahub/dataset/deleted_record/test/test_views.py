@@ -0,0 +1,65 @@
+import pytest
+from django.urls import reverse
+from freezegun import freeze_time
+from rest_framework import status
+
+from datahub.company.test.factories import CompanyFactory
+from datahub.core.test_utils import format_date_or_datetime
+from datahub.dataset.core.test import BaseDatasetViewTest
+from datahub.dataset.test.factories import DeletedRecordFactory
+
+
+def get_expected_data_from_deleted_record(deleted_record):
+    """Returns deleted record data as a dictionary"""
+    return {
+        'id': deleted_record.id,
+        'model': deleted_record.model,
+        'object_id': deleted_record.object_id,
+        'deleted_on': format_date_or_datetime(deleted_record.deleted_on),
+    }
+
+
+@pytest.mark.django_db
+class TestDeletedRecordsDatasetView(BaseDatasetViewTest):
+    """
+    Tests for DeletedRecordsDatasetView
+    """
+
+    view_url = reverse('api-v4:dataset:deleted-records-dataset')
+    factory = DeletedRecordFactory
+
+    def test_success(self, data_flow_api_client):
+        """Test that endpoint returns with expected data for a single deleted record"""
+        deleted_record = self.factory()
+        response = data_flow_api_client.get(self.view_url)
+        assert response.status_code == status.HTTP_200_OK
+        response_results = response.json()['results']
+        assert response_results == [get_expected_data_from_deleted_record(deleted_record)]
+
+    def test_returns_deleted_objects(self, data_flow_api_client):
+        """Test that objects deleted from a dataset model are returned."""
+        company = CompanyFactory()
+        company_id = company.pk
+        company.delete()
+
+        response = data_flow_api_client.get(self.view_url)
+        assert response.status_code == status.HTTP_200_OK
+        response_results = response.json()['results']
+        assert len(response_results) == 1
+        assert response_results[0]['model'] == 'company.company'
+        assert response_results[0]['object_id'] == str(company_id)
+
+    def test_modified_since(self, data_flow_api_client):
+        """Test that only records deleted on or after modified_since are returned."""
+        with freeze_time('2019-01-01 12:00:00'):
+            self.factory()
+        with freeze_time('2019-01-02 12:00:00'):
+            deleted_record = self.factory()
+
+        response = data_flow_api_client.get(
+            self.view_url,
+            params={'modified_since': '2019-01-02T00:00:00Z'},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        response_results = response.json()['results']
+        assert response_results == [get_expected_data_from_deleted_record(deleted_record)]
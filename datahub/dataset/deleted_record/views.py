@@ -0,0 +1,25 @@
+from datahub.dataset.core.views import BaseDatasetView
+from datahub.dataset.deleted_record.pagination import DeletedRecordsDatasetViewCursorPagination
+from datahub.dataset.models import DeletedRecord
+
+
+class DeletedRecordsDatasetView(BaseDatasetView):
+    """
+    A GET API view that returns tombstones for objects deleted from the models served by the
+    other dataset endpoints.
+
+    Data-flow uses this to remove deleted records from Data Workspace when only fetching
+    records modified since its last run (using the modified_since query parameter).
+    """
+
+    pagination_class = DeletedRecordsDatasetViewCursorPagination
+    modified_on_field = 'deleted_on'
+
+    def get_dataset(self):
+        """Returns list of DeletedRecord records"""
+        return DeletedRecord.objects.values(
+            'id',
+            'model',
+            'object_id',
+            'deleted_on',
+        )
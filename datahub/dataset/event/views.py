@@ -13,6 +13,8 @@ class EventsDatasetView(BaseDatasetView):
     response result to insert data into Dataworkspace through its defined API endpoints.
     """
 
+    modified_on_field = 'modified_on'
+
     def get_dataset(self):
         """Returns a list of all interaction records"""
         return Event.objects.annotate(
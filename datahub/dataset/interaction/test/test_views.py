@@ -124,3 +124,35 @@ class TestInteractionsDatasetViewSet(BaseDatasetViewTest):
         ) + [interaction1, interaction2]
         for index, interaction in enumerate(expected_list):
             assert interaction.get_absolute_url() == response_results[index]['interaction_link']
+
+    def test_modified_since(self, data_flow_api_client):
+        """
+        Test that only interactions modified on or after modified_since are returned, ordered by
+        modification date.
+        """
+        with freeze_time('2019-01-01 12:00:00'):
+            CompanyInteractionFactory()
+        with freeze_time('2019-01-03 12:00:00'):
+            interaction_modified_later = CompanyInteractionFactory()
+        with freeze_time('2019-01-02 12:00:00'):
+            interaction_modified_first = CompanyInteractionFactory()
+
+        response = data_flow_api_client.get(
+            self.view_url,
+            params={'modified_since': '2019-01-02T12:00:00Z'},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        response_results = response.json()['results']
+        assert [result['id'] for result in response_results] == [
+            str(interaction_modified_first.pk),
+            str(interaction_modified_later.pk),
+        ]
+
+    def test_invalid_modified_since(self, data_flow_api_client):
+        """Test that an invalid modified_since value returns an error."""
+        response = data_flow_api_client.get(
+            self.view_url,
+            params={'modified_since': 'invalid'},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'modified_since' in response.json()
@@ -17,6 +17,8 @@ class InteractionsDatasetView(BaseDatasetView):
     Data-flow periodically.
     """
 
+    modified_on_field = 'modified_on'
+
     def get_dataset(self):
         """Returns a list of all interaction records"""
         return get_base_interaction_queryset().annotate(
@@ -8,6 +8,8 @@ class InteractionsExportCountryDatasetView(BaseDatasetView):
      as required for syncing by Data-flow periodically.
     """
 
+    modified_on_field = 'modified_on'
+
     def get_dataset(self):
         """Returns list of company_export_country_history records"""
         return InteractionExportCountry.objects.values(
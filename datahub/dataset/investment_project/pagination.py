@@ -3,8 +3,6 @@ Pagination serializers determine the structure of the output that should
 be used for paginated responses.
 """
 
-from rest_framework.response import Response
-
 from datahub.dataset.core.pagination import DatasetCursorPagination
 from datahub.dataset.investment_project.spi import SPIReportFormatter
 
@@ -18,10 +16,4 @@ class InvestmentProjectActivityDatasetViewCursorPagination(DatasetCursorPaginati
         """Get paginated response."""
         spi_report = SPIReportFormatter()
         results = spi_report.format(data)
-        return Response(
-            {
-                'next': self.get_next_link(),
-                'previous': self.get_previous_link(),
-                'results': results,
-            },
-        )
+        return super().get_paginated_response(results)
@@ -26,6 +26,8 @@ class InvestmentProjectsDatasetView(BaseDatasetView):
     and let analyst to work on denormalized table to get more meaningful insight.
     """
 
+    modified_on_field = 'modified_on'
+
     def get_dataset(self):
         """Returns list of Investment Projects Dataset records"""
         return InvestmentProject.objects.annotate(
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.db import models
+
+
+class DeletedRecord(models.Model):
+    """
+    A tombstone for an object that was deleted from a model served by the dataset endpoints.
+
+    These are served by the deleted records dataset endpoint, so that consumers of the other
+    dataset endpoints can remove deleted objects when only fetching records modified since
+    their last run (using the modified_since query parameter).
+
+    Entries are added by the receivers in datahub.dataset.signal_receivers.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    model = models.CharField(max_length=settings.CHAR_FIELD_MAX_LENGTH)
+    object_id = models.CharField(max_length=settings.CHAR_FIELD_MAX_LENGTH)
+    deleted_on = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        """Human-friendly string representation."""
+        return f'{self.model} – {self.object_id}'
+
+    class Meta:
+        indexes = [
+            # For datasets app which includes API endpoints to be consumed by data-flow
+            models.Index(fields=('deleted_on', 'id')),
+        ]
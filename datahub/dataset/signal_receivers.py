@@ -0,0 +1,41 @@
+from django.db.models.signals import post_delete
+
+from datahub.company.models import Company, CompanyExportCountry, Contact
+from datahub.dataset.models import DeletedRecord
+from datahub.event.models import Event
+from datahub.interaction.models import Interaction, InteractionExportCountry
+from datahub.investment.project.models import InvestmentProject
+from datahub.omis.order.models import Order
+
+# Models served by dataset endpoints that support the modified_since query parameter
+MODELS_WITH_DELETED_RECORDS = (
+    Company,
+    CompanyExportCountry,
+    Contact,
+    Event,
+    Interaction,
+    InteractionExportCountry,
+    InvestmentProject,
+    Order,
+)
+
+
+def record_deletion(sender, instance, **kwargs):
+    """
+    Records a tombstone for a deleted object.
+
+    This is saved in the same transaction as the deletion, so it's rolled back if the deletion
+    is.
+    """
+    DeletedRecord.objects.create(
+        model=sender._meta.label_lower,
+        object_id=str(instance.pk),
+    )
+
+
+for model in MODELS_WITH_DELETED_RECORDS:
+    post_delete.connect(
+        record_deletion,
+        sender=model,
+        dispatch_uid=f'dataset_record_deletion_{model._meta.label_lower}',
+    )
@@ -46,3 +46,14 @@ class TestTeamDatasetViewSet(BaseDatasetViewTest):
         results = response.json()['results']
 
         assert results == sorted(results, key=lambda t: t['id'])
+
+    def test_modified_since_not_supported(self, data_flow_api_client):
+        """Test that using modified_since returns an error as teams don't support it."""
+        response = data_flow_api_client.get(
+            self.view_url,
+            params={'modified_since': '2019-01-02T12:00:00Z'},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {
+            'modified_since': ['This dataset does not support filtering by modified_since.'],
+        }
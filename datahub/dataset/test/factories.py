@@ -0,0 +1,13 @@
+from uuid import uuid4
+
+import factory
+
+
+class DeletedRecordFactory(factory.django.DjangoModelFactory):
+    """DeletedRecord factory."""
+
+    model = 'company.company'
+    object_id = factory.LazyFunction(lambda: str(uuid4()))
+
+    class Meta:
+        model = 'dataset.DeletedRecord'
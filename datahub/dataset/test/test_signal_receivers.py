@@ -0,0 +1,45 @@
+import pytest
+
+from datahub.company.test.factories import CompanyFactory, ContactFactory
+from datahub.dataset.models import DeletedRecord
+from datahub.interaction.test.factories import CompanyInteractionFactory
+from datahub.metadata.test.factories import TeamFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize(
+    'factory,expected_model',
+    (
+        (CompanyFactory, 'company.company'),
+        (ContactFactory, 'company.contact'),
+        (CompanyInteractionFactory, 'interaction.interaction'),
+    ),
+)
+def test_deletion_is_recorded(factory, expected_model):
+    """Test that deleting an object records a DeletedRecord for it."""
+    obj = factory()
+    obj_id = obj.pk
+    obj.delete()
+
+    deleted_record = DeletedRecord.objects.filter(model=expected_model).get()
+    assert deleted_record.object_id == str(obj_id)
+    assert deleted_record.deleted_on is not None
+
+
+def test_deletion_of_cascaded_objects_is_recorded():
+    """Test that objects deleted as a result of a cascade are also recorded."""
+    interaction = CompanyInteractionFactory()
+    interaction.company.delete()
+
+    assert DeletedRecord.objects.filter(
+        model='interaction.interaction',
+        object_id=str(interaction.pk),
+    ).exists()
+
+
+def test_deletion_of_other_models_is_not_recorded():
+    """Test that deletions of models not served by incremental datasets aren't recorded."""
+    TeamFactory().delete()
+
+    assert not DeletedRecord.objects.exists()
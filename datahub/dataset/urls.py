@@ -15,6 +15,7 @@ from datahub.dataset.company_future_interest_countries.views import (
     CompanyFutureInterestCountriesDatasetView,
 )
 from datahub.dataset.contact.views import ContactsDatasetView
+from datahub.dataset.deleted_record.views import DeletedRecordsDatasetView
 from datahub.dataset.event.views import EventsDatasetView
 from datahub.dataset.interaction.views import InteractionsDatasetView
 from datahub.dataset.interaction_export_country.views import InteractionsExportCountryDatasetView
@@ -69,4 +70,9 @@ urlpatterns = [
         name='investment-projects-activity-dataset',
     ),
     path('events-dataset', EventsDatasetView.as_view(), name='events-dataset'),
+    path(
+        'deleted-records-dataset',
+        DeletedRecordsDatasetView.as_view(),
+        name='deleted-records-dataset',
+    ),
 ]
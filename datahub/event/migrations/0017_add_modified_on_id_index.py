@@ -0,0 +1,17 @@
+# Generated by Django 3.0.5 on 2020-04-22 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0016_add_composite_index_to_event'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['modified_on', 'id'], name='event_event_modifie_937d36_idx'),
+        ),
+    ]
@@ -74,6 +74,7 @@ class Event(BaseModel, DisableableModel):
         indexes = [
             # For datasets app which includes API endpoints to be consumed by data-flow
             models.Index(fields=('created_on', 'id')),
+            models.Index(fields=('modified_on', 'id')),
         ]
 
     def get_absolute_url(self):
@@ -0,0 +1,17 @@
+# Generated by Django 3.0.5 on 2020-04-20 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interaction', '0070_add_interaction_export_countries'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interactionexportcountry',
+            index=models.Index(fields=['created_on', 'id'], name='interaction_created_04f6d5_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.0.5 on 2020-04-22 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interaction', '0071_add_interactionexportcountry_dataset_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interactionexportcountry',
+            index=models.Index(fields=['modified_on', 'id'], name='interaction_modifie_e25729_idx'),
+        ),
+    ]
@@ -384,6 +384,11 @@ class InteractionExportCountry(BaseModel):
                 name='unique_country_interaction',
             ),
         ]
+        indexes = [
+            # For datasets app which includes API endpoints to be consumed by data-flow
+            models.Index(fields=('created_on', 'id')),
+            models.Index(fields=('modified_on', 'id')),
+        ]
         verbose_name_plural = 'interaction export countries'
 
     def __str__(self):
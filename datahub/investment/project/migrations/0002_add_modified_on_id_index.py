@@ -0,0 +1,17 @@
+# Generated by Django 3.0.5 on 2020-04-22 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investment', '0001_squashed_0063_add_created_on_id_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='investmentproject',
+            index=models.Index(fields=['modified_on', 'id'], name='investment__modifie_30238e_idx'),
+        ),
+    ]
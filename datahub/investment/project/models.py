@@ -532,6 +532,8 @@ class InvestmentProject(
         indexes = [
             # For activity stream
             models.Index(fields=('created_on', 'id')),
+            # For datasets app which includes API endpoints to be consumed by data-flow
+            models.Index(fields=('modified_on', 'id')),
         ]
 
     def get_associated_advisers(self):
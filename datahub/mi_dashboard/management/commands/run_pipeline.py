@@ -2,19 +2,53 @@ from logging import getLogger
 
 from django.core.management.base import BaseCommand
 
-from datahub.mi_dashboard.pipelines import run_mi_investment_project_etl_pipeline
+from datahub.mi_dashboard.pipelines import PIPELINES, run_pipeline
 
 logger = getLogger(__name__)
 
 
 class Command(BaseCommand):
-    """Command for running the MI dashboard pipeline."""
+    """Command for running MI dashboard pipelines."""
 
-    help = """It updates all investment projects in the MI database. It should be run after a
-change has been made to the schema.
+    help = """It updates the MI database using the MI dashboard pipelines. All rows are loaded
+unless --incremental is specified.
+
+The time taken by each run is logged, and --repeat can be used to benchmark a pipeline.
 """
 
+    def add_arguments(self, parser):
+        """Define extra arguments."""
+        parser.add_argument(
+            '--pipeline',
+            action='append',
+            choices=PIPELINES.keys(),
+            help='The pipeline to run (can be specified multiple times). Defaults to all.',
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help=(
+                'Only load rows modified since the last run (for pipelines that support '
+                'incremental loads).'
+            ),
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=1,
+            help='The number of times to run each pipeline.',
+        )
+
     def handle(self, *args, **options):
         """Executes the command."""
-        updated, created = run_mi_investment_project_etl_pipeline()
-        logger.info(f'Updated "{updated}" and created "{created}" investment projects.')
+        names = options['pipeline'] or PIPELINES.keys()
+
+        for name in names:
+            for _ in range(options['repeat']):
+                run = run_pipeline(name, full_refresh=not options['incremental'])
+                load_type = 'full refresh' if run.is_full_refresh else 'incremental load'
+                logger.info(
+                    f'{name} ({load_type}): updated "{run.num_updated}", created '
+                    f'"{run.num_created}" and deleted "{run.num_deleted}" rows in '
+                    f'{run.duration.total_seconds():.2f} seconds.',
+                )
@@ -0,0 +1,37 @@
+# Generated by Django 3.0.5 on 2020-04-27 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datahub.mi_dashboard', '0004_add_index_for_financial_year'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MIPipelineRun',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('pipeline', models.CharField(max_length=255)),
+                ('is_full_refresh', models.BooleanField()),
+                ('modified_since', models.DateTimeField(blank=True, null=True)),
+                ('started_on', models.DateTimeField()),
+                ('finished_on', models.DateTimeField(blank=True, null=True)),
+                ('num_updated', models.IntegerField(blank=True, null=True)),
+                ('num_created', models.IntegerField(blank=True, null=True)),
+                ('num_deleted', models.IntegerField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'mi_dashboard_mipipelinerun',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='mipipelinerun',
+            index=models.Index(
+                fields=['pipeline', 'started_on'],
+                name='mi_dashboar_pipelin_9edd21_idx',
+            ),
+        ),
+    ]
@@ -71,3 +71,41 @@ class MIInvestmentProject(models.Model):
         indexes = [
             models.Index(fields=('financial_year',)),
         ]
+
+
+class MIPipelineRun(models.Model):
+    """
+    A run of an MI dashboard pipeline.
+
+    This records whether the run was a full refresh or an incremental load (and from when),
+    and the number of rows and time taken. It's also used to determine the watermark for the
+    next incremental load of the pipeline.
+
+    A run that didn't complete has a null finished_on value.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    pipeline = models.CharField(max_length=settings.CHAR_FIELD_MAX_LENGTH)
+    is_full_refresh = models.BooleanField()
+    modified_since = models.DateTimeField(null=True, blank=True)
+    started_on = models.DateTimeField()
+    finished_on = models.DateTimeField(null=True, blank=True)
+    num_updated = models.IntegerField(null=True, blank=True)
+    num_created = models.IntegerField(null=True, blank=True)
+    num_deleted = models.IntegerField(null=True, blank=True)
+
+    @property
+    def duration(self):
+        """The time taken by the run (None if it didn't complete)."""
+        if not self.finished_on:
+            return None
+
+        return self.finished_on - self.started_on
+
+    class Meta:
+        # See MIInvestmentProject.Meta
+        db_table = 'mi_dashboard_mipipelinerun'
+
+        indexes = [
+            models.Index(fields=('pipeline', 'started_on')),
+        ]
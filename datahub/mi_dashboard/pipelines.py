@@ -1,8 +1,11 @@
-from typing import Tuple, Type
+from datetime import datetime, timedelta
+from typing import NamedTuple, Tuple, Type
 
+from django.db import connections, router, transaction
 from django.db.models import F, Model, Value
 from django.db.models.functions import Coalesce
 from django.db.models.query import QuerySet
+from django.utils.timezone import now
 
 from datahub.core.query_utils import (
     get_choices_as_case_expression,
@@ -10,6 +13,7 @@ from datahub.core.query_utils import (
     get_front_end_url_expression,
     get_string_agg_subquery,
 )
+from datahub.core.utils import slice_iterable_into_chunks
 from datahub.investment.project.models import InvestmentProject
 from datahub.investment.project.query_utils import get_project_code_expression
 from datahub.metadata.query_utils import get_sector_name_subquery
@@ -18,7 +22,7 @@ from datahub.mi_dashboard.constants import (
     NO_SECTOR_ASSIGNED,
     NO_UK_REGION_ASSIGNED,
 )
-from datahub.mi_dashboard.models import MIInvestmentProject
+from datahub.mi_dashboard.models import MIInvestmentProject, MIPipelineRun
 from datahub.mi_dashboard.query_utils import (
     get_collapse_status_name_expression,
     get_country_url,
@@ -29,6 +33,18 @@ from datahub.mi_dashboard.query_utils import (
     get_top_level_sector_expression,
 )
 
+# Incremental loads start from this long before the start of the last completed run, so that
+# changes committed in transactions that were in progress when that run started are not missed
+WATERMARK_OVERLAP = timedelta(hours=1)
+
+
+class LoadCounts(NamedTuple):
+    """The number of destination records changed by a load."""
+
+    updated: int
+    created: int
+    deleted: int
+
 
 class ETLBase:
     """
@@ -37,6 +53,15 @@ class ETLBase:
     This class defines the process of extracting, transforming and loading the data from source
     to destination.
 
+    Pipelines are defined declaratively by subclassing this class and setting:
+
+    - `name` – a unique name for the pipeline (used in run history and task arguments)
+    - `destination_model` – the model that the data will be loaded into
+    - `COLUMNS` – the columns to load
+    - `source_modified_on_field` (optional) – a source field that can be used to only extract
+      rows modified since the last run (only set this if all columns are derived from fields
+      of the source rows themselves, as changes to related objects are not picked up)
+
     Source is defined in the `get_source_query` method. That method should return a query that
     provide rows with all the columns specified in the COLUMNS.
 
@@ -47,19 +72,34 @@ class ETLBase:
 
     For each dictionary assertion is being made that its keys equal COLUMNS.
 
-    Each dictionary representing a row is then updated or created on the destination database.
+    Rows are then inserted into or updated on the destination database in batches, and records
+    no longer in the source are deleted.
     """
 
+    name = None
+    destination_model = None
     COLUMNS = {}
+    source_modified_on_field = None
+    # How often a full refresh is performed for pipelines that support incremental loads.
+    # (Incremental loads only pick up changes to the source rows themselves, and not to related
+    # objects that columns are derived from.)
+    full_refresh_interval = timedelta(days=7)
+    batch_size = 2000
 
-    def __init__(self, destination: Type[Model], **kwargs):
+    def __init__(self, destination: Type[Model] = None, **kwargs):
         """Initialise the destination.
 
         Destination model needs to have all the columns specified in the COLUMNS.
 
-        :param destination: Model object where the data will be loaded.
+        :param destination: Model object where the data will be loaded. Defaults to
+            `destination_model`.
         """
-        self.destination = destination
+        self.destination = destination or self.destination_model
+
+    @property
+    def supports_incremental_load(self):
+        """Whether rows can be extracted incrementally."""
+        return self.source_modified_on_field is not None
 
     def get_source_query(self) -> QuerySet:
         """
@@ -69,42 +109,150 @@ class ETLBase:
         """
         raise NotImplementedError
 
-    def get_rows(self) -> QuerySet:
+    def get_rows(self, modified_since: datetime = None) -> QuerySet:
         """
         Get rows ready to load.
 
+        :param modified_since: if specified, only rows modified since then are returned
         :returns: a QuerySet that returns dictionaries when used as iterable.
         """
-        return self.get_source_query().values(*self.COLUMNS)
+        query = self.get_source_query()
 
-    def load(self) -> Tuple[int, int]:
+        if modified_since:
+            query = query.filter(**{f'{self.source_modified_on_field}__gte': modified_since})
+
+        return query.values(*self.COLUMNS)
+
+    def load(self, modified_since: datetime = None) -> Tuple[int, int]:
         """
         Load data to the destination table.
 
         Existing records should be updated.
 
+        :param modified_since: if specified, only source rows modified since then are loaded
+            (records that no longer exist in the source are still deleted)
         :raises: AssertionError if row.keys() != COLUMNS
         :returns: a tuple with number of updated and created records
         """
+        counts = self.load_with_counts(modified_since=modified_since)
+        return counts.updated, counts.created
+
+    def load_with_counts(self, modified_since: datetime = None) -> LoadCounts:
+        """
+        Load data to the destination table, returning the number of updated, created and
+        deleted records.
+
+        Source rows are read in batches of `batch_size` and written using
+        `INSERT ... ON CONFLICT DO UPDATE`, so each batch takes a single query. Existing records
+        are only updated if at least one of their columns has changed. Records that no longer
+        exist in the source are deleted.
+
+        Everything is loaded in a single transaction, so the destination table is never seen in
+        a partially loaded state.
+
+        :param modified_since: if specified, only source rows modified since then are loaded
+        :raises: AssertionError if row.keys() != COLUMNS
+        """
+        if modified_since and not self.supports_incremental_load:
+            raise ValueError(f'The {self.name} pipeline does not support incremental loads.')
+
         updated = 0
         created = 0
-        for row in self.get_rows().iterator():
-            assert row.keys() == self.COLUMNS, 'Row keys do not match COLUMNS.'
+        source_pks = set()
+        pk_name = self.destination._meta.pk.name
+        rows = self.get_rows(modified_since=modified_since).iterator(chunk_size=self.batch_size)
+
+        with transaction.atomic(using=self._db_alias):
+            for batch in slice_iterable_into_chunks(rows, self.batch_size):
+                for row in batch:
+                    assert row.keys() == self.COLUMNS, 'Row keys do not match COLUMNS.'
+                    source_pks.add(row[pk_name])
+
+                num_updated, num_created = self._upsert(batch)
+                updated += num_updated
+                created += num_created
+
+            if modified_since:
+                # Only some of the rows were extracted, so the primary keys of the other rows
+                # are fetched separately
+                source_pks = set(self.get_source_query().values_list(pk_name, flat=True))
+
+            deleted = self._delete_missing(source_pks)
+
+        return LoadCounts(updated, created, deleted)
+
+    @property
+    def _db_alias(self):
+        return router.db_for_write(self.destination)
+
+    def _upsert(self, rows):
+        """
+        Inserts or updates a batch of rows.
+
+        Rows that are identical to the existing record are skipped (using a row comparison in
+        the ON CONFLICT clause).
+
+        :returns: a tuple with number of updated and created records
+        """
+        connection = connections[self._db_alias]
+        quote_name = connection.ops.quote_name
+
+        meta = self.destination._meta
+        pk_name = meta.pk.name
+        # The primary key is listed first so that it's easy to spot in the SQL
+        field_names = [pk_name, *sorted(self.COLUMNS - {pk_name})]
+        fields = [meta.get_field(field_name) for field_name in field_names]
+
+        table = quote_name(meta.db_table)
+        columns = [quote_name(field.column) for field in fields]
+        updatable_columns = columns[1:]
+        row_placeholder = f'({", ".join(["%s"] * len(columns))})'
+
+        # xmax is 0 for newly inserted rows
+        sql = f"""
+INSERT INTO {table} ({', '.join(columns)})
+VALUES {', '.join([row_placeholder] * len(rows))}
+ON CONFLICT ({columns[0]}) DO UPDATE
+SET {', '.join(f'{column} = EXCLUDED.{column}' for column in updatable_columns)}
+WHERE ({', '.join(f'{table}.{column}' for column in updatable_columns)})
+    IS DISTINCT FROM ({', '.join(f'EXCLUDED.{column}' for column in updatable_columns)})
+RETURNING (xmax = 0)
+"""
+        params = [
+            field.get_db_prep_save(row[field_name], connection)
+            for row in rows
+            for field_name, field in zip(field_names, fields)
+        ]
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            # Only inserted and changed rows are returned
+            results = [is_created for is_created, in cursor.fetchall()]
+
+        num_created = sum(results)
+        return len(results) - num_created, num_created
 
-            pk = row.pop(self.destination._meta.pk.name)
-            _, is_created = self.destination.objects.update_or_create(
-                pk=pk,
-                defaults=row,
-            )
-            updated += int(not is_created)
-            created += int(is_created)
+    def _delete_missing(self, source_pks):
+        """Deletes destination records that are no longer in the source."""
+        destination_pks = self.destination.objects.values_list('pk', flat=True)
+        pks_to_delete = [pk for pk in destination_pks.iterator() if pk not in source_pks]
 
-        return updated, created
+        for batch in slice_iterable_into_chunks(pks_to_delete, self.batch_size):
+            self.destination.objects.filter(pk__in=batch).delete()
+
+        return len(pks_to_delete)
 
 
 class ETLInvestmentProjects(ETLBase):
     """Extract, Transform and Load Investment Projects."""
 
+    name = 'investment_projects'
+    destination_model = MIInvestmentProject
+    # Incremental loads are not used, as many columns are derived from related objects (such
+    # as the investor company's country and the sector), which would otherwise be out of date
+    # until the next full refresh
+    source_modified_on_field = None
+
     # Columns must exist both in the source query and the destination model.
     COLUMNS = {
         'dh_fdi_project_id',
@@ -201,7 +349,71 @@ class ETLInvestmentProjects(ETLBase):
         )
 
 
+PIPELINES = {
+    pipeline.name: pipeline
+    for pipeline in (
+        ETLInvestmentProjects,
+    )
+}
+
+
+def run_pipeline(name: str, full_refresh: bool = False) -> MIPipelineRun:
+    """
+    Runs a pipeline and records the run in the run history.
+
+    Pipelines that support incremental loads only load rows modified since the last completed
+    run (less WATERMARK_OVERLAP), unless:
+
+    - a full refresh is requested
+    - there hasn't been a completed full refresh within the pipeline's full_refresh_interval
+
+    Records that no longer exist in the source are deleted in both cases.
+
+    :param name: the name of the pipeline (a key of PIPELINES)
+    :param full_refresh: whether to load all rows regardless of when they were last modified
+    :returns: the MIPipelineRun for the run
+    """
+    pipeline = PIPELINES[name]()
+    started_on = now()
+    modified_since = None if full_refresh else _get_modified_since(pipeline, started_on)
+
+    run = MIPipelineRun.objects.create(
+        pipeline=name,
+        is_full_refresh=modified_since is None,
+        modified_since=modified_since,
+        started_on=started_on,
+    )
+
+    counts = pipeline.load_with_counts(modified_since=modified_since)
+
+    run.num_updated, run.num_created, run.num_deleted = counts
+    run.finished_on = now()
+    run.save(update_fields=('num_updated', 'num_created', 'num_deleted', 'finished_on'))
+    return run
+
+
 def run_mi_investment_project_etl_pipeline():
     """Runs FDI dashboard data load."""
-    pipeline = ETLInvestmentProjects(destination=MIInvestmentProject)
-    return pipeline.load()
+    run = run_pipeline(ETLInvestmentProjects.name)
+    return run.num_updated, run.num_created
+
+
+def _get_modified_since(pipeline, started_on):
+    if not pipeline.supports_incremental_load:
+        return None
+
+    completed_runs = MIPipelineRun.objects.filter(
+        pipeline=pipeline.name,
+        finished_on__isnull=False,
+    ).order_by('-started_on')
+
+    has_recent_full_refresh = completed_runs.filter(
+        is_full_refresh=True,
+        started_on__gte=started_on - pipeline.full_refresh_interval,
+    ).exists()
+    if not has_recent_full_refresh:
+        return None
+
+    # There is at least one completed run at this point
+    last_run = completed_runs.first()
+    return last_run.started_on - WATERMARK_OVERLAP
@@ -5,11 +5,22 @@ from celery.utils.log import get_task_logger
 from django.conf import settings
 from django_pglocks import advisory_lock
 
-from datahub.mi_dashboard.pipelines import run_mi_investment_project_etl_pipeline
+from datahub.mi_dashboard.pipelines import PIPELINES, run_pipeline
 
 logger = get_task_logger(__name__)
 
 
+@shared_task(acks_late=True, priority=7, queue='long-running')
+def run_mi_pipelines(full_refresh=False):
+    """
+    Schedules a task for each MI dashboard pipeline.
+
+    The pipelines are independent of each other, so they can run in parallel.
+    """
+    for name in PIPELINES:
+        run_mi_pipeline.apply_async(args=(name,), kwargs={'full_refresh': full_refresh})
+
+
 @shared_task(
     bind=True,
     acks_late=True,
@@ -19,26 +30,29 @@ logger = get_task_logger(__name__)
     retry_backoff=60,
     queue='long-running',
 )
-def mi_investment_project_etl_pipeline(self):
+def run_mi_pipeline(self, name, full_refresh=False):
     """
-    Completes MI dashboard feed.
+    Runs an MI dashboard pipeline.
     """
-    with advisory_lock(f'leeloo-mi_investment_project_etl_pipeline', wait=False) as lock_held:
+    with advisory_lock(f'leeloo-mi_dashboard_pipeline-{name}', wait=False) as lock_held:
         if not lock_held:
             logger.warning(
-                f'Another mi_dashboard_feed task is in progress. Aborting...',
+                f'Another run of the {name} MI dashboard pipeline is in progress. Aborting...',
             )
             return
 
-        logger.info('Started MI dashboard feed.')
+        logger.info(f'Started the {name} MI dashboard pipeline.')
 
         start_time = perf_counter()
-        updated, created = run_mi_investment_project_etl_pipeline()
+        run = run_pipeline(name, full_refresh=full_refresh)
         elapsed_time = perf_counter() - start_time
         if elapsed_time > settings.MI_FDI_DASHBOARD_TASK_DURATION_WARNING_THRESHOLD:
-            logger.warning((
-                'The mi_investment_project_etl_pipeline task took a long time '
-                '({elapsed_time:.2f} seconds).'
-            ))
+            logger.warning(
+                f'The {name} MI dashboard pipeline took a long time '
+                f'({elapsed_time:.2f} seconds).',
+            )
 
-        logger.info(f'Updated "{updated}" and created "{created}" investment projects.')
+        logger.info(
+            f'The {name} MI dashboard pipeline updated "{run.num_updated}", created '
+            f'"{run.num_created}" and deleted "{run.num_deleted}" rows.',
+        )
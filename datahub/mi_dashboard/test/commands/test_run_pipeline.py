@@ -1,9 +1,13 @@
+from datetime import datetime
+from unittest.mock import call, Mock
+
 import pytest
 from django.core import management
+from django.utils.timezone import utc
 
 from datahub.investment.project.test.factories import InvestmentProjectFactory
 from datahub.mi_dashboard.management.commands import run_pipeline
-from datahub.mi_dashboard.models import MIInvestmentProject
+from datahub.mi_dashboard.models import MIInvestmentProject, MIPipelineRun
 from datahub.mi_dashboard.pipelines import ETLInvestmentProjects
 
 # mark the whole module for db use
@@ -18,7 +22,9 @@ def test_run_pipeline(caplog):
 
     management.call_command(run_pipeline.Command())
 
-    assert 'Updated "0" and created "5" investment projects.' in caplog.text
+    assert (
+        'investment_projects (full refresh): updated "0", created "5" and deleted "0" rows in'
+    ) in caplog.text
     assert len(caplog.records) == 1
 
     etl = ETLInvestmentProjects(destination=MIInvestmentProject)
@@ -26,3 +32,37 @@ def test_run_pipeline(caplog):
     for row in dashboard:
         source_row = etl.get_rows().get(pk=row['dh_fdi_project_id'])
         assert source_row == row
+
+
+@pytest.mark.parametrize('incremental', (True, False))
+def test_run_pipeline_repeat(monkeypatch, incremental):
+    """
+    Tests that run_pipeline command runs the pipeline the specified number of times, and only
+    performs incremental loads if --incremental is specified.
+    """
+    run_pipeline_mock = Mock(
+        side_effect=lambda name, full_refresh: MIPipelineRun(
+            pipeline=name,
+            is_full_refresh=full_refresh,
+            started_on=datetime(2020, 1, 1, tzinfo=utc),
+            finished_on=datetime(2020, 1, 1, tzinfo=utc),
+            num_updated=0,
+            num_created=0,
+            num_deleted=0,
+        ),
+    )
+    monkeypatch.setattr(
+        'datahub.mi_dashboard.management.commands.run_pipeline.run_pipeline',
+        run_pipeline_mock,
+    )
+
+    management.call_command(
+        run_pipeline.Command(),
+        pipeline=['investment_projects'],
+        repeat=2,
+        incremental=incremental,
+    )
+
+    assert run_pipeline_mock.call_args_list == [
+        call('investment_projects', full_refresh=not incremental),
+    ] * 2
@@ -1,12 +1,15 @@
-from datetime import date
+from datetime import date, datetime, timedelta
 
 import pytest
 from django.conf import settings
 from django.core.exceptions import FieldDoesNotExist, FieldError
+from django.utils.timezone import utc
+from freezegun import freeze_time
 
 from datahub.company.test.factories import CompanyFactory
 from datahub.core.constants import Country, FDIValue, Sector, SectorCluster, UKRegion
 from datahub.dbmaintenance.utils import parse_uuid
+from datahub.investment.project.models import InvestmentProject
 from datahub.investment.project.test.factories import InvestmentProjectFactory
 from datahub.metadata.test.factories import SectorFactory
 from datahub.mi_dashboard.constants import (
@@ -15,15 +18,36 @@ from datahub.mi_dashboard.constants import (
     NO_SECTOR_CLUSTER_ASSIGNED,
     NO_UK_REGION_ASSIGNED,
 )
-from datahub.mi_dashboard.models import MIInvestmentProject
+from datahub.mi_dashboard.models import MIInvestmentProject, MIPipelineRun
 from datahub.mi_dashboard.pipelines import (
     ETLInvestmentProjects,
+    PIPELINES,
     run_mi_investment_project_etl_pipeline,
+    run_pipeline,
+    WATERMARK_OVERLAP,
 )
 
 pytestmark = pytest.mark.django_db
 
 
+class ETLInvestmentProjectsIncremental(ETLInvestmentProjects):
+    """Version of ETLInvestmentProjects that supports incremental loads."""
+
+    name = 'investment_projects_incremental'
+    source_modified_on_field = 'modified_on'
+
+
+@pytest.fixture
+def incremental_pipeline(monkeypatch):
+    """Adds a pipeline that supports incremental loads to PIPELINES, returning its name."""
+    monkeypatch.setitem(
+        PIPELINES,
+        ETLInvestmentProjectsIncremental.name,
+        ETLInvestmentProjectsIncremental,
+    )
+    return ETLInvestmentProjectsIncremental.name
+
+
 def test_pipeline_can_query_investmentprojects():
     """Test that pipeline can query investment projects."""
     try:
@@ -92,6 +116,53 @@ def test_investment_projects_get_updated():
         assert source_row == row
 
 
+def test_unchanged_investment_projects_are_not_updated():
+    """Tests that investment projects that haven't changed are skipped when loading again."""
+    investment_projects = InvestmentProjectFactory.create_batch(3)
+    etl = ETLInvestmentProjects(destination=MIInvestmentProject)
+    etl.load()
+
+    investment_projects[0].number_new_jobs = 100000000
+    investment_projects[0].save()
+
+    updated, created = etl.load()
+    assert (1, 0) == (updated, created)
+
+
+def test_investment_projects_are_loaded_in_batches(monkeypatch):
+    """Tests that investment projects are loaded correctly when there are multiple batches."""
+    monkeypatch.setattr(ETLInvestmentProjects, 'batch_size', 3)
+    InvestmentProjectFactory.create_batch(7)
+    etl = ETLInvestmentProjects(destination=MIInvestmentProject)
+
+    updated, created = etl.load()
+    assert (0, 7) == (updated, created)
+
+    dashboard = MIInvestmentProject.objects.values(*etl.COLUMNS).all()
+    assert len(dashboard) == 7
+    for row in dashboard:
+        source_row = etl.get_rows().get(pk=row['dh_fdi_project_id'])
+        assert source_row == row
+
+
+def test_deleted_investment_projects_are_removed():
+    """Tests that investment projects no longer in the source are deleted from the destination."""
+    investment_projects = InvestmentProjectFactory.create_batch(3)
+    etl = ETLInvestmentProjects(destination=MIInvestmentProject)
+    etl.load()
+
+    deleted_investment_project_pk = investment_projects[0].pk
+    investment_projects[0].delete()
+
+    updated, created = etl.load()
+    assert (0, 0) == (updated, created)
+
+    assert set(MIInvestmentProject.objects.values_list('pk', flat=True)) == {
+        investment_project.pk for investment_project in investment_projects[1:]
+    }
+    assert not MIInvestmentProject.objects.filter(pk=deleted_investment_project_pk).exists()
+
+
 def test_run_mi_investment_project_etl_pipeline():
     """Tests that run_mi_investment_project_etl_pipeline copy data to MIInvestmentProject table."""
     InvestmentProjectFactory.create_batch(5, actual_land_date=date(2018, 4, 1))
@@ -107,6 +178,118 @@ def test_run_mi_investment_project_etl_pipeline():
         assert source_row == row
 
 
+def test_run_pipeline_records_run(incremental_pipeline):
+    """Tests that run_pipeline records the run in the run history."""
+    InvestmentProjectFactory.create_batch(2)
+
+    with freeze_time(datetime(2020, 1, 1, tzinfo=utc)) as frozen_datetime:
+        started_on = datetime.now(utc)
+        run_pipeline(incremental_pipeline)
+        frozen_datetime.tick(timedelta(minutes=1))
+        run_pipeline(incremental_pipeline)
+
+    runs = MIPipelineRun.objects.order_by('id')
+    assert [
+        (
+            run.pipeline,
+            run.is_full_refresh,
+            run.modified_since,
+            run.num_updated,
+            run.num_created,
+            run.num_deleted,
+        )
+        for run in runs
+    ] == [
+        (incremental_pipeline, True, None, 0, 2, 0),
+        (incremental_pipeline, False, started_on - WATERMARK_OVERLAP, 0, 0, 0),
+    ]
+    assert runs[0].duration == timedelta(0)
+
+
+def test_investment_projects_pipeline_always_does_full_refresh():
+    """
+    Tests that the investment projects pipeline picks up changes to related objects (by always
+    doing a full refresh).
+    """
+    project = InvestmentProjectFactory(
+        investor_company=CompanyFactory(address_country_id=Country.ireland.value.id),
+    )
+    run_pipeline('investment_projects')
+
+    # This doesn't update the modified_on of the project
+    project.investor_company.address_country_id = Country.japan.value.id
+    project.investor_company.save()
+    run = run_pipeline('investment_projects')
+
+    assert run.is_full_refresh
+    assert run.num_updated == 1
+    mi_investment_project = MIInvestmentProject.objects.get(pk=project.pk)
+    assert mi_investment_project.investor_company_country == Country.japan.value.name
+
+
+def test_run_pipeline_incremental_load(incremental_pipeline):
+    """
+    Tests that an incremental load only loads rows modified since the last run, but deletes
+    rows that no longer exist in the source.
+    """
+    start = datetime(2020, 1, 1, tzinfo=utc)
+
+    with freeze_time(start - timedelta(hours=2)):
+        modified_project, unmodified_project, deleted_project = (
+            InvestmentProjectFactory.create_batch(3)
+        )
+
+    with freeze_time(start):
+        run_pipeline(incremental_pipeline)
+
+    with freeze_time(start + timedelta(hours=1)):
+        modified_project.number_new_jobs = 100
+        modified_project.save()
+        # This doesn't update modified_on, so the change is only picked up by a full refresh
+        InvestmentProject.objects.filter(pk=unmodified_project.pk).update(number_new_jobs=200)
+        deleted_project.delete()
+
+        run = run_pipeline(incremental_pipeline)
+
+    assert not run.is_full_refresh
+    assert (run.num_updated, run.num_created, run.num_deleted) == (1, 0, 1)
+    assert dict(MIInvestmentProject.objects.values_list('pk', 'number_new_jobs')) == {
+        modified_project.pk: 100,
+        unmodified_project.pk: unmodified_project.number_new_jobs,
+    }
+
+    with freeze_time(start + timedelta(hours=2)):
+        run = run_pipeline(incremental_pipeline, full_refresh=True)
+
+    assert run.is_full_refresh
+    assert (run.num_updated, run.num_created, run.num_deleted) == (1, 0, 0)
+    assert MIInvestmentProject.objects.get(pk=unmodified_project.pk).number_new_jobs == 200
+
+
+@pytest.mark.parametrize(
+    'time_since_full_refresh,expected_is_full_refresh',
+    (
+        (ETLInvestmentProjects.full_refresh_interval - timedelta(minutes=1), False),
+        (ETLInvestmentProjects.full_refresh_interval + timedelta(minutes=1), True),
+    ),
+)
+def test_run_pipeline_full_refresh_interval(
+    incremental_pipeline,
+    time_since_full_refresh,
+    expected_is_full_refresh,
+):
+    """Tests that a full refresh is performed if there hasn't been one recently."""
+    start = datetime(2020, 1, 1, tzinfo=utc)
+
+    with freeze_time(start):
+        run_pipeline(incremental_pipeline)
+
+    with freeze_time(start + time_since_full_refresh):
+        run = run_pipeline(incremental_pipeline)
+
+    assert run.is_full_refresh == expected_is_full_refresh
+
+
 @pytest.mark.parametrize(
     'fdi_value_id,expected',
     (
@@ -3,36 +3,48 @@ from unittest.mock import Mock
 import pytest
 from django.conf import settings
 
-from datahub.mi_dashboard.tasks import mi_investment_project_etl_pipeline
+from datahub.mi_dashboard.models import MIPipelineRun
+from datahub.mi_dashboard.tasks import run_mi_pipeline, run_mi_pipelines
 
 # mark the whole module for db use
 pytestmark = pytest.mark.django_db
 
 
-def test_mi_dashboard_feed(monkeypatch):
-    """Test that the fdi_dashboard_pipeline gets called."""
-    run_mi_investment_project_etl_pipeline_mock = Mock(side_effect=[(0, 0)])
-    monkeypatch.setattr(
-        'datahub.mi_dashboard.tasks.run_mi_investment_project_etl_pipeline',
-        run_mi_investment_project_etl_pipeline_mock,
+def _get_run():
+    return MIPipelineRun(num_updated=0, num_created=0, num_deleted=0)
+
+
+def test_run_mi_pipelines(monkeypatch):
+    """Test that a task is scheduled for each pipeline."""
+    run_mi_pipeline_mock = Mock()
+    monkeypatch.setattr('datahub.mi_dashboard.tasks.run_mi_pipeline', run_mi_pipeline_mock)
+
+    run_mi_pipelines.apply(kwargs={'full_refresh': True})
+
+    run_mi_pipeline_mock.apply_async.assert_called_once_with(
+        args=('investment_projects',),
+        kwargs={'full_refresh': True},
     )
 
-    mi_investment_project_etl_pipeline.apply()
 
-    assert run_mi_investment_project_etl_pipeline_mock.call_count == 1
+def test_mi_dashboard_feed(monkeypatch):
+    """Test that the pipeline gets run."""
+    run_pipeline_mock = Mock(side_effect=[_get_run()])
+    monkeypatch.setattr('datahub.mi_dashboard.tasks.run_pipeline', run_pipeline_mock)
+
+    run_mi_pipeline.apply(args=('investment_projects',))
+
+    run_pipeline_mock.assert_called_once_with('investment_projects', full_refresh=False)
 
 
 def test_mi_dashboard_feed_retries_on_error(monkeypatch):
-    """Test that the mi_dashboard_feed task retries on error."""
-    run_mi_investment_project_etl_pipeline_mock = Mock(side_effect=[AssertionError, (0, 0)])
-    monkeypatch.setattr(
-        'datahub.mi_dashboard.tasks.run_mi_investment_project_etl_pipeline',
-        run_mi_investment_project_etl_pipeline_mock,
-    )
+    """Test that the run_mi_pipeline task retries on error."""
+    run_pipeline_mock = Mock(side_effect=[AssertionError, _get_run()])
+    monkeypatch.setattr('datahub.mi_dashboard.tasks.run_pipeline', run_pipeline_mock)
 
-    mi_investment_project_etl_pipeline.apply()
+    run_mi_pipeline.apply(args=('investment_projects',))
 
-    assert run_mi_investment_project_etl_pipeline_mock.call_count == 2
+    assert run_pipeline_mock.call_count == 2
 
 
 @pytest.mark.parametrize(
@@ -46,11 +58,8 @@ def test_mi_dashboard_elapsed_time_warning(elapsed_time, num_warnings, monkeypat
     """Test that crossing the elapsed time threshold would result in warning."""
     caplog.set_level('WARNING')
 
-    run_mi_investment_project_etl_pipeline_mock = Mock(side_effect=[(0, 0)])
-    monkeypatch.setattr(
-        'datahub.mi_dashboard.tasks.run_mi_investment_project_etl_pipeline',
-        run_mi_investment_project_etl_pipeline_mock,
-    )
+    run_pipeline_mock = Mock(side_effect=[_get_run()])
+    monkeypatch.setattr('datahub.mi_dashboard.tasks.run_pipeline', run_pipeline_mock)
 
     perf_counter_mock = Mock(side_effect=[0, elapsed_time])
     monkeypatch.setattr(
@@ -58,12 +67,12 @@ def test_mi_dashboard_elapsed_time_warning(elapsed_time, num_warnings, monkeypat
         perf_counter_mock,
     )
 
-    mi_investment_project_etl_pipeline.apply()
+    run_mi_pipeline.apply(args=('investment_projects',))
 
-    assert run_mi_investment_project_etl_pipeline_mock.call_count == 1
+    assert run_pipeline_mock.call_count == 1
     assert len(caplog.records) == num_warnings
     if num_warnings > 0:
         assert (
-            'The mi_investment_project_etl_pipeline task took a long time '
-            '({elapsed_time:.2f} seconds).'
+            'The investment_projects MI dashboard pipeline took a long time '
+            f'({elapsed_time:.2f} seconds).'
         ) in caplog.text
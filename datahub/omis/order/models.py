@@ -302,6 +302,8 @@ class Order(BaseModel):
         indexes = [
             # For activity stream
             models.Index(fields=('created_on', 'id')),
+            # For datasets app which includes API endpoints to be consumed by data-flow
+            models.Index(fields=('modified_on', 'id')),
         ]
 
     def __str__(self):
@@ -0,0 +1,47 @@
+from django.contrib import admin
+
+from datahub.core.admin import format_json_as_html, ViewOnlyAdmin
+from datahub.search.models import SlowSearchQuery
+
+
+@admin.register(SlowSearchQuery)
+class SlowSearchQueryAdmin(ViewOnlyAdmin):
+    """Admin configuration for SlowSearchQuery."""
+
+    list_display = (
+        'view',
+        'search_app',
+        'sort_field',
+        'max_took',
+        'last_took',
+        'num_occurrences',
+        'last_seen_on',
+    )
+    list_filter = ('search_app', 'view')
+    ordering = ('-max_took',)
+    fields = (
+        'shape_hash',
+        'view',
+        'search_app',
+        'sort_field',
+        'max_took',
+        'last_took',
+        'num_occurrences',
+        'first_seen_on',
+        'last_seen_on',
+        'pretty_shape',
+        'pretty_profile',
+    )
+    readonly_fields = fields
+
+    def pretty_shape(self, obj):
+        """Returns the query shape formatted with indentation."""
+        return format_json_as_html(obj.shape)
+
+    pretty_shape.short_description = 'query shape'
+
+    def pretty_profile(self, obj):
+        """Returns the profile formatted with indentation."""
+        return format_json_as_html(obj.profile)
+
+    pretty_profile.short_description = 'profile'
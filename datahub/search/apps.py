@@ -23,6 +23,11 @@ class SearchApp:
     # A single permission. The user must have this permission and a permission in view_permissions
     # in order to export search results.
     export_permission = None
+    # Fields (which can span relationships) that are compared against the watermark during
+    # incremental syncs to find objects that have changed since the last sync. Fields of related
+    # objects embedded in the document can be included so that changes to them are picked up.
+    # Set to None to always perform a full sync.
+    incremental_sync_fields = ('modified_on',)
 
     @classmethod
     def load_views(cls):
@@ -1,7 +1,17 @@
+from collections import defaultdict
+from contextlib import contextmanager
 from logging import getLogger
+from queue import Queue
+from threading import Lock, Thread
+from time import perf_counter
 
+from django.conf import settings
+from django.db import connections
+
+from datahub.core import statsd
 from datahub.core.utils import slice_iterable_into_chunks
 from datahub.search.elasticsearch import bulk
+from datahub.search.execute_query import invalidate_search_app_results
 
 logger = getLogger(__name__)
 
@@ -9,30 +19,69 @@ PROGRESS_INTERVAL = 20000
 BULK_INDEX_TIMEOUT_SECS = 300
 
 
-def sync_app(search_app, batch_size=None, post_batch_callback=None):
-    """Syncs objects for an app to ElasticSearch in batches of batch_size."""
+def sync_app(
+    search_app,
+    batch_size=None,
+    post_batch_callback=None,
+    pk_range=None,
+    concurrency=None,
+    object_filter=None,
+):
+    """
+    Syncs objects for an app to ElasticSearch in batches of batch_size.
+
+    :param pk_range: optional (start_pk, end_pk) tuple to only sync a partition of the objects
+                     (as returned by get_pk_partitions())
+    :param object_filter: optional Q object to only sync a subset of the objects
+    :param concurrency: number of threads sending bulk requests to Elasticsearch while the next
+                        batches are fetched from the database (defaults to
+                        settings.ES_BULK_SYNC_CONCURRENCY). If 0, batches are fetched and sent
+                        serially in the current thread.
+    :returns: the number of objects synced
+    """
     model_name = search_app.es_model.__name__
     batch_size = batch_size or search_app.bulk_batch_size
+    concurrency = settings.ES_BULK_SYNC_CONCURRENCY if concurrency is None else concurrency
+    queryset = search_app.queryset
+
+    if object_filter is not None:
+        queryset = queryset.filter(object_filter)
+
+    if pk_range:
+        queryset = _filter_by_pk_range(queryset, pk_range)
+        start_pk, end_pk = pk_range
+        model_name = f'{model_name} (partition {start_pk} to {end_pk})'
+
     logger.info(f'Processing {model_name} records, using batch size {batch_size}')
 
     read_indices, write_index = search_app.es_model.get_read_and_write_indices()
 
     num_source_rows_processed = 0
     num_objects_synced = 0
-    total_rows = search_app.queryset.count()
-    it = search_app.queryset.values_list('pk', flat=True).iterator(chunk_size=batch_size)
+    total_rows = queryset.count()
+    it = queryset.values_list('pk', flat=True).iterator(chunk_size=batch_size)
     batches = slice_iterable_into_chunks(it, batch_size)
-    for batch in batches:
-        objs = search_app.queryset.filter(pk__in=batch)
 
-        num_actions = sync_objects(
-            search_app.es_model,
-            objs,
+    if concurrency:
+        pipeline = BulkSyncPipeline(
             read_indices,
             write_index,
+            concurrency=concurrency,
+            max_pending_batches=settings.ES_BULK_SYNC_MAX_PENDING_BATCHES,
             post_batch_callback=post_batch_callback,
         )
+        batch_results = pipeline.run(search_app.es_model, queryset, batches)
+    else:
+        batch_results = _sync_batches(
+            search_app.es_model,
+            queryset,
+            batches,
+            read_indices,
+            write_index,
+            post_batch_callback,
+        )
 
+    for batch, num_actions in batch_results:
         emit_progress = (
             (num_source_rows_processed + num_actions) // PROGRESS_INTERVAL
             - num_source_rows_processed // PROGRESS_INTERVAL
@@ -55,12 +104,208 @@ def sync_app(search_app, batch_size=None, post_batch_callback=None):
             f'syncing model {model_name}',
         )
 
+    invalidate_search_app_results(search_app.name)
+    return num_objects_synced
+
+
+def get_pk_partitions(search_app, num_partitions):
+    """
+    Splits the objects of a search app into (up to) num_partitions contiguous primary key ranges
+    of roughly equal size.
+
+    Each range is a (start_pk, end_pk) tuple, where start_pk is inclusive and end_pk is exclusive.
+    The first range has a start_pk of None and the last range has an end_pk of None, so that
+    objects created after the partitions were calculated are still included.
+
+    Primary keys are returned as strings so that they can be used as Celery task arguments.
+    """
+    if num_partitions <= 1:
+        return [(None, None)]
+
+    pk_queryset = search_app.queryset.values_list('pk', flat=True).order_by()
+    inner_sql, inner_params = pk_queryset.query.sql_with_params()
+
+    # The boundaries are the primary keys at every partition_size-th row (excluding the first),
+    # where partition_size is the number of rows divided by num_partitions rounded up (so that
+    # there are never more than num_partitions partitions). They're found in a single pass using
+    # window functions, rather than with one OFFSET query per boundary.
+    sql = f"""
+SELECT pk
+FROM (
+    SELECT pk, row_number() OVER (ORDER BY pk) AS row_num, count(*) OVER () AS total_rows
+    FROM ({inner_sql}) AS objects (pk)
+) AS numbered_objects
+WHERE total_rows > %s
+    AND row_num > 1
+    AND (row_num - 1) %% ceil(total_rows::numeric / %s)::bigint = 0
+ORDER BY pk
+"""
+
+    with connections[pk_queryset.db].cursor() as cursor:
+        cursor.execute(sql, (*inner_params, num_partitions, num_partitions))
+        boundaries = [str(pk) for pk, in cursor.fetchall()]
+
+    return list(zip([None, *boundaries], [*boundaries, None]))
+
 
 def sync_objects(es_model, model_objects, read_indices, write_index, post_batch_callback=None):
     """Syncs an iterable of model instances to Elasticsearch."""
     actions = list(
         es_model.db_objects_to_es_documents(model_objects, index=write_index),
     )
+    _send_actions(actions, read_indices, write_index, post_batch_callback)
+    return len(actions)
+
+
+class BulkSyncPipeline:
+    """
+    Syncs batches of objects to Elasticsearch with database fetching and bulk indexing
+    overlapping.
+
+    Batches are fetched from the database and converted to Elasticsearch documents in the
+    calling thread (so that database access stays in the current connection and transaction).
+    The documents are then placed on a bounded queue, from which `concurrency` threads send
+    bulk requests.
+
+    The queue provides back-pressure: if Elasticsearch falls behind, the calling thread blocks
+    once max_pending_batches batches are waiting to be sent.
+
+    The time spent in each stage is recorded, logged once the pipeline finishes and sent to
+    StatsD.
+    """
+
+    STAGES = ('fetch', 'build', 'queue_wait', 'index')
+
+    def __init__(
+        self,
+        read_indices,
+        write_index,
+        concurrency=2,
+        max_pending_batches=2,
+        post_batch_callback=None,
+    ):
+        """Initialises the pipeline."""
+        self.read_indices = read_indices
+        self.write_index = write_index
+        self.concurrency = concurrency
+        self.post_batch_callback = post_batch_callback
+        self.stage_stats = defaultdict(lambda: {'count': 0, 'total_secs': 0, 'max_secs': 0})
+
+        self._queue = Queue(maxsize=max_pending_batches)
+        self._stats_lock = Lock()
+        self._error = None
+
+    def run(self, es_model, queryset, batches):
+        """
+        Syncs batches of primary keys using the pipeline.
+
+        This is a generator that yields a (batch, number of documents) tuple for each batch as
+        soon as the batch has been queued for indexing.
+
+        If a bulk request fails, the first error is re-raised in the calling thread.
+        """
+        workers = [Thread(target=self._send_batches, daemon=True) for _ in range(self.concurrency)]
+        for worker in workers:
+            worker.start()
+
+        try:
+            for batch in batches:
+                self._raise_error_if_failed()
+
+                with self._time_stage('fetch'):
+                    objs = list(queryset.filter(pk__in=batch))
+
+                with self._time_stage('build'):
+                    actions = list(
+                        es_model.db_objects_to_es_documents(objs, index=self.write_index),
+                    )
+
+                with self._time_stage('queue_wait'):
+                    self._queue.put(actions)
+
+                yield batch, len(actions)
+        finally:
+            for _ in workers:
+                self._queue.put(None)
+
+            for worker in workers:
+                worker.join()
+
+            self._log_stats(es_model.__name__)
+
+        self._raise_error_if_failed()
+
+    def _send_batches(self):
+        while True:
+            actions = self._queue.get()
+            if actions is None:
+                return
+
+            # Keep consuming the queue after an error so that the producer isn't blocked
+            if self._error:
+                continue
+
+            try:
+                with self._time_stage('index'):
+                    _send_actions(
+                        actions,
+                        self.read_indices,
+                        self.write_index,
+                        self.post_batch_callback,
+                    )
+            except Exception as exc:
+                logger.exception('Error sending bulk request to Elasticsearch')
+                self._error = exc
+
+    def _raise_error_if_failed(self):
+        if self._error:
+            raise self._error
+
+    @contextmanager
+    def _time_stage(self, stage):
+        start_time = perf_counter()
+        try:
+            yield
+        finally:
+            duration = perf_counter() - start_time
+
+            with self._stats_lock:
+                stats = self.stage_stats[stage]
+                stats['count'] += 1
+                stats['total_secs'] += duration
+                stats['max_secs'] = max(stats['max_secs'], duration)
+
+    def _log_stats(self, model_name):
+        for stage in self.STAGES:
+            stats = self.stage_stats[stage]
+            if not stats['count']:
+                continue
+
+            mean_secs = stats['total_secs'] / stats['count']
+            logger.info(
+                f'{model_name} bulk sync {stage} stage: {stats["count"]} batches, '
+                f'total {stats["total_secs"]:.2f}s, mean {mean_secs:.3f}s, '
+                f'max {stats["max_secs"]:.3f}s',
+            )
+            statsd.timing(f'search.bulk_sync.{stage}', round(mean_secs * 1000))
+
+
+def _sync_batches(es_model, queryset, batches, read_indices, write_index, post_batch_callback):
+    for batch in batches:
+        objs = queryset.filter(pk__in=batch)
+
+        num_actions = sync_objects(
+            es_model,
+            objs,
+            read_indices,
+            write_index,
+            post_batch_callback=post_batch_callback,
+        )
+
+        yield batch, num_actions
+
+
+def _send_actions(actions, read_indices, write_index, post_batch_callback):
     num_actions = len(actions)
     bulk(
         actions=actions,
@@ -71,4 +316,15 @@ def sync_objects(es_model, model_objects, read_indices, write_index, post_batch_
     if post_batch_callback:
         post_batch_callback(read_indices, write_index, actions)
 
-    return num_actions
+
+def _filter_by_pk_range(queryset, pk_range):
+    start_pk, end_pk = pk_range
+    filter_kwargs = {}
+
+    if start_pk is not None:
+        filter_kwargs['pk__gte'] = start_pk
+
+    if end_pk is not None:
+        filter_kwargs['pk__lt'] = end_pk
+
+    return queryset.filter(**filter_kwargs)
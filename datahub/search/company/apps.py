@@ -11,6 +11,7 @@ class CompanySearchApp(SearchApp):
 
     name = 'company'
     es_model = Company
+    incremental_sync_fields = ('modified_on', 'interactions__modified_on')
     view_permissions = (f'company.{CompanyPermission.view_company}',)
     export_permission = f'company.{CompanyPermission.export_company}'
     queryset = DBCompany.objects.select_related(
@@ -163,6 +163,13 @@ class Company(BaseESModel):
         'uk_region': dict_utils.id_name_dict,
     }
 
+    DENORMALISED_FIELDS = {
+        'global_headquarters': (
+            'global_headquarters',
+            'one_list_group_global_account_manager',
+        ),
+    }
+
     SEARCH_FIELDS = (
         'id',
         'name',  # to find 2-letter words
@@ -5,7 +5,7 @@ from datahub.company.models import Company as DBCompany
 from datahub.interaction.models import Interaction as DBInteraction
 from datahub.search.company import CompanySearchApp
 from datahub.search.signals import SignalReceiver
-from datahub.search.sync_object import sync_object_async, sync_related_objects_async
+from datahub.search.sync_object import sync_object_async, update_denormalised_fields_async
 
 
 def company_sync_es(instance):
@@ -16,9 +16,13 @@ def company_sync_es(instance):
 
 
 def company_subsidiaries_sync_es(instance):
-    """Sync company subsidiaries to the Elasticsearch."""
+    """Update the global headquarters fields of company subsidiaries in Elasticsearch."""
     transaction.on_commit(
-        lambda: sync_related_objects_async(instance, 'subsidiaries'),
+        lambda: update_denormalised_fields_async(
+            CompanySearchApp,
+            'global_headquarters',
+            instance,
+        ),
     )
 
 
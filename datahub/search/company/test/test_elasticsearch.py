@@ -25,6 +25,10 @@ def test_mapping(es):
                 '_document_type': {
                     'type': 'keyword',
                 },
+                '_version_hash': {
+                    'index': False,
+                    'type': 'keyword',
+                },
                 'archived': {'type': 'boolean'},
                 'archived_by': {
                     'properties': {
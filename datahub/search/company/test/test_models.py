@@ -23,6 +23,7 @@ class TestCompanyElasticModel:
 
         keys = {
             '_document_type',
+            '_version_hash',
             'archived',
             'archived_by',
             'archived_on',
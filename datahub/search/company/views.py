@@ -95,7 +95,7 @@ class SearchCompanyAPIViewMixin:
 class SearchCompanyAPIView(SearchCompanyAPIViewMixin, SearchAPIView):
     """Filtered company search view."""
 
-    pass
+    cache_results = True
 
 
 @register_v4_view(is_public=True)
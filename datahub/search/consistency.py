@@ -0,0 +1,216 @@
+"""
+Consistency checking between the database and Elasticsearch.
+
+The checker finds:
+
+- missing documents (objects that have no document)
+- stale documents (documents whose content doesn't match the current object)
+- orphaned documents (documents for objects that no longer exist)
+
+Memory usage is bounded regardless of the index size. Objects are fetched from the database
+in batches in primary key order and converted to documents, and the documents for each batch
+are looked up by ID (returning only their _version_hash, which is a hash of the document
+content). Document IDs are then streamed from Elasticsearch using the scroll API and checked
+against the database in batches to find orphaned documents.
+
+As the hash covers the whole document, changes to embedded related data (such as an
+adviser's name) are detected as well as changes to the object itself. Partial updates of
+denormalised fields (see datahub.search.sync_object.update_denormalised_fields()) don't update
+_version_hash, so documents whose hash doesn't match are fetched in full and their content
+hashed before they are treated as stale.
+
+(A single merge-join of both streams is not used, as database and Elasticsearch orderings
+only match for UUID primary keys.)
+"""
+from logging import getLogger
+from typing import NamedTuple
+
+from elasticsearch_dsl import Search
+
+from datahub.core.utils import slice_iterable_into_chunks
+from datahub.search.bulk_sync import sync_objects
+from datahub.search.deletion import delete_documents_from_indices
+from datahub.search.execute_query import invalidate_search_app_results
+from datahub.search.migrate_utils import delete_from_secondary_indices_callback
+from datahub.search.utils import get_document_hash
+
+logger = getLogger(__name__)
+
+CONSISTENCY_CHECK_BATCH_SIZE = 2000
+
+
+class ConsistencyCheckResult(NamedTuple):
+    """The number of inconsistencies found (and repaired, if requested) for a search app."""
+
+    num_objects_checked: int = 0
+    num_missing: int = 0
+    num_stale: int = 0
+    num_orphaned: int = 0
+
+    @property
+    def is_consistent(self):
+        """Returns whether no inconsistencies were found."""
+        return not (self.num_missing or self.num_stale or self.num_orphaned)
+
+
+def check_consistency(search_app, repair=False, batch_size=CONSISTENCY_CHECK_BATCH_SIZE):
+    """
+    Checks that the documents for a search app match the objects in the database.
+
+    If repair is True, missing and stale documents are resynced and orphaned documents are
+    deleted.
+
+    :returns: a ConsistencyCheckResult instance
+    """
+    es_model = search_app.es_model
+    read_indices, write_index = es_model.get_read_and_write_indices()
+    num_objects_checked = 0
+    num_missing = 0
+    num_stale = 0
+
+    for batch in _iter_object_version_hash_batches(search_app, batch_size):
+        document_hashes = _get_document_version_hashes(es_model, batch.keys())
+        missing_ids = batch.keys() - document_hashes.keys()
+        mismatched_ids = {
+            object_id for object_id, document_hash in document_hashes.items()
+            if batch[object_id] != document_hash
+        }
+        stale_ids = _get_stale_document_ids(es_model, batch, mismatched_ids)
+
+        num_objects_checked += len(batch)
+        num_missing += len(missing_ids)
+        num_stale += len(stale_ids)
+        _log_inconsistencies(search_app, 'missing', missing_ids)
+        _log_inconsistencies(search_app, 'stale', stale_ids)
+
+        if repair and (missing_ids or stale_ids):
+            sync_objects(
+                es_model,
+                search_app.queryset.filter(pk__in=missing_ids | stale_ids),
+                read_indices,
+                write_index,
+                post_batch_callback=delete_from_secondary_indices_callback,
+            )
+
+    num_orphaned = 0
+    for orphaned_ids in iter_orphaned_document_id_batches(search_app, batch_size):
+        num_orphaned += len(orphaned_ids)
+        _log_inconsistencies(search_app, 'orphaned', orphaned_ids)
+
+        if repair:
+            delete_documents_by_id(es_model, read_indices, orphaned_ids)
+
+    if repair and (num_missing or num_stale or num_orphaned):
+        invalidate_search_app_results(search_app.name)
+
+    result = ConsistencyCheckResult(num_objects_checked, num_missing, num_stale, num_orphaned)
+    logger.info(f'Consistency check of the {search_app.name} search app complete: {result}')
+    return result
+
+
+def iter_orphaned_document_id_batches(search_app, batch_size=CONSISTENCY_CHECK_BATCH_SIZE):
+    """
+    Streams the IDs of documents whose objects no longer exist in the database.
+
+    Document IDs are streamed from Elasticsearch using the scroll API and checked against the
+    database in batches of batch_size. A set of orphaned IDs is yielded for each batch that
+    contains any.
+    """
+    es_model = search_app.es_model
+    db_manager = search_app.queryset.model._base_manager
+
+    search = Search(index=es_model.get_read_alias()).source(False).params(size=batch_size)
+    doc_ids = (hit.meta.id for hit in search.scan())
+
+    for batch in slice_iterable_into_chunks(doc_ids, batch_size):
+        existing_pks = db_manager.filter(pk__in=batch).values_list('pk', flat=True)
+        orphaned_ids = set(batch) - {str(pk) for pk in existing_pks}
+
+        if orphaned_ids:
+            yield orphaned_ids
+
+
+def delete_documents_by_id(es_model, indices, document_ids):
+    """Deletes documents (by ID) from each of the specified indices."""
+    doc_type = es_model._doc_type.name
+    es_docs = [{'_type': doc_type, '_id': document_id} for document_id in document_ids]
+
+    delete_documents_from_indices(indices, es_docs)
+
+
+def _iter_object_version_hash_batches(search_app, batch_size):
+    """
+    Yields {object ID: version hash} dicts for the objects of a search app, in batches.
+
+    The objects are converted to documents in the same way as when they're synced.
+    """
+    es_model = search_app.es_model
+    pks = search_app.queryset.order_by('pk').values_list('pk', flat=True).iterator(
+        chunk_size=batch_size,
+    )
+
+    for batch_pks in slice_iterable_into_chunks(pks, batch_size):
+        objs = search_app.queryset.filter(pk__in=batch_pks)
+        yield {
+            str(obj.pk): es_model.db_object_to_dict(obj)['_version_hash'] for obj in objs
+        }
+
+
+def _get_document_version_hashes(es_model, document_ids):
+    """Gets {document ID: version hash} for the documents with the specified IDs that exist."""
+    document_ids = list(document_ids)
+    search = Search(
+        index=es_model.get_read_alias(),
+    ).filter(
+        'ids',
+        values=document_ids,
+    ).source(
+        ['_version_hash'],
+    ).extra(
+        size=len(document_ids),
+    )
+
+    return {
+        hit.meta.id: getattr(hit, '_version_hash', None)
+        for hit in search.execute()
+    }
+
+
+def _get_stale_document_ids(es_model, object_hashes, document_ids):
+    """
+    Checks the content of documents whose _version_hash doesn't match the object, returning
+    the IDs of the ones that are actually stale.
+    """
+    if not document_ids:
+        return set()
+
+    document_ids = list(document_ids)
+    search = Search(
+        index=es_model.get_read_alias(),
+    ).filter(
+        'ids',
+        values=document_ids,
+    ).extra(
+        size=len(document_ids),
+    )
+
+    stale_ids = set(document_ids)
+    for hit in search.execute():
+        source = hit.to_dict()
+        source.pop('_version_hash', None)
+
+        if get_document_hash(source) == object_hashes[hit.meta.id]:
+            stale_ids.discard(hit.meta.id)
+
+    return stale_ids
+
+
+def _log_inconsistencies(search_app, kind, document_ids):
+    if not document_ids:
+        return
+
+    examples = ', '.join(sorted(document_ids)[:10])
+    logger.warning(
+        f'{len(document_ids)} {kind} documents found for the {search_app.name} search app '
+        f'(e.g. {examples})',
+    )
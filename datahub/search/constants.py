@@ -0,0 +1,3 @@
+# If active, basic (global) search runs a separate search for each entity in one multi-search
+# request (see get_basic_multi_search_query())
+BASIC_SEARCH_MULTI_SEARCH_FEATURE_FLAG = 'basic-search-multi-search'
@@ -8,6 +8,7 @@ class ContactSearchApp(SearchApp):
 
     name = 'contact'
     es_model = Contact
+    incremental_sync_fields = ('modified_on', 'company__modified_on')
     view_permissions = (f'company.{ContactPermission.view_contact}',)
     export_permission = f'company.{ContactPermission.export_contact}'
     queryset = DBContact.objects.select_related(
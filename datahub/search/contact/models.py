@@ -77,6 +77,12 @@ class Contact(BaseESModel):
         'company_uk_region': dict_utils.computed_nested_id_name_dict('company.uk_region'),
     }
 
+    # Note: The address fields are not included as they also depend on the contact
+    # (via address_same_as_company)
+    DENORMALISED_FIELDS = {
+        'company': ('company', 'company_sector', 'company_uk_region'),
+    }
+
     SEARCH_FIELDS = (
         'id',
         'name',
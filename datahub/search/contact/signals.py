@@ -4,7 +4,11 @@ from django.db.models.signals import post_save
 from datahub.company.models import Company as DBCompany, Contact as DBContact
 from datahub.search.contact import ContactSearchApp
 from datahub.search.signals import SignalReceiver
-from datahub.search.sync_object import sync_object_async, sync_related_objects_async
+from datahub.search.sync_object import (
+    sync_object_async,
+    sync_related_objects_async,
+    update_denormalised_fields_async,
+)
 
 
 def contact_sync_es(instance):
@@ -15,9 +19,22 @@ def contact_sync_es(instance):
 
 
 def related_contact_sync_es(instance):
-    """Sync related Company Contacts."""
+    """
+    Sync related Company Contacts.
+
+    The company fields of all contacts are updated using partial updates. Contacts with
+    address_same_as_company set are fully synced, as their address fields are copied from the
+    company.
+    """
+    transaction.on_commit(
+        lambda: update_denormalised_fields_async(ContactSearchApp, 'company', instance),
+    )
     transaction.on_commit(
-        lambda: sync_related_objects_async(instance, 'contacts'),
+        lambda: sync_related_objects_async(
+            instance,
+            'contacts',
+            related_obj_filter={'address_same_as_company': True},
+        ),
     )
 
 
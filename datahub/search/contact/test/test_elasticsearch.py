@@ -22,6 +22,10 @@ def test_mapping(es):
                 '_document_type': {
                     'type': 'keyword',
                 },
+                '_version_hash': {
+                    'index': False,
+                    'type': 'keyword',
+                },
                 'accepts_dit_email_marketing': {'type': 'boolean'},
                 'address_1': {'type': 'text'},
                 'address_2': {'type': 'text'},
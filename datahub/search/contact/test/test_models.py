@@ -15,6 +15,7 @@ def test_contact_dbmodel_to_dict(es):
 
     keys = {
         '_document_type',
+        '_version_hash',
         'id',
         'title',
         'company',
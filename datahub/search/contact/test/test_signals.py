@@ -1,8 +1,14 @@
 import pytest
 
-from datahub.company.test.factories import ContactFactory
+from datahub.company.test.factories import (
+    CompanyFactory,
+    ContactFactory,
+    ContactWithOwnAddressFactory,
+)
+from datahub.search.contact import ContactSearchApp
 from datahub.search.contact.models import Contact
 from datahub.search.query_builder import get_basic_search_query
+from datahub.search.test.utils import get_documents_by_ids
 
 pytestmark = pytest.mark.django_db
 
@@ -37,3 +43,32 @@ def test_contact_auto_updates_to_es(es_with_signals):
 
     assert result.hits.total == 1
     assert result.hits[0].id == str(contact.id)
+
+
+def test_updating_company_updates_contacts_in_es(es_with_signals):
+    """
+    Test that when a company is updated, the company fields of its contacts are updated
+    (and the addresses of contacts with the same address as the company).
+    """
+    company = CompanyFactory(name='old name', address_town='Old town')
+    contact_with_company_address = ContactFactory(company=company)
+    contact_with_own_address = ContactWithOwnAddressFactory(
+        company=company,
+        address_town='Own town',
+    )
+
+    company.name = 'new name'
+    company.address_town = 'New town'
+    company.save()
+    es_with_signals.indices.refresh()
+
+    result = get_documents_by_ids(
+        es_with_signals,
+        ContactSearchApp,
+        [contact_with_company_address.pk, contact_with_own_address.pk],
+    )
+    docs_by_id = {doc['_id']: doc['_source'] for doc in result['docs']}
+
+    assert {doc['company']['name'] for doc in docs_by_id.values()} == {'new name'}
+    assert docs_by_id[str(contact_with_company_address.pk)]['address_town'] == 'New town'
+    assert docs_by_id[str(contact_with_own_address.pk)]['address_town'] == 'Own town'
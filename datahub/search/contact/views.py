@@ -72,14 +72,13 @@ class SearchContactAPIViewMixin:
 class SearchContactAPIView(SearchContactAPIViewMixin, SearchAPIView):
     """Filtered contact search view."""
 
+    cache_results = True
+
 
 @register_v3_view(sub_path='export')
 class SearchContactExportAPIView(SearchContactAPIViewMixin, SearchExportAPIView):
     """Company search export view."""
 
-    db_sort_by_remappings = {
-        'address_country.name': 'computed_country_name',
-    }
     queryset = DBContact.objects.annotate(
         name=get_full_name_expression(),
         link=get_front_end_url_expression('contact', 'pk'),
@@ -1,17 +1,44 @@
 from collections import defaultdict
 from contextlib import contextmanager
+from logging import getLogger
+from typing import NamedTuple
 
+from django.core.cache import cache
 from django.db import transaction
 from django.db.models.signals import post_delete, pre_delete
 
+from datahub.core import statsd
 from datahub.core.exceptions import DataHubException
 from datahub.search.apps import get_search_app_by_model, get_search_apps
 from datahub.search.elasticsearch import bulk
+from datahub.search.execute_query import invalidate_search_app_results
+from datahub.search.models import PendingSearchDeletion
 from datahub.search.signals import SignalReceiver
 
+logger = getLogger(__name__)
 
 BULK_DELETION_TIMEOUT_SECS = 300
 BULK_CHUNK_SIZE = 10000
+# How long to wait for more documents to be queued before draining the deletion queue for a
+# search app
+PENDING_DELETION_COUNTDOWN_SECS = 2
+PENDING_DELETION_INSERT_BATCH_SIZE = 5000
+
+
+class BulkDeletionResult(NamedTuple):
+    """
+    The outcome of deleting documents from Elasticsearch using one or more bulk requests.
+
+    (Other errors are not counted, as they cause DataHubException to be raised.)
+    """
+
+    num_deleted: int = 0
+    # Documents that did not exist (these are not treated as errors)
+    num_not_found: int = 0
+
+    def __add__(self, other):
+        """Combines two results."""
+        return BulkDeletionResult(*(a + b for a, b in zip(self, other)))
 
 
 def delete_documents(index, es_docs):
@@ -20,12 +47,26 @@ def delete_documents(index, es_docs):
 
     :raises DataHubException: in case of non 404 errors
     """
+    return delete_documents_from_indices([index], es_docs)
+
+
+def delete_documents_from_indices(indices, es_docs):
+    """
+    Deletes `es_docs` from each of `indices` using a single (chunked) bulk operation.
+
+    Documents that do not exist in an index are ignored.
+
+    :returns: a BulkDeletionResult instance
+    :raises DataHubException: in case of non 404 errors
+    """
+    es_docs = list(es_docs)
     delete_actions = (
         _create_delete_action(index, es_doc['_type'], es_doc['_id'])
+        for index in indices
         for es_doc in es_docs
     )
 
-    _, errors = bulk(
+    num_deleted, errors = bulk(
         actions=delete_actions,
         chunk_size=BULK_CHUNK_SIZE,
         request_timeout=BULK_DELETION_TIMEOUT_SECS,
@@ -39,6 +80,120 @@ def delete_documents(index, es_docs):
             f'{non_404_errors!r}',
         )
 
+    return BulkDeletionResult(
+        num_deleted=num_deleted or 0,
+        num_not_found=len(errors),
+    )
+
+
+def delete_document_async(search_app, pk):
+    """
+    Deletes a single object's document from Elasticsearch asynchronously (by adding it to the
+    pending deletion queue).
+
+    This function is normally used by signal receivers to remove deleted objects from
+    Elasticsearch.
+
+    Deletion is migration-safe – if a migration is in progress, the document is deleted from
+    both the new index and the old index.
+    """
+    delete_documents_async(search_app, [pk])
+
+
+def delete_documents_async(search_app, pks):
+    """
+    Adds documents to the pending deletion queue for a search app, and schedules a Celery task
+    to drain the queue (unless one has already been scheduled).
+
+    Documents queued within PENDING_DELETION_COUNTDOWN_SECS of each other are deleted
+    together using a single bulk request.
+    """
+    from datahub.search.tasks import delete_pending_documents_task
+
+    unique_pks = {str(pk) for pk in pks}
+    entries = (
+        PendingSearchDeletion(search_app=search_app.name, document_id=pk) for pk in unique_pks
+    )
+    PendingSearchDeletion.objects.bulk_create(
+        entries,
+        batch_size=PENDING_DELETION_INSERT_BATCH_SIZE,
+    )
+
+    # cache.add() only adds the key if it isn't present, so only one task is scheduled per
+    # countdown period
+    scheduled_key = f'search-pending-deletion-scheduled-{search_app.name}'
+    if not cache.add(scheduled_key, True, timeout=PENDING_DELETION_COUNTDOWN_SECS):
+        return
+
+    result = delete_pending_documents_task.apply_async(
+        args=(search_app.name,),
+        countdown=PENDING_DELETION_COUNTDOWN_SECS,
+    )
+    logger.info(
+        f'Task {result.id} scheduled to delete pending documents for search app '
+        f'{search_app.name}',
+    )
+
+
+def delete_pending_documents(search_app, batch_size=BULK_CHUNK_SIZE):
+    """
+    Drains the pending deletion queue for a search app, deleting documents in batches of
+    batch_size.
+
+    Documents are deleted from the index referenced by the write alias and from all indices
+    referenced by the read alias (so that documents are also removed from any indices being
+    migrated from).
+
+    Queue entries are locked using SKIP LOCKED, so multiple workers can drain the same queue
+    concurrently. If deleting a batch fails, its entries stay in the queue.
+
+    :returns: a BulkDeletionResult instance with the totals for all batches
+    """
+    es_model = search_app.es_model
+    doc_type = es_model._doc_type.name
+    total_result = BulkDeletionResult()
+
+    while True:
+        with transaction.atomic():
+            entries = list(
+                PendingSearchDeletion.objects.select_for_update(
+                    skip_locked=True,
+                ).filter(
+                    search_app=search_app.name,
+                ).order_by(
+                    'pk',
+                ).values_list(
+                    'pk',
+                    'document_id',
+                )[:batch_size],
+            )
+
+            if not entries:
+                break
+
+            entry_pks, document_ids = zip(*entries)
+            read_indices, write_index = es_model.get_cached_read_and_write_indices()
+            es_docs = [
+                {'_type': doc_type, '_id': document_id} for document_id in set(document_ids)
+            ]
+
+            try:
+                result = delete_documents_from_indices({write_index, *read_indices}, es_docs)
+            except DataHubException:
+                statsd.incr(f'search.deletion.{search_app.name}.failed')
+                raise
+
+            PendingSearchDeletion.objects.filter(pk__in=entry_pks).delete()
+
+        statsd.incr(f'search.deletion.{search_app.name}.deleted', result.num_deleted)
+        statsd.incr(f'search.deletion.{search_app.name}.not_found', result.num_not_found)
+        total_result += result
+
+    if total_result.num_deleted:
+        invalidate_search_app_results(search_app.name)
+
+    return total_result
+
 
 def _create_delete_action(_index, _type, _id):
     return {
@@ -121,7 +276,7 @@ class Collector:
     def _delete_from_es(self):
         for model, es_docs in self.deletions.items():
             search_app = get_search_app_by_model(model)
-            delete_documents(search_app.es_model.get_write_alias(), es_docs)
+            delete_documents_async(search_app, [es_doc['_id'] for es_doc in es_docs])
 
     def delete_from_es(self):
         """Deletes all the deleted django models from ES."""
@@ -153,14 +308,3 @@ def update_es_after_deletions():
         collector.disconnect()
 
     collector.delete_from_es()
-
-
-def delete_document(model, document_id, indices=None, ignore_404_responses=True):
-    """Deletes specified model's document."""
-    if indices is None:
-        indices = [model.get_write_alias()]
-    ignored_response_statuses = (404,) if ignore_404_responses else ()
-    doc = model(_id=document_id)
-
-    for index in indices:
-        doc.delete(index=index, ignore=ignored_response_statuses)
@@ -1,7 +1,10 @@
 from contextlib import contextmanager
 from logging import getLogger
+from time import monotonic
+from uuid import uuid4
 
 from django.conf import settings
+from django.core.cache import cache
 from elasticsearch.helpers import bulk as es_bulk
 from elasticsearch_dsl import analysis, Index
 from elasticsearch_dsl.connections import connections
@@ -9,6 +12,13 @@ from elasticsearch_dsl.connections import connections
 
 logger = getLogger(__name__)
 
+# Key of a version stamp (in the Django cache) that is changed whenever aliases are modified,
+# so that other processes know to discard their cached alias resolutions
+ALIAS_VERSION_CACHE_KEY = 'search-alias-version'
+
+# Process-local cache of alias resolutions, in the form:
+#   {alias_names: (version stamp, expiry time, indices)}
+_alias_resolution_cache = {}
 
 # Normalises values to improve sorting (by keeping e, E, è, ê etc. together)
 lowercase_asciifolding_normalizer = analysis.normalizer(
@@ -34,6 +44,28 @@ trigram_analyzer = analysis.CustomAnalyzer(
     filter=('lowercase',),
 )
 
+# Indexes the prefixes of each word (e.g. 'acm' for 'acme') for autocomplete (as-you-type)
+# queries, so that they can be answered using a normal (and hence filterable) match query
+edge_ngram_filter = analysis.token_filter(
+    'edge_ngram_filter',
+    type='edge_ngram',
+    min_gram=1,
+    max_gram=20,
+)
+autocomplete_analyzer = analysis.CustomAnalyzer(
+    'autocomplete_analyzer',
+    tokenizer='standard',
+    char_filter=special_chars,
+    filter=('lowercase', 'asciifolding', edge_ngram_filter),
+)
+# Search terms must not be split into prefixes, otherwise 'acme' would also match 'ab'
+autocomplete_search_analyzer = analysis.CustomAnalyzer(
+    'autocomplete_search_analyzer',
+    tokenizer='standard',
+    char_filter=special_chars,
+    filter=('lowercase', 'asciifolding'),
+)
+
 space_remover = analysis.token_filter(
     'space_remover',
     type='pattern_replace',
@@ -178,12 +210,50 @@ def create_index(index_name, mapping, alias_names=()):
 
     index.create()
 
+    if alias_names:
+        invalidate_alias_cache()
+
 
 def delete_index(index_name):
     """Deletes an index."""
     logger.info(f'Deleting the {index_name} index...')
     client = get_client()
     client.indices.delete(index_name)
+    invalidate_alias_cache()
+
+
+def get_index_settings(index_name):
+    """Gets the settings of an index (as a dict of setting names and values)."""
+    client = get_client()
+    response = client.indices.get_settings(index=index_name)
+    return response[index_name]['settings']['index']
+
+
+def update_index_settings(index_name, index_settings):
+    """
+    Updates the dynamic settings of an index.
+
+    A setting with a value of None is reset to its default value.
+    """
+    client = get_client()
+    client.indices.put_settings(index=index_name, body={'index': index_settings})
+
+
+def refresh_index(index_name):
+    """Refreshes an index, so that all documents written to it are visible in searches."""
+    client = get_client()
+    client.indices.refresh(index=index_name)
+
+
+def force_merge_index(index_name, max_num_segments, request_timeout):
+    """Merges the segments of an index (e.g. to reduce its size after a bulk load)."""
+    logger.info(f'Force merging the {index_name} index to {max_num_segments} segment(s)...')
+    client = get_client()
+    client.indices.forcemerge(
+        index=index_name,
+        max_num_segments=max_num_segments,
+        request_timeout=request_timeout,
+    )
 
 
 def get_indices_for_aliases(*alias_names):
@@ -199,6 +269,45 @@ def get_indices_for_aliases(*alias_names):
     return [alias_to_index_mapping[alias_name] for alias_name in alias_names]
 
 
+def get_cached_indices_for_aliases(*alias_names):
+    """
+    Gets the indices referenced by one or more aliases, using a short-lived process-local cache.
+
+    Cached values are discarded after settings.ES_ALIAS_CACHE_TIMEOUT seconds, or as soon
+    as the alias version stamp in the Django cache changes (which happens whenever aliases are
+    modified by any process). Caching is disabled if ES_ALIAS_CACHE_TIMEOUT is 0.
+
+    This should only be used for normal document syncing, and not when performing migrations
+    (where the current state of the aliases is always needed).
+    """
+    timeout = settings.ES_ALIAS_CACHE_TIMEOUT
+    if not timeout:
+        return get_indices_for_aliases(*alias_names)
+
+    # The version is read before the aliases, so that a concurrent alias change always
+    # invalidates the cached value
+    version = cache.get(ALIAS_VERSION_CACHE_KEY)
+    cached_entry = _alias_resolution_cache.get(alias_names)
+
+    if cached_entry:
+        cached_version, expires_at, indices = cached_entry
+        if cached_version == version and monotonic() < expires_at:
+            return [set(alias_indices) for alias_indices in indices]
+
+    indices = get_indices_for_aliases(*alias_names)
+    _alias_resolution_cache[alias_names] = (version, monotonic() + timeout, indices)
+    return [set(alias_indices) for alias_indices in indices]
+
+
+def invalidate_alias_cache():
+    """
+    Discards cached alias resolutions in this process, and changes the alias version stamp so
+    that other processes also discard theirs.
+    """
+    _alias_resolution_cache.clear()
+    cache.set(ALIAS_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+
+
 def get_aliases_for_index(index_name):
     """Gets the aliases referencing an index."""
     client = get_client()
@@ -217,6 +326,7 @@ def delete_alias(alias_name):
     logger.info(f'Deleting the {alias_name} alias...')
     client = get_client()
     client.indices.delete_alias('_all', alias_name)
+    invalidate_alias_cache()
 
 
 class _AliasUpdater:
@@ -251,6 +361,7 @@ class _AliasUpdater:
             'actions': self.actions,
         })
         self.actions = []
+        invalidate_alias_cache()
 
 
 @contextmanager
@@ -285,6 +396,7 @@ def associate_index_with_alias(alias_name, index_name):
     """
     client = get_client()
     client.indices.put_alias(index_name, alias_name)
+    invalidate_alias_cache()
 
 
 def bulk(
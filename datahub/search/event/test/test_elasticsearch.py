@@ -17,6 +17,10 @@ def test_mapping(es):
                 '_document_type': {
                     'type': 'keyword',
                 },
+                '_version_hash': {
+                    'index': False,
+                    'type': 'keyword',
+                },
                 'address_1': {'type': 'text'},
                 'address_2': {'type': 'text'},
                 'address_country': {
@@ -14,6 +14,7 @@ def test_event_dbmodel_to_dict(es):
 
     keys = {
         '_document_type',
+        '_version_hash',
         'id',
         'event_type',
         'location_type',
@@ -1,13 +1,38 @@
+import json
+from hashlib import sha256
 from logging import getLogger
+from operator import attrgetter
+from uuid import uuid4
 
 from django.conf import settings
+from django.core.cache import cache
 
+from datahub.core import statsd
 from datahub.core.utils import log_to_sentry
-from datahub.search.query_builder import build_autocomplete_query
+from datahub.search.instrumentation import (
+    record_query,
+    SearchQueryLabels,
+    should_profile_query,
+)
+from datahub.search.query_builder import (
+    build_autocomplete_query,
+    build_prefix_autocomplete_query,
+)
 
 
 logger = getLogger(__name__)
 
+SEARCH_RESULT_CACHE_KEY_PREFIX = 'search-result'
+SEARCH_RESULT_GENERATION_CACHE_KEY_PREFIX = 'search-result-generation'
+SEARCH_RESULT_REINVALIDATION_SCHEDULED_CACHE_KEY_PREFIX = 'search-result-reinvalidation-scheduled'
+# How long after documents are indexed or deleted that cached search results are discarded
+# for a second time. Changes only become visible in searches after the next index refresh
+# (every second by default), so results cached before then may not include them.
+SEARCH_RESULT_REINVALIDATION_DELAY_SECS = 2
+# Invalidations of the same search app within this period share a single delayed
+# re-invalidation (which runs SEARCH_RESULT_REINVALIDATION_DELAY_SECS after the period ends)
+SEARCH_RESULT_REINVALIDATION_WINDOW_SECS = 2
+
 
 def execute_autocomplete_query(es_model, keyword_search, limit, fields_to_include, context):
     """Executes the query for autocomplete search returning all suggested documents."""
@@ -23,13 +48,139 @@ def execute_autocomplete_query(es_model, keyword_search, limit, fields_to_includ
     return results.suggest.autocomplete[0].options
 
 
-def execute_search_query(query):
+def execute_prefix_autocomplete_query(
+    es_model,
+    keyword_search,
+    limit,
+    fields_to_include,
+    permission_filters,
+):
+    """Executes a prefix-based autocomplete query returning the matching documents."""
+    autocomplete_search = build_prefix_autocomplete_query(
+        es_model,
+        keyword_search,
+        limit,
+        fields_to_include,
+        permission_filters,
+    )
+
+    labels = SearchQueryLabels(view='autocomplete', search_app=es_model.get_app_name())
+    results = execute_search_query(autocomplete_search, labels=labels)
+    return [hit.to_dict() for hit in results.hits]
+
+
+def execute_search_query(query, search_apps=None, labels=None):
     """
     Executes an Elasticsearch query using the globally configured request timeout.
 
     (A warning is also logged if the query takes longer than a set threshold.)
+
+    If search_apps is specified and settings.SEARCH_RESULT_CACHE_TIMEOUT is non-zero, the
+    response is cached for that many seconds. search_apps should be all the search apps that
+    the query covers; their cached results are discarded whenever their documents change (see
+    invalidate_search_app_results()).
+
+    If labels (a datahub.search.instrumentation.SearchQueryLabels instance) is specified,
+    metrics are recorded for the query and it may be added to the slow query log (see
+    datahub.search.instrumentation). Queries that are selected to be profiled are always
+    executed (and their responses are not cached).
     """
-    response = query.params(request_timeout=settings.ES_SEARCH_REQUEST_TIMEOUT).execute()
+    profile = bool(labels) and should_profile_query()
+
+    if profile or not (search_apps and settings.SEARCH_RESULT_CACHE_TIMEOUT):
+        return _execute_search_query(query, labels=labels, profile=profile)
+
+    cache_key = _get_search_result_cache_key(query, search_apps)
+    raw_response = cache.get(cache_key)
+
+    if raw_response is not None:
+        statsd.incr('search.result_cache.hit')
+        return query._response_class(query, raw_response)
+
+    statsd.incr('search.result_cache.miss')
+    response = _execute_search_query(query, labels=labels)
+    cache.set(cache_key, response.to_dict(), timeout=settings.SEARCH_RESULT_CACHE_TIMEOUT)
+    return response
+
+
+def execute_multi_search_query(multi_search, labels=None):
+    """
+    Executes an Elasticsearch multi-search using the globally configured request timeout.
+
+    (A warning is also logged if any of the searches takes longer than a set threshold.)
+
+    If labels (a sequence of datahub.search.instrumentation.SearchQueryLabels instances, one
+    for each search) is specified, metrics are recorded for each search and slow searches may
+    be added to the slow query log (see datahub.search.instrumentation).
+    """
+    responses = multi_search.params(request_timeout=settings.ES_SEARCH_REQUEST_TIMEOUT).execute()
+    took = max((getattr(response, 'took', 0) for response in responses), default=0)
+
+    if took >= settings.ES_SEARCH_REQUEST_WARNING_THRESHOLD * 1000:
+        logger.warning(f'Elasticsearch multi-search took a long time ({took/1000:.2f} seconds)')
+
+        log_data = {
+            'query': multi_search.to_dict(),
+            'took': took,
+        }
+        log_to_sentry('Elasticsearch multi-search took a long time', extra=log_data)
+
+    if labels:
+        for search, response, search_labels in zip(multi_search, responses, labels):
+            record_query(search.to_dict(), response, search_labels)
+
+    return responses
+
+
+def invalidate_search_app_results(search_app_name):
+    """
+    Discards cached search results for a search app.
+
+    This is called once per sync or deletion operation (rather than once per bulk request).
+
+    As changes only become visible in searches after the next index refresh, results cached
+    in the meantime would not include them. The results are hence discarded again later by a
+    Celery task. Only one such task is scheduled per search app per
+    SEARCH_RESULT_REINVALIDATION_WINDOW_SECS, and it runs
+    SEARCH_RESULT_REINVALIDATION_DELAY_SECS after the end of that period (so that it also
+    covers changes made later in the period).
+    """
+    from datahub.search.tasks import change_search_app_result_generation_task
+
+    if not settings.SEARCH_RESULT_CACHE_TIMEOUT:
+        return
+
+    change_search_app_result_generation(search_app_name)
+
+    # cache.add() only adds the key if it isn't present, so only one task is scheduled per
+    # window
+    scheduled_key = f'{SEARCH_RESULT_REINVALIDATION_SCHEDULED_CACHE_KEY_PREFIX}-{search_app_name}'
+    if not cache.add(scheduled_key, True, timeout=SEARCH_RESULT_REINVALIDATION_WINDOW_SECS):
+        return
+
+    change_search_app_result_generation_task.apply_async(
+        args=(search_app_name,),
+        countdown=(
+            SEARCH_RESULT_REINVALIDATION_WINDOW_SECS + SEARCH_RESULT_REINVALIDATION_DELAY_SECS
+        ),
+    )
+
+
+def change_search_app_result_generation(search_app_name):
+    """
+    Changes the generation stamp of a search app, so that its cached search results are no
+    longer used.
+    """
+    cache_key = f'{SEARCH_RESULT_GENERATION_CACHE_KEY_PREFIX}-{search_app_name}'
+    cache.set(cache_key, uuid4().hex, timeout=None)
+
+
+def _execute_search_query(query, labels=None, profile=False):
+    query_to_execute = query.params(request_timeout=settings.ES_SEARCH_REQUEST_TIMEOUT)
+    if profile:
+        query_to_execute = query_to_execute.extra(profile=True)
+
+    response = query_to_execute.execute()
 
     if response.took >= settings.ES_SEARCH_REQUEST_WARNING_THRESHOLD * 1000:
         logger.warning(f'Elasticsearch query took a long time ({response.took/1000:.2f} seconds)')
@@ -41,4 +192,31 @@ def execute_search_query(query):
         }
         log_to_sentry('Elasticsearch query took a long time', extra=log_data)
 
+    if labels:
+        record_query(query.to_dict(), response, labels)
+
     return response
+
+
+def _get_search_result_cache_key(query, search_apps):
+    """
+    Gets the cache key for a query.
+
+    Permission filters are part of the query body, so users only share cached results with
+    users that have the same permission filters.
+    """
+    search_apps = sorted(search_apps, key=attrgetter('name'))
+    generation_keys = [
+        f'{SEARCH_RESULT_GENERATION_CACHE_KEY_PREFIX}-{search_app.name}'
+        for search_app in search_apps
+    ]
+    generations = cache.get_many(generation_keys)
+
+    key_data = {
+        'aliases': [search_app.es_model.get_read_alias() for search_app in search_apps],
+        'query': query.to_dict(),
+        'generations': [generations.get(key) for key in generation_keys],
+    }
+    serialised_key_data = json.dumps(key_data, sort_keys=True, default=str)
+    digest = sha256(serialised_key_data.encode('utf-8')).hexdigest()
+    return f'{SEARCH_RESULT_CACHE_KEY_PREFIX}-{digest}'
@@ -10,6 +10,7 @@ class ExportCountryHistoryApp(SearchApp):
 
     name = 'export-country-history'
     es_model = ExportCountryHistory
+    incremental_sync_fields = ('history_date',)
     exclude_from_global_search = True
     queryset = DBCompanyExportCountryHistory.objects.select_related(
         'history_user',
@@ -34,4 +34,4 @@ class SearchExportCountryHistorySerializer(EntitySearchQuerySerializer):
                 self.error_messages['no_empty_field'],
             )
 
-        return data
+        return super().validate(data)
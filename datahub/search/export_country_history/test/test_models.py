@@ -3,6 +3,7 @@ import pytest
 from datahub.company.test.factories import CompanyExportCountryHistoryFactory
 from datahub.search.export_country_history import ExportCountryHistoryApp
 from datahub.search.export_country_history.models import ExportCountryHistory
+from datahub.search.utils import get_document_hash
 
 pytestmark = pytest.mark.django_db
 
@@ -11,7 +12,9 @@ def test_export_country_history_to_dict(es):
     """Test for export country history search model"""
     export_country_history = CompanyExportCountryHistoryFactory()
     result = ExportCountryHistory.db_object_to_dict(export_country_history)
+    version_hash = result.pop('_version_hash')
 
+    assert version_hash == get_document_hash(result)
     assert result == {
         '_document_type': ExportCountryHistoryApp.name,
         'id': export_country_history.pk,
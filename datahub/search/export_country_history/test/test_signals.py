@@ -3,6 +3,7 @@ import pytest
 from datahub.company.models import CompanyExportCountryHistory
 from datahub.company.test.factories import CompanyExportCountryHistoryFactory
 from datahub.search.export_country_history.apps import ExportCountryHistoryApp
+from datahub.search.utils import get_document_hash
 
 pytestmark = pytest.mark.django_db
 
@@ -35,7 +36,11 @@ def test_updated_interaction_synced(es_with_signals):
         id=export_country_history.pk,
     )
 
-    assert result['_source'] == {
+    source = result['_source']
+    version_hash = source.pop('_version_hash')
+
+    assert version_hash == get_document_hash(source)
+    assert source == {
         '_document_type': ExportCountryHistoryApp.name,
         'history_user': {
             'id': str(export_country_history.history_user.id),
@@ -3,6 +3,8 @@ from functools import partial
 from elasticsearch_dsl import Keyword, Object, Text
 
 from datahub.search.elasticsearch import (
+    autocomplete_analyzer,
+    autocomplete_search_analyzer,
     lowercase_asciifolding_normalizer,
     postcode_analyzer,
     postcode_search_analyzer,
@@ -21,6 +23,12 @@ TextWithTrigram = partial(
         'trigram': TrigramText(),
     },
 )
+# Text indexed with word prefixes, for use with prefix-based autocomplete queries
+AutocompleteText = partial(
+    Text,
+    analyzer=autocomplete_analyzer,
+    search_analyzer=autocomplete_search_analyzer,
+)
 # Keyword with normalisation that recognises UK postcodes to improve searching
 PostcodeKeyword = partial(
     Text,
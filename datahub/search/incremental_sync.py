@@ -0,0 +1,107 @@
+"""
+Incremental syncing of search apps to Elasticsearch.
+
+Instead of resyncing every object, an incremental sync only resyncs objects where one of
+the search app's incremental_sync_fields has changed since the previous sync (the high-water
+mark), and then deletes documents for objects that no longer exist.
+
+A full sync is performed if there is no watermark for the search app yet, or if the write index
+has changed since the last sync (e.g. because of a mapping migration).
+"""
+from datetime import timedelta
+from functools import reduce
+from logging import getLogger
+from operator import or_
+
+from django.db.models import Q
+from django.utils.timezone import now
+
+from datahub.search.bulk_sync import sync_app
+from datahub.search.consistency import delete_documents_by_id, iter_orphaned_document_id_batches
+from datahub.search.execute_query import invalidate_search_app_results
+from datahub.search.models import SearchAppSyncWatermark
+
+logger = getLogger(__name__)
+
+# Objects modified this long before the watermark are also resynced. This allows for
+# transactions that were committed after the previous sync started, but saved objects (and
+# hence set modified_on) before it started.
+WATERMARK_OVERLAP = timedelta(hours=1)
+ORPHAN_CHECK_BATCH_SIZE = 2000
+
+
+def sync_app_incrementally(search_app):
+    """
+    Syncs objects for a search app that have changed since the last incremental sync, and
+    deletes documents for objects that no longer exist.
+
+    :returns: the number of objects synced
+    """
+    es_model = search_app.es_model
+    sync_started_on = now()
+    _, write_index = es_model.get_read_and_write_indices()
+    watermark = SearchAppSyncWatermark.objects.filter(search_app=search_app.name).first()
+
+    if not search_app.incremental_sync_fields:
+        logger.info(f'Incremental sync not supported for {search_app.name}, performing full sync')
+        object_filter = None
+    elif not watermark or watermark.index_name != write_index:
+        logger.info(f'No valid watermark found for {search_app.name}, performing full sync')
+        object_filter = None
+    else:
+        modified_since = watermark.synced_up_to - WATERMARK_OVERLAP
+        logger.info(f'Syncing {search_app.name} objects modified since {modified_since}')
+        object_filter = _get_modified_since_filter(search_app, modified_since)
+
+    num_objects_synced = sync_app(search_app, object_filter=object_filter)
+    num_documents_deleted = delete_orphaned_documents(search_app)
+
+    logger.info(
+        f'Incremental sync of {search_app.name} complete: {num_objects_synced} objects synced, '
+        f'{num_documents_deleted} orphaned documents deleted',
+    )
+
+    SearchAppSyncWatermark.objects.update_or_create(
+        search_app=search_app.name,
+        defaults={
+            'index_name': write_index,
+            'synced_up_to': sync_started_on,
+        },
+    )
+
+    return num_objects_synced
+
+
+def delete_orphaned_documents(search_app, batch_size=ORPHAN_CHECK_BATCH_SIZE):
+    """
+    Deletes documents for objects that no longer exist in the database.
+
+    Document IDs are streamed from Elasticsearch using the scroll API and checked against the
+    database in batches of batch_size, so memory usage is bounded regardless of the index size.
+
+    :returns: the number of documents deleted
+    """
+    es_model = search_app.es_model
+    read_indices, _ = es_model.get_read_and_write_indices()
+    num_documents_deleted = 0
+
+    for orphaned_ids in iter_orphaned_document_id_batches(search_app, batch_size):
+        delete_documents_by_id(es_model, read_indices, orphaned_ids)
+        num_documents_deleted += len(orphaned_ids)
+
+    if num_documents_deleted:
+        invalidate_search_app_results(search_app.name)
+
+    return num_documents_deleted
+
+
+def _get_modified_since_filter(search_app, modified_since):
+    conditions = (
+        Q(**{f'{field}__gte': modified_since}) for field in search_app.incremental_sync_fields
+    )
+    # A sub-query is used so that conditions on to-many relationships don't produce duplicate
+    # rows
+    changed_pks = search_app.queryset.model._base_manager.filter(
+        reduce(or_, conditions),
+    ).values('pk')
+    return Q(pk__in=changed_pks)
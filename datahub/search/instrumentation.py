@@ -0,0 +1,173 @@
+"""
+Instrumentation for Elasticsearch search queries.
+
+This records:
+
+- statsd timers for the time Elasticsearch takes to execute each query, by view, search app
+  and sort field
+- the slowest normalised query shapes (queries with literal values removed), in the
+  SlowSearchQuery model (which is visible in the admin site)
+
+Slow queries are added to the slow query log by a Celery task, so that no database writes are
+made while handling search requests. Entries other than the slowest ones are removed
+periodically (by the prune_slow_search_queries task).
+
+A percentage of queries (settings.SEARCH_QUERY_PROFILE_SAMPLE_RATE) are also executed with the
+Elasticsearch profile API enabled. The profile is stored with the slow query entry, if the
+query is slow enough to be recorded. (Profiled responses are never cached.)
+"""
+import json
+import random
+from hashlib import sha256
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db.models import F, Subquery
+from django.db.models.functions import Greatest
+from django.utils.timezone import now
+
+from datahub.core import statsd
+from datahub.search.models import SlowSearchQuery
+
+# Keys whose values describe the structure of a query (e.g. field names), rather than the
+# values being searched for. Their values are kept when normalising queries.
+STRUCTURAL_KEYS = frozenset({
+    'excludes',
+    'field',
+    'fields',
+    'includes',
+    'missing',
+    'operator',
+    'order',
+    'sort',
+    'type',
+})
+LITERAL_PLACEHOLDER = '?'
+
+
+class SearchQueryLabels(NamedTuple):
+    """Describes where a search query came from (for metrics and the slow query log)."""
+
+    view: str
+    search_app: str
+    sort_field: str = '_score'
+
+
+def should_profile_query():
+    """Returns whether the next query should be executed with profiling enabled."""
+    return random.uniform(0, 100) < settings.SEARCH_QUERY_PROFILE_SAMPLE_RATE
+
+
+def record_query(query_dict, response, labels):
+    """
+    Records metrics for an executed query and, if it's one of the slowest, its query shape.
+
+    :param query_dict:  the executed query as a dict
+    :param response:    the elasticsearch_dsl response for the query
+    :param labels:      a SearchQueryLabels instance
+    """
+    took = response.took
+    sort_field = _get_metric_name_part(labels.sort_field)
+
+    statsd.timing(f'search.query.view.{labels.view}', took)
+    statsd.timing(f'search.query.app.{labels.search_app}', took)
+    statsd.timing(f'search.query.sort.{labels.search_app}.{sort_field}', took)
+
+    if settings.SEARCH_SLOW_QUERY_LOG_SIZE and took >= settings.SEARCH_SLOW_QUERY_LOG_THRESHOLD:
+        from datahub.search.tasks import record_slow_search_query_task
+
+        profile = response.to_dict().get('profile')
+        # Only the shape is passed to the task, as it's usually much smaller than the query
+        record_slow_search_query_task.apply_async(
+            args=(get_query_shape(query_dict), took, labels, profile),
+        )
+
+
+def record_slow_query(query_dict, took, labels, profile=None):
+    """
+    Records a slow query in the slow query log.
+
+    Queries with the same shape, view and search app share an entry.
+
+    (This is normally called by the record_slow_search_query_task Celery task.)
+    """
+    shape = get_query_shape(query_dict)
+    shape_hash = _get_shape_hash(shape, labels)
+    current_time = now()
+
+    entry, created = SlowSearchQuery.objects.get_or_create(
+        shape_hash=shape_hash,
+        defaults={
+            'shape': shape,
+            'view': labels.view,
+            'search_app': labels.search_app,
+            'sort_field': labels.sort_field,
+            'max_took': took,
+            'last_took': took,
+            'profile': profile,
+            'last_seen_on': current_time,
+        },
+    )
+
+    if not created:
+        updates = {
+            'max_took': Greatest('max_took', took),
+            'last_took': took,
+            'num_occurrences': F('num_occurrences') + 1,
+            'last_seen_on': current_time,
+        }
+        if profile:
+            updates['profile'] = profile
+
+        SlowSearchQuery.objects.filter(pk=entry.pk).update(**updates)
+
+
+def prune_slow_query_log():
+    """
+    Deletes all but the settings.SEARCH_SLOW_QUERY_LOG_SIZE slowest entries from the slow
+    query log.
+
+    :returns: the number of entries deleted
+    """
+    entries_to_keep = SlowSearchQuery.objects.order_by(
+        '-max_took',
+        '-last_seen_on',
+    ).values('pk')[:settings.SEARCH_SLOW_QUERY_LOG_SIZE]
+    num_deleted, _ = SlowSearchQuery.objects.exclude(pk__in=Subquery(entries_to_keep)).delete()
+    return num_deleted
+
+
+def get_query_shape(value, key=None):
+    """
+    Normalises a query (as a dict) by replacing literal values (such as search terms and IDs)
+    with a placeholder.
+
+    Values of keys in STRUCTURAL_KEYS (such as field names and sort orders) are kept.
+    Duplicate items in lists are removed, so that (for example) filters with different numbers
+    of values have the same shape.
+    """
+    if isinstance(value, dict):
+        return {item_key: get_query_shape(item, item_key) for item_key, item in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        shape = []
+        for item in value:
+            item_shape = get_query_shape(item, key)
+            if item_shape not in shape:
+                shape.append(item_shape)
+        return shape
+
+    if key in STRUCTURAL_KEYS:
+        return value
+
+    return LITERAL_PLACEHOLDER
+
+
+def _get_shape_hash(shape, labels):
+    data = json.dumps([shape, labels.view, labels.search_app], sort_keys=True)
+    return sha256(data.encode('utf-8')).hexdigest()
+
+
+def _get_metric_name_part(value):
+    # Dots are used as separators in statsd metric names
+    return value.replace('.', '_')
@@ -15,6 +15,7 @@ class InteractionSearchApp(SearchApp):
 
     name = 'interaction'
     es_model = Interaction
+    incremental_sync_fields = ('modified_on', 'company__modified_on')
     view_permissions = (f'interaction.{InteractionPermission.view_all}',)
     export_permission = f'interaction.{InteractionPermission.export}'
     queryset = DBInteraction.objects.select_related(
@@ -125,6 +125,11 @@ class Interaction(BaseESModel):
         'is_event': attrgetter('is_event'),
     }
 
+    DENORMALISED_FIELDS = {
+        'company': ('company', 'company_sector', 'company_one_list_group_tier'),
+        'investment_project': ('investment_project', 'investment_project_sector'),
+    }
+
     SEARCH_FIELDS = (
         'id',
         'company.name',
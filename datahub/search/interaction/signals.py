@@ -7,11 +7,14 @@ from datahub.interaction.models import (
     InteractionDITParticipant as DBInteractionDITParticipant,
 )
 from datahub.investment.project.models import InvestmentProject as DBInvestmentProject
-from datahub.search.deletion import delete_document
+from datahub.search.deletion import delete_document_async
 from datahub.search.interaction import InteractionSearchApp
-from datahub.search.interaction.models import Interaction as ESInteraction
 from datahub.search.signals import SignalReceiver
-from datahub.search.sync_object import sync_object_async, sync_related_objects_async
+from datahub.search.sync_object import (
+    sync_object_async,
+    sync_related_objects_async,
+    update_denormalised_fields_async,
+)
 
 
 def sync_interaction_to_es(instance):
@@ -31,7 +34,7 @@ def sync_participant_to_es(dit_participant):
 def remove_interaction_from_es(instance):
     """Remove interaction from es."""
     transaction.on_commit(
-        lambda pk=instance.pk: delete_document(ESInteraction, pk),
+        lambda pk=instance.pk: delete_document_async(InteractionSearchApp, pk),
     )
 
 
@@ -42,11 +45,33 @@ def sync_related_interactions_to_es(instance):
     )
 
 
+def update_company_fields_of_interactions_in_es(instance):
+    """Update the company fields of a company's interactions in Elasticsearch."""
+    transaction.on_commit(
+        lambda: update_denormalised_fields_async(InteractionSearchApp, 'company', instance),
+    )
+
+
+def update_investment_project_fields_of_interactions_in_es(instance):
+    """Update the investment project fields of a project's interactions in Elasticsearch."""
+    transaction.on_commit(
+        lambda: update_denormalised_fields_async(
+            InteractionSearchApp,
+            'investment_project',
+            instance,
+        ),
+    )
+
+
 receivers = (
     SignalReceiver(post_save, DBInteraction, sync_interaction_to_es),
     SignalReceiver(post_save, DBInteractionDITParticipant, sync_participant_to_es),
-    SignalReceiver(post_save, DBCompany, sync_related_interactions_to_es),
+    SignalReceiver(post_save, DBCompany, update_company_fields_of_interactions_in_es),
     SignalReceiver(post_save, DBContact, sync_related_interactions_to_es),
-    SignalReceiver(post_save, DBInvestmentProject, sync_related_interactions_to_es),
+    SignalReceiver(
+        post_save,
+        DBInvestmentProject,
+        update_investment_project_fields_of_interactions_in_es,
+    ),
     SignalReceiver(post_delete, DBInteraction, remove_interaction_from_es),
 )
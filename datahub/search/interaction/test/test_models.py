@@ -11,6 +11,7 @@ from datahub.interaction.test.factories import (
 )
 from datahub.search.interaction import InteractionSearchApp
 from datahub.search.interaction.models import Interaction
+from datahub.search.utils import get_document_hash
 
 pytestmark = pytest.mark.django_db
 
@@ -29,12 +30,14 @@ def test_interaction_to_dict(es, factory_cls):
     interaction = factory_cls()
 
     result = Interaction.db_object_to_dict(interaction)
+    version_hash = result.pop('_version_hash')
     result['contacts'].sort(key=itemgetter('id'))
     result['dit_participants'].sort(key=lambda dit_participant: dit_participant['adviser']['id'])
     result['export_countries'].sort(key=lambda export_country: export_country['country']['id'])
     result['policy_areas'].sort(key=itemgetter('id'))
     result['policy_issue_types'].sort(key=itemgetter('id'))
 
+    assert version_hash == get_document_hash(result)
     assert result == {
         '_document_type': InteractionSearchApp.name,
         'id': interaction.pk,
@@ -140,9 +143,11 @@ def test_service_delivery_to_dict(es):
     interaction = ServiceDeliveryFactory()
 
     result = Interaction.db_object_to_dict(interaction)
+    version_hash = result.pop('_version_hash')
     result['contacts'].sort(key=itemgetter('id'))
     result['dit_participants'].sort(key=lambda dit_participant: dit_participant['adviser']['id'])
 
+    assert version_hash == get_document_hash(result)
     assert result == {
         '_document_type': InteractionSearchApp.name,
         'id': interaction.pk,
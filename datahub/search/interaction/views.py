@@ -79,6 +79,8 @@ class SearchInteractionAPIViewMixin:
 class SearchInteractionAPIView(SearchInteractionAPIViewMixin, SearchAPIView):
     """Filtered interaction search view."""
 
+    cache_results = True
+
 
 @register_v3_view(sub_path='export')
 class SearchInteractionExportAPIView(SearchInteractionAPIViewMixin, SearchExportAPIView):
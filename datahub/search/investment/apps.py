@@ -18,6 +18,7 @@ class InvestmentSearchApp(SearchApp):
 
     name = 'investment_project'
     es_model = InvestmentProject
+    incremental_sync_fields = ('modified_on', 'investor_company__modified_on')
     # Investment project documents are very large, so the bulk_batch_size is set to a lower value
     # to keep bulk requests below 10 MB.
     # (In some environments, the maximum ES request size is 10 MB. This is dependent on the AWS
@@ -32,6 +33,7 @@ class InvestmentSearchApp(SearchApp):
         'archived_by',
         'average_salary',
         'client_relationship_manager',
+        'created_by',
         'fdi_type',
         'intermediate_company',
         'investment_type',
@@ -68,6 +70,10 @@ class InvestmentSearchApp(SearchApp):
 
         If a user only has permission to access projects associated to their team, this returns
         the filters that should be applied to only return those projects.
+
+        This is a single filter on permitted_team_ids, unless some documents being searched
+        may not have that field yet (in which case the filters for individual adviser fields
+        are also returned).
         """
         checker = InvestmentProjectAssociationChecker()
 
@@ -78,9 +84,26 @@ class InvestmentSearchApp(SearchApp):
             return EXCLUDE_ALL
 
         dit_team_id = request.user.dit_team_id
+        permitted_team_filter = ('permitted_team_ids', dit_team_id)
+
+        if cls._are_permitted_team_ids_populated():
+            return [permitted_team_filter]
+
         to_one_filters, to_many_filters = get_association_filters(dit_team_id)
 
         return [
+            permitted_team_filter,
             *[(f'{field}.dit_team.id', value) for field, value in to_one_filters],
             *[(f'{field.es_field_name}.dit_team.id', value) for field, value in to_many_filters],
         ]
+
+    @classmethod
+    def _are_permitted_team_ids_populated(cls):
+        """
+        Returns whether all searched documents are guaranteed to have permitted_team_ids.
+
+        This is the case once the read alias only references an index with the current
+        mapping (i.e. after the mapping migration that added the field has completed).
+        """
+        read_indices, _ = cls.es_model.get_cached_read_and_write_indices()
+        return read_indices == {cls.es_model.get_target_index_name()}
@@ -17,6 +17,20 @@ def _related_investment_project_field():
     })
 
 
+def _get_permitted_team_ids(project):
+    """
+    Gets the IDs of the teams of all advisers associated with a project.
+
+    Users with only the view_associated_investmentproject permission can see projects where
+    their team is in this list.
+    """
+    return sorted({
+        str(adviser.dit_team_id)
+        for adviser in project.get_associated_advisers()
+        if adviser.dit_team_id
+    })
+
+
 class InvestmentProject(BaseESModel):
     """Elasticsearch representation of InvestmentProject."""
 
@@ -81,6 +95,7 @@ class InvestmentProject(BaseESModel):
         fields={
             'keyword': fields.NormalizedKeyword(),
             'trigram': fields.TrigramText(),
+            'autocomplete': fields.AutocompleteText(),
         },
     )
     new_tech_to_uk = Boolean()
@@ -126,6 +141,7 @@ class InvestmentProject(BaseESModel):
     uk_region_locations = fields.id_name_field()
     will_new_jobs_last_two_years = Boolean()
     level_of_involvement_simplified = Keyword()
+    permitted_team_ids = Keyword()
 
     gross_value_added = Double()
 
@@ -173,6 +189,10 @@ class InvestmentProject(BaseESModel):
         ],
     }
 
+    COMPUTED_MAPPINGS = {
+        'permitted_team_ids': _get_permitted_team_ids,
+    }
+
     SEARCH_FIELDS = (
         'id',
         'name',
@@ -184,6 +204,10 @@ class InvestmentProject(BaseESModel):
         'project_code.trigram',
     )
 
+    AUTOCOMPLETE_FIELDS = (
+        'name.autocomplete',
+    )
+
     class Meta:
         """Default document meta data."""
 
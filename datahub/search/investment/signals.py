@@ -9,7 +9,7 @@ from datahub.investment.project.models import (
 )
 from datahub.search.investment import InvestmentSearchApp
 from datahub.search.signals import SignalReceiver
-from datahub.search.sync_object import sync_object_async
+from datahub.search.sync_object import sync_object_async, sync_objects_async
 
 
 def investment_project_sync_es(instance):
@@ -33,19 +33,15 @@ def investment_project_sync_es_adviser_change(instance):
     This is primarily to update the teams stored against the project in ES.
     """
     def sync_es_wrapper():
-        queryset = DBInvestmentProject.objects.filter(
+        project_pks = DBInvestmentProject.objects.filter(
             Q(created_by_id=instance.pk)
             | Q(client_relationship_manager_id=instance.pk)
             | Q(project_manager_id=instance.pk)
             | Q(project_assurance_adviser_id=instance.pk)
             | Q(team_members__adviser_id=instance.pk),
-        )
+        ).values_list('pk', flat=True)
 
-        for project in queryset:
-            sync_object_async(
-                InvestmentSearchApp,
-                project.pk,
-            )
+        sync_objects_async(InvestmentSearchApp, project_pks)
 
     transaction.on_commit(sync_es_wrapper)
 
@@ -0,0 +1,76 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from datahub.core.test_utils import create_test_user
+from datahub.investment.project.models import InvestmentProjectPermission
+from datahub.metadata.test.factories import TeamFactory
+from datahub.search.investment import InvestmentSearchApp
+
+pytestmark = pytest.mark.django_db
+
+
+class TestGetPermissionFilters:
+    """Tests for InvestmentSearchApp.get_permission_filters()."""
+
+    @pytest.fixture
+    def request_with_restricted_user(self):
+        """A mock request for a user that can only view associated projects."""
+        user = create_test_user(
+            permission_codenames=[InvestmentProjectPermission.view_associated],
+            dit_team=TeamFactory(),
+        )
+        return Mock(user=user, method='GET')
+
+    def test_uses_permitted_team_ids_when_populated(self, request_with_restricted_user):
+        """
+        Test that a single permitted_team_ids filter is returned when the read alias only
+        references an index with the current mapping.
+        """
+        es_model = InvestmentSearchApp.es_model
+        target_index = es_model.get_target_index_name()
+
+        with patch.object(
+            es_model,
+            'get_cached_read_and_write_indices',
+            return_value=({target_index}, target_index),
+        ):
+            filters = InvestmentSearchApp.get_permission_filters(request_with_restricted_user)
+
+        dit_team_id = request_with_restricted_user.user.dit_team_id
+        assert filters == [('permitted_team_ids', dit_team_id)]
+
+    def test_includes_adviser_filters_during_migration(self, request_with_restricted_user):
+        """
+        Test that filters on individual adviser fields are also returned when the read alias
+        references an index with an old mapping.
+        """
+        es_model = InvestmentSearchApp.es_model
+        target_index = es_model.get_target_index_name()
+
+        with patch.object(
+            es_model,
+            'get_cached_read_and_write_indices',
+            return_value=({'old-index', target_index}, target_index),
+        ):
+            filters = InvestmentSearchApp.get_permission_filters(request_with_restricted_user)
+
+        dit_team_id = request_with_restricted_user.user.dit_team_id
+        assert filters == [
+            ('permitted_team_ids', dit_team_id),
+            ('created_by.dit_team.id', dit_team_id),
+            ('client_relationship_manager.dit_team.id', dit_team_id),
+            ('project_manager.dit_team.id', dit_team_id),
+            ('project_assurance_adviser.dit_team.id', dit_team_id),
+            ('team_members.dit_team.id', dit_team_id),
+        ]
+
+    def test_returns_none_for_unrestricted_user(self):
+        """Test that no filters are returned for a user that can view all projects."""
+        user = create_test_user(
+            permission_codenames=[InvestmentProjectPermission.view_all],
+            dit_team=TeamFactory(),
+        )
+        request = Mock(user=user, method='GET')
+
+        assert InvestmentSearchApp.get_permission_filters(request) is None
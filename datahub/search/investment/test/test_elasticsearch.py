@@ -22,6 +22,10 @@ def test_mapping(es):
                 '_document_type': {
                     'type': 'keyword',
                 },
+                '_version_hash': {
+                    'index': False,
+                    'type': 'keyword',
+                },
                 'actual_land_date': {'type': 'date'},
                 'actual_uk_regions': {
                     'properties': {
@@ -383,6 +387,11 @@ def test_mapping(es):
                 'name': {
                     'type': 'text',
                     'fields': {
+                        'autocomplete': {
+                            'analyzer': 'autocomplete_analyzer',
+                            'search_analyzer': 'autocomplete_search_analyzer',
+                            'type': 'text',
+                        },
                         'keyword': {
                             'normalizer': 'lowercase_asciifolding_normalizer',
                             'type': 'keyword',
@@ -397,6 +406,7 @@ def test_mapping(es):
                 'non_fdi_r_and_d_budget': {'type': 'boolean'},
                 'number_new_jobs': {'type': 'integer'},
                 'number_safeguarded_jobs': {'type': 'long'},
+                'permitted_team_ids': {'type': 'keyword'},
                 'other_business_activity': {
                     'type': 'text',
                     'index': False,
@@ -12,6 +12,7 @@ from datahub.investment.project.test.factories import (
     CompanyFactory,
     GVAMultiplierFactory,
     InvestmentProjectFactory,
+    InvestmentProjectTeamMemberFactory,
 )
 from datahub.search.investment.models import InvestmentProject as ESInvestmentProject
 
@@ -59,6 +60,7 @@ def test_investment_project_to_dict(es):
 
     keys = {
         '_document_type',
+        '_version_hash',
         'id',
         'allow_blank_estimated_land_date',
         'allow_blank_possible_uk_regions',
@@ -145,11 +147,33 @@ def test_investment_project_to_dict(es):
         'country_lost_to',
         'country_investment_originates_from',
         'level_of_involvement_simplified',
+        'permitted_team_ids',
     }
 
     assert set(result.keys()) == keys
 
 
+def test_investment_project_permitted_team_ids(es):
+    """Tests that permitted_team_ids contains the teams of all associated advisers."""
+    creator = AdviserFactory()
+    project_manager = AdviserFactory()
+    adviser_without_team = AdviserFactory(dit_team=None)
+    team_member = AdviserFactory()
+    project = InvestmentProjectFactory(
+        created_by=creator,
+        client_relationship_manager=adviser_without_team,
+        project_manager=project_manager,
+        project_assurance_adviser=None,
+    )
+    InvestmentProjectTeamMemberFactory(investment_project=project, adviser=team_member)
+
+    result = ESInvestmentProject.db_object_to_dict(project)
+
+    assert result['permitted_team_ids'] == sorted({
+        str(adviser.dit_team_id) for adviser in (creator, project_manager, team_member)
+    })
+
+
 def test_investment_project_dbmodels_to_es_documents(es):
     """Tests conversion of db models to Elasticsearch documents."""
     projects = InvestmentProjectFactory.create_batch(2)
@@ -1,3 +1,5 @@
+from unittest import mock
+
 import pytest
 
 from datahub.company.test.factories import AdviserFactory
@@ -141,6 +143,33 @@ def test_investment_project_syncs_when_adviser_changes(es_with_signals, field):
     assert result.hits[0][field]['dit_team']['name'] == adviser.dit_team.name
 
 
+def test_adviser_change_queues_related_projects_together(es_with_signals, monkeypatch):
+    """
+    Tests that when an adviser is updated, all investment projects related to that adviser are
+    added to the pending sync queue with a single call.
+    """
+    adviser = AdviserFactory()
+    projects = [
+        InvestmentProjectFactory(project_manager=adviser),
+        InvestmentProjectFactory(client_relationship_manager=adviser),
+    ]
+    InvestmentProjectTeamMemberFactory(investment_project=projects[0], adviser=adviser)
+
+    sync_objects_async_mock = mock.Mock()
+    monkeypatch.setattr(
+        'datahub.search.investment.signals.sync_objects_async',
+        sync_objects_async_mock,
+    )
+
+    adviser.dit_team = TeamFactory()
+    adviser.save()
+
+    sync_objects_async_mock.assert_called_once()
+    search_app, pks = sync_objects_async_mock.call_args[0]
+    assert search_app.name == 'investment_project'
+    assert set(pks) == {project.pk for project in projects}
+
+
 def test_investment_project_syncs_when_team_member_adviser_changes(es_with_signals, team_member):
     """
     Tests that when an adviser that is a team member of an investment project is updated,
@@ -1360,3 +1360,109 @@ class TestBasicSearchPermissions(APITestMixin):
         assert response.status_code == status.HTTP_200_OK
         response_data = response.json()
         assert response_data['count'] == 0
+
+
+class TestAutocompleteSearch(APITestMixin):
+    """Tests for the investment project autocomplete search view."""
+
+    def test_no_permissions_returns_403(self):
+        """Should return 403"""
+        user = create_test_user(dit_team=TeamFactory())
+        api_client = self.create_api_client(user=user)
+        url = reverse('api-v3:search:investment_project-autocomplete')
+
+        response = api_client.get(url, data={'term': 'abc'})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    @pytest.mark.parametrize(
+        'term,expected_names',
+        (
+            ('a', ['Abc Project', 'Acme Expansion']),
+            ('ac', ['Acme Expansion']),
+            ('ACME', ['Acme Expansion']),
+            ('acmé exp', ['Acme Expansion']),
+            ('expansion acme', ['Acme Expansion']),
+            ('proj', ['Abc Project']),
+            ('acme project', []),
+            ('bc', []),
+        ),
+    )
+    def test_searching_with_a_term(self, es_with_collector, term, expected_names):
+        """Tests that projects are matched on prefixes of words in their names."""
+        InvestmentProjectFactory(name='Abc Project')
+        InvestmentProjectFactory(name='Acme Expansion')
+
+        es_with_collector.flush_and_refresh()
+
+        url = reverse('api-v3:search:investment_project-autocomplete')
+        response = self.api_client.get(url, data={'term': term})
+
+        assert response.status_code == status.HTTP_200_OK
+        response_data = response.json()
+        assert response_data['count'] == len(expected_names)
+        assert sorted(result['name'] for result in response_data['results']) == expected_names
+
+    def test_response_body(self, es_with_collector):
+        """Tests that only the autocomplete document fields are returned."""
+        project = InvestmentProjectFactory(name='Abc Project')
+
+        es_with_collector.flush_and_refresh()
+
+        url = reverse('api-v3:search:investment_project-autocomplete')
+        response = self.api_client.get(url, data={'term': 'abc'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            'count': 1,
+            'results': [
+                {
+                    'id': str(project.pk),
+                    'name': project.name,
+                    'project_code': project.project_code,
+                    'investor_company': {
+                        'id': str(project.investor_company.pk),
+                        'name': project.investor_company.name,
+                    },
+                },
+            ],
+        }
+
+    def test_searching_with_limit(self, es_with_collector):
+        """Tests that the number of results is limited to the requested limit."""
+        InvestmentProjectFactory.create_batch(3, name='Abc Project')
+
+        es_with_collector.flush_and_refresh()
+
+        url = reverse('api-v3:search:investment_project-autocomplete')
+        response = self.api_client.get(url, data={'term': 'abc', 'limit': 2})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['count'] == 2
+
+    def test_restricted_users_cannot_see_other_teams_projects(self, es_with_collector):
+        """Tests that permission filters are applied to autocomplete results."""
+        team = TeamFactory()
+        adviser_same_team = AdviserFactory(dit_team_id=team.id)
+        adviser_other = AdviserFactory(dit_team_id=TeamFactory().id)
+        request_user = create_test_user(
+            permission_codenames=['view_associated_investmentproject'],
+            dit_team=team,
+        )
+        api_client = self.create_api_client(user=request_user)
+
+        project_same_team = InvestmentProjectFactory(
+            name='Abc Project',
+            created_by=adviser_same_team,
+        )
+        InvestmentProjectFactory(name='Abc Project', created_by=adviser_other)
+
+        es_with_collector.flush_and_refresh()
+
+        url = reverse('api-v3:search:investment_project-autocomplete')
+        response = api_client.get(url, data={'term': 'abc'})
+
+        assert response.status_code == status.HTTP_200_OK
+        response_data = response.json()
+        assert response_data['count'] == 1
+        assert response_data['results'][0]['id'] == str(project_same_team.pk)
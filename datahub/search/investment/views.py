@@ -13,7 +13,12 @@ from datahub.metadata.query_utils import get_sector_name_subquery
 from datahub.oauth.scopes import Scope
 from datahub.search.investment import InvestmentSearchApp
 from datahub.search.investment.serializers import SearchInvestmentProjectQuerySerializer
-from datahub.search.views import register_v3_view, SearchAPIView, SearchExportAPIView
+from datahub.search.views import (
+    AutocompleteSearchListAPIView,
+    register_v3_view,
+    SearchAPIView,
+    SearchExportAPIView,
+)
 
 
 class SearchInvestmentProjectAPIViewMixin:
@@ -25,6 +30,9 @@ class SearchInvestmentProjectAPIViewMixin:
     es_sort_by_remappings = {
         'name': 'name.keyword',
     }
+    fields_to_exclude = (
+        'permitted_team_ids',
+    )
 
     FILTER_FIELDS = (
         'adviser',
@@ -88,6 +96,21 @@ class SearchInvestmentProjectAPIView(SearchInvestmentProjectAPIViewMixin, Search
     """Filtered investment project search view."""
 
 
+@register_v3_view(sub_path='autocomplete')
+class InvestmentProjectAutocompleteSearchListAPIView(
+    SearchInvestmentProjectAPIViewMixin,
+    AutocompleteSearchListAPIView,
+):
+    """Investment project autocomplete search view."""
+
+    document_fields = [
+        'id',
+        'name',
+        'project_code',
+        'investor_company',
+    ]
+
+
 @register_v3_view(sub_path='export')
 class SearchInvestmentExportAPIView(SearchInvestmentProjectAPIViewMixin, SearchExportAPIView):
     """Investment project search export view."""
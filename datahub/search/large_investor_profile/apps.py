@@ -14,6 +14,7 @@ class LargeInvestorProfileSearchApp(SearchApp):
 
     name = LARGE_INVESTOR_PROFILE_DOC_TYPE
     es_model = LargeInvestorProfile
+    incremental_sync_fields = ('modified_on', 'investor_company__modified_on')
     view_permissions = (f'investor_profile.{InvestorProfilePermission.view_investor_profile}',)
     export_permission = f'investor_profile.{InvestorProfilePermission.export}'
     exclude_from_global_search = True
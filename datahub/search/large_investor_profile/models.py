@@ -84,6 +84,10 @@ class LargeInvestorProfile(BaseESModel):
         **_LOCATION_FIELD_MAPPINGS,
     }
 
+    DENORMALISED_FIELDS = {
+        'investor_company': ('investor_company', 'country_of_origin'),
+    }
+
     class Meta:
         """Default document meta data."""
 
@@ -5,13 +5,10 @@ from datahub.company.models import Company as DBCompany
 from datahub.investment.investor_profile.models import (
     LargeCapitalInvestorProfile as DBLargeCapitalInvestorProfile,
 )
-from datahub.search.deletion import delete_document
+from datahub.search.deletion import delete_document_async
 from datahub.search.large_investor_profile import LargeInvestorProfileSearchApp
-from datahub.search.large_investor_profile.models import (
-    LargeInvestorProfile as ESLargeInvestorProfile,
-)
 from datahub.search.signals import SignalReceiver
-from datahub.search.sync_object import sync_object_async, sync_related_objects_async
+from datahub.search.sync_object import sync_object_async, update_denormalised_fields_async
 
 
 def investor_profile_sync_es(instance):
@@ -22,11 +19,12 @@ def investor_profile_sync_es(instance):
 
 
 def related_investor_profiles_sync_es(instance):
-    """Sync related Company investor profiles to Elasticsearch."""
+    """Update the investor company fields of a company's investor profiles in Elasticsearch."""
     transaction.on_commit(
-        lambda: sync_related_objects_async(
+        lambda: update_denormalised_fields_async(
+            LargeInvestorProfileSearchApp,
+            'investor_company',
             instance,
-            'investor_profiles',
         ),
     )
 
@@ -34,7 +32,7 @@ def related_investor_profiles_sync_es(instance):
 def remove_investor_profile_from_es(instance):
     """Remove investor profile from es."""
     transaction.on_commit(
-        lambda pk=instance.pk: delete_document(ESLargeInvestorProfile, pk),
+        lambda pk=instance.pk: delete_document_async(LargeInvestorProfileSearchApp, pk),
     )
 
 
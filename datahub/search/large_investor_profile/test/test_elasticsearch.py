@@ -26,6 +26,10 @@ def test_mapping(es):
                 '_document_type': {
                     'type': 'keyword',
                 },
+                '_version_hash': {
+                    'index': False,
+                    'type': 'keyword',
+                },
                 'asset_classes_of_interest': {
                     'properties': {
                         'id': {
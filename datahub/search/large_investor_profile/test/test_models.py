@@ -18,6 +18,7 @@ class TestLargeInvestorProfileElasticModel:
         result = ESLargeInvestorProfile.db_object_to_dict(large_investor_profile)
         keys = {
             '_document_type',
+            '_version_hash',
             'asset_classes_of_interest',
             'construction_risks',
             'country_of_origin',
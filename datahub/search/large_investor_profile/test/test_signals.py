@@ -4,6 +4,7 @@ import pytest
 from elasticsearch.exceptions import NotFoundError
 
 from datahub.company.test.factories import CompanyFactory
+from datahub.core.constants import Country
 from datahub.investment.investor_profile.test.factories import LargeCapitalInvestorProfileFactory
 from datahub.search.large_investor_profile.apps import LargeInvestorProfileSearchApp
 
@@ -56,7 +57,7 @@ def test_delete_from_es(
             assert _get_es_document(es_with_signals, investor_profile.pk) is None
 
     with mock.patch(
-        'datahub.search.large_investor_profile.signals.delete_document',
+        'datahub.search.large_investor_profile.signals.delete_document_async',
     ) as mock_delete_document:
         investor_profile.delete()
         es_with_signals.indices.refresh()
@@ -74,3 +75,23 @@ def test_edit_company_syncs_large_investor_profile_in_es(es_with_signals):
 
     result = _get_es_document(es_with_signals, investor_profile.pk)
     assert result['_source']['investor_company']['name'] == new_company_name
+
+
+def test_edit_company_address_country_syncs_large_investor_profile_in_es(es_with_signals):
+    """
+    Tests that updating the address country of a company also updates the country of origin
+    of the relevant investor profiles.
+    """
+    investor_company = CompanyFactory(address_country_id=Country.ireland.value.id)
+    investor_profile = LargeCapitalInvestorProfileFactory(investor_company=investor_company)
+    es_with_signals.indices.refresh()
+
+    investor_company.address_country_id = Country.japan.value.id
+    investor_company.save()
+    es_with_signals.indices.refresh()
+
+    result = _get_es_document(es_with_signals, investor_profile.pk)
+    assert result['_source']['country_of_origin'] == {
+        'id': Country.japan.value.id,
+        'name': Country.japan.value.name,
+    }
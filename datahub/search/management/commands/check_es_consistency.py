@@ -0,0 +1,62 @@
+from logging import getLogger, WARNING
+
+from django.core.management.base import BaseCommand, CommandError
+
+from datahub.search.apps import are_apps_initialised, get_search_apps, get_search_apps_by_name
+from datahub.search.tasks import check_search_app_consistency
+
+logger = getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Command to check that Elasticsearch documents match the objects in the database."""
+
+    def add_arguments(self, parser):
+        """Handle arguments."""
+        parser.add_argument(
+            '--model',
+            action='append',
+            choices=[search_app.name for search_app in get_search_apps()],
+            help='Search model to check. If empty, it checks all',
+        )
+        parser.add_argument(
+            '--repair',
+            action='store_true',
+            help='If specified, missing and stale documents are resynced and orphaned documents '
+                 'are deleted.',
+        )
+        parser.add_argument(
+            '--foreground',
+            action='store_true',
+            help='If specified, the command runs in the foreground without needing Celery '
+                 'running. (By default, it runs asynchronously using Celery.)',
+        )
+
+    def handle(self, *args, **options):
+        """Handle."""
+        es_logger = getLogger('elasticsearch')
+        es_logger.setLevel(WARNING)
+
+        apps = get_search_apps_by_name(options['model'])
+
+        if not are_apps_initialised(apps):
+            raise CommandError(
+                f'Index and mapping not initialised, please run `migrate_es` first.',
+            )
+
+        task_kwargs = {'repair': options['repair']}
+
+        for app in apps:
+            task_args = (app.name,)
+
+            if options['foreground']:
+                result = check_search_app_consistency.apply(
+                    args=task_args,
+                    kwargs=task_kwargs,
+                    throw=True,
+                )
+                logger.info(f'{app.name}: {result.get()}')
+            else:
+                check_search_app_consistency.apply_async(args=task_args, kwargs=task_kwargs)
+
+        logger.info('Elasticsearch consistency check complete!')
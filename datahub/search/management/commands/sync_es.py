@@ -27,6 +27,20 @@ class Command(BaseCommand):
             help='If specified, the command runs in the foreground without needing Celery '
                  'running. (By default, it runs asynchronously using Celery.)',
         )
+        parser.add_argument(
+            '--partitions',
+            type=int,
+            default=1,
+            help='Number of primary key ranges to split each model into. Each range is synced '
+                 'by a separate Celery task, so that the sync can be spread across workers. '
+                 'Cannot be used with --foreground.',
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='If specified, only objects that have changed since the last incremental sync '
+                 'are synced, and documents for deleted objects are removed.',
+        )
 
     def handle(self, *args, **options):
         """Handle."""
@@ -34,18 +48,32 @@ class Command(BaseCommand):
         es_logger.setLevel(WARNING)
 
         apps = get_search_apps_by_name(options['model'])
+        num_partitions = options['partitions']
+        incremental = options['incremental']
+
+        if options['foreground'] and num_partitions > 1:
+            raise CommandError('--partitions cannot be used with --foreground.')
+
+        if incremental and num_partitions > 1:
+            raise CommandError('--partitions cannot be used with --incremental.')
 
         if not are_apps_initialised(apps):
             raise CommandError(
                 f'Index and mapping not initialised, please run `migrate_es` first.',
             )
 
+        task_kwargs = {}
+        if incremental:
+            task_kwargs['incremental'] = True
+        if num_partitions > 1:
+            task_kwargs['num_partitions'] = num_partitions
+
         for app in apps:
             task_args = (app.name,)
 
             if options['foreground']:
-                sync_model.apply(args=task_args, throw=True)
+                sync_model.apply(args=task_args, kwargs=task_kwargs, throw=True)
             else:
-                sync_model.apply_async(args=task_args)
+                sync_model.apply_async(args=task_args, kwargs=task_kwargs)
 
         logger.info('Elasticsearch sync complete!')
@@ -1,7 +1,14 @@
 from logging import getLogger
 
+from django.conf import settings
+
 from datahub.core.exceptions import DataHubException
-from datahub.search.elasticsearch import create_index, start_alias_transaction
+from datahub.search.elasticsearch import (
+    create_index,
+    invalidate_alias_cache,
+    start_alias_transaction,
+)
+from datahub.search.migrate_utils import start_bulk_load
 from datahub.search.tasks import complete_model_migration, sync_model
 
 logger = getLogger(__name__)
@@ -10,6 +17,7 @@ logger = getLogger(__name__)
 def migrate_apps(apps):
     """Migrates all search apps to new indices if their mappings are out of date."""
     logger.info('Starting search app migration')
+    invalidate_alias_cache()
     for app in apps:
         migrate_app(app)
 
@@ -58,6 +66,9 @@ def _perform_migration(search_app):
 
     create_index(new_index_name, es_model._doc_type.mapping)
 
+    if settings.ES_MIGRATION_BULK_LOAD_MODE:
+        start_bulk_load(new_index_name)
+
     with start_alias_transaction() as alias_transaction:
         alias_transaction.associate_indices_with_alias(read_alias_name, [new_index_name])
         alias_transaction.associate_indices_with_alias(write_alias_name, [new_index_name])
@@ -68,8 +79,12 @@ def _perform_migration(search_app):
 
 def _schedule_resync(search_app):
     logger.info(f'Scheduling resync and clean-up for the {search_app.name} search app')
+    num_partitions = settings.ES_RESYNC_PARTITIONS
+    kwargs = {'num_partitions': num_partitions} if num_partitions > 1 else {}
+
     complete_model_migration.apply_async(
         args=(search_app.name, search_app.es_model.get_target_mapping_hash()),
+        kwargs=kwargs,
     )
 
 
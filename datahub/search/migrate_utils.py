@@ -1,19 +1,89 @@
 from logging import getLogger
 
+from django.conf import settings
+
 from datahub.core.exceptions import DataHubException
 from datahub.search.bulk_sync import sync_app
-from datahub.search.deletion import delete_documents
+from datahub.search.deletion import delete_documents_from_indices
 from datahub.search.elasticsearch import (
     delete_index,
+    force_merge_index,
     get_aliases_for_index,
+    get_index_settings,
+    invalidate_alias_cache,
+    refresh_index,
     start_alias_transaction,
+    update_index_settings,
 )
+from datahub.search.execute_query import invalidate_search_app_results
 
 
 BULK_DELETION_TIMEOUT_SECS = 300
+FORCE_MERGE_TIMEOUT_SECS = 60 * 60
+# Index settings applied to new indices while they are populated during a migration.
+# Refreshing and replicating documents as they are written is wasted work when the index
+# is being populated in full, so both are deferred until the load has finished.
+BULK_LOAD_INDEX_SETTINGS = {
+    'refresh_interval': '-1',
+    'number_of_replicas': 0,
+}
 logger = getLogger(__name__)
 
 
+def start_bulk_load(index_name):
+    """
+    Applies BULK_LOAD_INDEX_SETTINGS to an index that is about to be populated by a resync.
+
+    Documents written to the index are not visible in searches until finish_bulk_load() is
+    called.
+
+    No other state is recorded, as whether a bulk load is in progress is determined from the
+    settings of the index (see is_bulk_load_in_progress()).
+    """
+    logger.info(f'Applying bulk load settings to the {index_name} index')
+    update_index_settings(index_name, BULK_LOAD_INDEX_SETTINGS)
+
+
+def finish_bulk_load(index_name):
+    """
+    Restores the normal settings of an index (from settings.ES_INDEX_SETTINGS) after a bulk
+    load, and refreshes it so that all documents written to it become visible.
+
+    If settings.ES_MIGRATION_FORCE_MERGE_MAX_NUM_SEGMENTS is non-zero, the index is also force
+    merged (before replicas are re-enabled, so that merged segments are copied to the replicas
+    rather than each replica merging separately).
+    """
+    logger.info(f'Restoring normal settings for the {index_name} index')
+    refresh_index(index_name)
+
+    max_num_segments = settings.ES_MIGRATION_FORCE_MERGE_MAX_NUM_SEGMENTS
+    if max_num_segments:
+        force_merge_index(index_name, max_num_segments, FORCE_MERGE_TIMEOUT_SECS)
+
+    restored_settings = {
+        setting: settings.ES_INDEX_SETTINGS.get(setting)
+        for setting in BULK_LOAD_INDEX_SETTINGS
+    }
+    update_index_settings(index_name, restored_settings)
+
+
+def is_bulk_load_in_progress(index_name):
+    """
+    Returns whether start_bulk_load() has been called for an index (and not finished).
+
+    This is determined from the current settings of the index: a bulk load is in progress if
+    any of BULK_LOAD_INDEX_SETTINGS that differs from the normal settings of indices (in
+    settings.ES_INDEX_SETTINGS) is currently applied to the index.
+    """
+    index_settings = get_index_settings(index_name)
+
+    return any(
+        str(index_settings.get(setting)) == str(value)
+        and str(settings.ES_INDEX_SETTINGS.get(setting)) != str(value)
+        for setting, value in BULK_LOAD_INDEX_SETTINGS.items()
+    )
+
+
 def resync_after_migrate(search_app):
     """
     Completes a migration by performing a full resync, updating aliases and removing old indices.
@@ -25,8 +95,21 @@ def resync_after_migrate(search_app):
         )
         return
 
+    invalidate_alias_cache()
     sync_app(search_app, post_batch_callback=delete_from_secondary_indices_callback)
+    clean_up_after_resync(search_app)
+
+
+def clean_up_after_resync(search_app):
+    """
+    Completes a migration once all objects have been resynced to the new index by updating
+    aliases and removing old indices.
+
+    This is called directly by resync_after_migrate(), and at the end of partitioned resyncs.
+    """
     _clean_up_aliases_and_indices(search_app)
+    invalidate_alias_cache()
+    invalidate_search_app_results(search_app.name)
 
 
 def _clean_up_aliases_and_indices(search_app):
@@ -37,6 +120,13 @@ def _clean_up_aliases_and_indices(search_app):
     if write_index not in read_indices:
         raise DataHubException('Write index not in read alias, aborting mapping migration...')
 
+    # Make sure all documents in the new index are visible before the old indices are
+    # removed from the read alias
+    if is_bulk_load_in_progress(write_index):
+        finish_bulk_load(write_index)
+    else:
+        refresh_index(write_index)
+
     indices_to_remove = read_indices - {write_index}
 
     if indices_to_remove:
@@ -57,7 +147,13 @@ def delete_from_secondary_indices_callback(read_indices, write_index, actions):
 
     This is used to avoid multiple, differing copies of documents existing at the same time
     whilst documents are being migrated from one index to another.
+
+    Nothing is deleted while the write index is being bulk loaded, as synced documents are not
+    yet visible in searches. The indices being migrated from are instead removed in full once
+    the migration completes.
     """
     remove_indices = read_indices - {write_index}
-    for index in remove_indices:
-        delete_documents(index, actions)
+    if not remove_indices or is_bulk_load_in_progress(write_index):
+        return
+
+    delete_documents_from_indices(remove_indices, actions)
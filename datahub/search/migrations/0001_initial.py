@@ -0,0 +1,27 @@
+# Generated by Django 3.0.5 on 2020-04-14 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingSearchSync',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('search_app', models.CharField(max_length=255)),
+                ('object_id', models.CharField(max_length=255)),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='pendingsearchsync',
+            index=models.Index(fields=['search_app', 'id'], name='search_pend_search__3b8c1e_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.0.5 on 2020-04-15 09:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchAppSyncWatermark',
+            fields=[
+                ('search_app', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('index_name', models.CharField(max_length=255)),
+                ('synced_up_to', models.DateTimeField()),
+                ('modified_on', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
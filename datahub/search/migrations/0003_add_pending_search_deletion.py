@@ -0,0 +1,26 @@
+# Generated by Django 3.0.5 on 2020-04-20 11:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_add_search_app_sync_watermark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingSearchDeletion',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('search_app', models.CharField(max_length=255)),
+                ('document_id', models.CharField(max_length=255)),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='pendingsearchdeletion',
+            index=models.Index(fields=['search_app', 'id'], name='search_pend_search__b2d6a7_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.0.5 on 2020-04-22 14:26
+
+import django.contrib.postgres.fields.jsonb
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0003_add_pending_search_deletion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowSearchQuery',
+            fields=[
+                ('shape_hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('shape', django.contrib.postgres.fields.jsonb.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('view', models.CharField(max_length=255)),
+                ('search_app', models.CharField(max_length=255)),
+                ('sort_field', models.CharField(max_length=255)),
+                ('max_took', models.PositiveIntegerField(help_text='In milliseconds.')),
+                ('last_took', models.PositiveIntegerField(help_text='In milliseconds.')),
+                ('num_occurrences', models.PositiveIntegerField(default=1)),
+                ('profile', django.contrib.postgres.fields.jsonb.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('first_seen_on', models.DateTimeField(auto_now_add=True)),
+                ('last_seen_on', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'slow search query',
+                'verbose_name_plural': 'slow search queries',
+            },
+        ),
+    ]
@@ -1,7 +1,12 @@
+from functools import lru_cache, partial
 from hashlib import blake2b
 from logging import getLogger
+from operator import attrgetter
 
 from django.conf import settings
+from django.contrib.postgres.fields import JSONField
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
 from elasticsearch_dsl import Document, Keyword, MetaField
 
 from datahub.core.exceptions import DataHubException
@@ -10,9 +15,14 @@ from datahub.search.elasticsearch import (
     alias_exists,
     associate_index_with_alias,
     create_index,
+    get_cached_indices_for_aliases,
     get_indices_for_aliases,
 )
-from datahub.search.utils import get_model_non_mapped_field_names, serialise_mapping
+from datahub.search.utils import (
+    get_document_hash,
+    get_model_non_mapped_field_names,
+    serialise_mapping,
+)
 
 
 logger = getLogger(__name__)
@@ -26,12 +36,27 @@ class BaseESModel(Document):
     # It’s required for the aggregations used in global search.
     _document_type = Keyword()
 
+    # A hash of the content of the document when it was synced (see get_document_hash()).
+    # This is used by datahub.search.consistency to detect stale documents.
+    _version_hash = Keyword(index=False)
+
     MAPPINGS = {}
 
     COMPUTED_MAPPINGS = {}
 
     SEARCH_FIELDS = ()
 
+    # Prefix-indexed fields (see fields.AutocompleteText) used by autocomplete queries.
+    # If empty, autocomplete queries use the completion suggester instead.
+    AUTOCOMPLETE_FIELDS = ()
+
+    # Fields that are copied from an object related via a foreign key, keyed by the name of
+    # that foreign key, e.g. {'company': ('company', 'company_sector')}.
+    # The fields must be in MAPPINGS or COMPUTED_MAPPINGS and only depend on the related
+    # object. When the related object is saved, only these fields are updated in the affected
+    # documents (see datahub.search.sync_object.update_denormalised_fields()).
+    DENORMALISED_FIELDS = {}
+
     # Fields that have been renamed in some way, and were used as part of a filter.
     # While an index migration is in progress, a composite filter must be used so that the
     # filter works with both the old and new index.
@@ -72,6 +97,20 @@ class BaseESModel(Document):
         )
         return read_indices, _get_write_index(write_indices)
 
+    @classmethod
+    def get_cached_read_and_write_indices(cls):
+        """
+        Gets the indices currently referenced by the read and write aliases, using a short-lived
+        cache.
+
+        This avoids an extra Elasticsearch request every time an object is synced, and should
+        not be used during migrations.
+        """
+        read_indices, write_indices = get_cached_indices_for_aliases(
+            cls.get_read_alias(), cls.get_write_alias(),
+        )
+        return read_indices, _get_write_index(write_indices)
+
     @classmethod
     def get_index_prefix(cls):
         """Gets the prefix used for indices and aliases."""
@@ -160,20 +199,23 @@ class BaseESModel(Document):
 
     @classmethod
     def db_object_to_dict(cls, db_object):
-        """Converts a DB model object to a dictionary suitable for Elasticsearch."""
-        mapped_values = (
-            (col, fn, getattr(db_object, col)) for col, fn in cls.MAPPINGS.items()
-        )
-        fields = get_model_non_mapped_field_names(cls)
+        """
+        Converts a DB model object to a dictionary suitable for Elasticsearch.
 
-        result = {
-            **{col: fn(val) if val is not None else None for col, fn, val in mapped_values},
-            **{col: fn(db_object) for col, fn in cls.COMPUTED_MAPPINGS.items()},
-            **{field: getattr(db_object, field) for field in fields},
-            '_document_type': cls.get_app_name(),
-        }
+        The conversion is performed by a converter compiled once per search model (see
+        _get_document_converter()).
+        """
+        return _get_document_converter(cls)(db_object)
 
-        return result
+    @classmethod
+    def db_object_to_partial_dict(cls, db_object, fields):
+        """
+        Converts selected fields of a DB model object to a dictionary suitable for a partial
+        update of a document.
+
+        Only fields in MAPPINGS and COMPUTED_MAPPINGS are supported.
+        """
+        return _get_partial_document_converter(cls, tuple(fields))(db_object)
 
     @classmethod
     def db_objects_to_es_documents(cls, db_objects, index=None):
@@ -182,9 +224,183 @@ class BaseESModel(Document):
             yield cls.es_document(db_object, index=index)
 
 
+@lru_cache(maxsize=None)
+def _get_document_converter(es_model):
+    """
+    Compiles a function that converts DB model objects to dictionaries for a search model.
+
+    The field names, getters and transforms, the list of non-mapped fields and the search app
+    name are all resolved once (on first use, as the search apps must be loaded), rather than for
+    every object converted.
+
+    Fields are set in the same order of precedence as before: MAPPINGS, then COMPUTED_MAPPINGS,
+    then non-mapped fields and finally _document_type and _version_hash.
+    """
+    mapped_fields = tuple(
+        (field, attrgetter(field), fn) for field, fn in es_model.MAPPINGS.items()
+    )
+    computed_fields = tuple(es_model.COMPUTED_MAPPINGS.items())
+    non_mapped_fields = tuple(
+        (field, attrgetter(field)) for field in get_model_non_mapped_field_names(es_model)
+    )
+    app_name = es_model.get_app_name()
+
+    def convert(db_object):
+        result = {}
+
+        for field, getter, fn in mapped_fields:
+            value = getter(db_object)
+            result[field] = fn(value) if value is not None else None
+
+        for field, fn in computed_fields:
+            result[field] = fn(db_object)
+
+        for field, getter in non_mapped_fields:
+            result[field] = getter(db_object)
+
+        result['_document_type'] = app_name
+        result['_version_hash'] = get_document_hash(result)
+        return result
+
+    return convert
+
+
+@lru_cache(maxsize=None)
+def _get_partial_document_converter(es_model, fields):
+    """
+    Compiles a function that converts selected fields of DB model objects to a dictionary
+    for a search model.
+
+    As in _get_document_converter(), COMPUTED_MAPPINGS take precedence over MAPPINGS.
+    """
+    field_converters = []
+
+    for field in fields:
+        if field in es_model.COMPUTED_MAPPINGS:
+            field_converters.append((field, es_model.COMPUTED_MAPPINGS[field]))
+        else:
+            getter = attrgetter(field)
+            fn = es_model.MAPPINGS[field]
+            field_converters.append(
+                (field, partial(_convert_mapped_field, getter=getter, fn=fn)),
+            )
+
+    def convert(db_object):
+        return {field: converter(db_object) for field, converter in field_converters}
+
+    return convert
+
+
+def _convert_mapped_field(db_object, getter, fn):
+    value = getter(db_object)
+    return fn(value) if value is not None else None
+
+
 def _get_write_index(indices):
     if len(indices) != 1:
         raise DataHubException(
             'Unexpected alias state; write alias references multiple indices',
         )
     return next(iter(indices))
+
+
+class PendingSearchSync(models.Model):
+    """
+    An object that is waiting to be synced to Elasticsearch.
+
+    Entries are added by `datahub.search.sync_object.sync_objects_async()` and drained in
+    batches by `datahub.search.sync_object.sync_pending_objects()`.
+
+    Duplicate entries for the same object are allowed, and are coalesced when the queue is
+    drained. (This avoids lost updates when an object is queued again while an earlier entry
+    for it is being processed.)
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    search_app = models.CharField(max_length=settings.CHAR_FIELD_MAX_LENGTH)
+    object_id = models.CharField(max_length=settings.CHAR_FIELD_MAX_LENGTH)
+    created_on = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        """Human-friendly string representation."""
+        return f'{self.search_app} – {self.object_id}'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['search_app', 'id'], name='search_pend_search__3b8c1e_idx'),
+        ]
+
+
+class PendingSearchDeletion(models.Model):
+    """
+    A document that is waiting to be deleted from Elasticsearch.
+
+    Entries are added by `datahub.search.deletion.delete_documents_async()` and drained in
+    batches by `datahub.search.deletion.delete_pending_documents()`.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    search_app = models.CharField(max_length=settings.CHAR_FIELD_MAX_LENGTH)
+    document_id = models.CharField(max_length=settings.CHAR_FIELD_MAX_LENGTH)
+    created_on = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        """Human-friendly string representation."""
+        return f'{self.search_app} – {self.document_id}'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['search_app', 'id'], name='search_pend_search__b2d6a7_idx'),
+        ]
+
+
+class SearchAppSyncWatermark(models.Model):
+    """
+    The high-water mark of the last successful incremental sync of a search app.
+
+    See datahub.search.incremental_sync for more details.
+    """
+
+    search_app = models.CharField(max_length=settings.CHAR_FIELD_MAX_LENGTH, primary_key=True)
+    # The index the objects were synced to. If the write index changes (e.g. after a mapping
+    # migration), the next incremental sync falls back to a full sync.
+    index_name = models.CharField(max_length=settings.CHAR_FIELD_MAX_LENGTH)
+    synced_up_to = models.DateTimeField()
+    modified_on = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        """Human-friendly string representation."""
+        return f'{self.search_app} – {self.synced_up_to}'
+
+
+class SlowSearchQuery(models.Model):
+    """
+    A normalised Elasticsearch query shape (with literal values removed) that was slow to
+    execute.
+
+    Entries are added by `datahub.search.instrumentation.record_slow_query()` (via a Celery
+    task). Only the settings.SEARCH_SLOW_QUERY_LOG_SIZE slowest entries are kept, with the
+    others deleted periodically by `datahub.search.instrumentation.prune_slow_query_log()`.
+    """
+
+    shape_hash = models.CharField(max_length=64, primary_key=True)
+    shape = JSONField(encoder=DjangoJSONEncoder)
+    view = models.CharField(max_length=settings.CHAR_FIELD_MAX_LENGTH)
+    search_app = models.CharField(max_length=settings.CHAR_FIELD_MAX_LENGTH)
+    sort_field = models.CharField(max_length=settings.CHAR_FIELD_MAX_LENGTH)
+    max_took = models.PositiveIntegerField(help_text='In milliseconds.')
+    last_took = models.PositiveIntegerField(help_text='In milliseconds.')
+    num_occurrences = models.PositiveIntegerField(default=1)
+    # The output of the Elasticsearch profile API for the most recent profiled occurrence
+    # (see settings.SEARCH_QUERY_PROFILE_SAMPLE_RATE)
+    profile = JSONField(encoder=DjangoJSONEncoder, blank=True, null=True)
+    first_seen_on = models.DateTimeField(auto_now_add=True)
+    last_seen_on = models.DateTimeField()
+
+    def __str__(self):
+        """Human-friendly string representation."""
+        return f'{self.view} – {self.search_app} – {self.max_took} ms'
+
+    class Meta:
+        verbose_name = 'slow search query'
+        verbose_name_plural = 'slow search queries'
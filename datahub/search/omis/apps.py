@@ -15,6 +15,7 @@ class OrderSearchApp(SearchApp):
 
     name = 'order'
     es_model = Order
+    incremental_sync_fields = ('modified_on', 'company__modified_on')
     view_permissions = (f'order.{OrderPermission.view}',)
     export_permission = f'order.{OrderPermission.export}'
     queryset = DBOrder.objects.select_related(
@@ -96,6 +96,11 @@ class Order(BaseESModel):
         'payment_due_date': lambda x: x.invoice.payment_due_date if x.invoice else None,
     }
 
+    DENORMALISED_FIELDS = {
+        'company': ('company',),
+        'contact': ('contact',),
+    }
+
     SEARCH_FIELDS = (
         'id',
         'reference.trigram',
@@ -9,7 +9,7 @@ from datahub.omis.order.models import (
 )
 from datahub.search.omis import OrderSearchApp
 from datahub.search.signals import SignalReceiver
-from datahub.search.sync_object import sync_object_async, sync_related_objects_async
+from datahub.search.sync_object import sync_object_async, update_denormalised_fields_async
 
 
 def order_sync_es(instance):
@@ -24,10 +24,17 @@ def related_order_sync_es(instance):
     order_sync_es(instance.order)
 
 
-def sync_related_orders_to_es(instance):
-    """Sync related orders."""
+def update_company_fields_of_orders_in_es(instance):
+    """Update the company fields of a company's orders in Elasticsearch."""
     transaction.on_commit(
-        lambda: sync_related_objects_async(instance, 'orders'),
+        lambda: update_denormalised_fields_async(OrderSearchApp, 'company', instance),
+    )
+
+
+def update_contact_fields_of_orders_in_es(instance):
+    """Update the contact fields of a contact's orders in Elasticsearch."""
+    transaction.on_commit(
+        lambda: update_denormalised_fields_async(OrderSearchApp, 'contact', instance),
     )
 
 
@@ -37,6 +44,6 @@ receivers = (
     SignalReceiver(post_delete, DBOrderSubscriber, related_order_sync_es),
     SignalReceiver(post_save, DBOrderAssignee, related_order_sync_es),
     SignalReceiver(post_delete, DBOrderAssignee, related_order_sync_es),
-    SignalReceiver(post_save, DBCompany, sync_related_orders_to_es),
-    SignalReceiver(post_save, DBContact, sync_related_orders_to_es),
+    SignalReceiver(post_save, DBCompany, update_company_fields_of_orders_in_es),
+    SignalReceiver(post_save, DBContact, update_contact_fields_of_orders_in_es),
 )
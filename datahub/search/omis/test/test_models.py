@@ -11,6 +11,7 @@ from datahub.omis.order.test.factories import (
 )
 from datahub.search.omis import OrderSearchApp
 from datahub.search.omis.models import Order as ESOrder
+from datahub.search.utils import get_document_hash
 
 pytestmark = pytest.mark.django_db
 
@@ -34,7 +35,9 @@ def test_order_to_dict(order_factory):
     OrderAssigneeFactory.create_batch(2, order=order)
 
     result = ESOrder.db_object_to_dict(order)
+    version_hash = result.pop('_version_hash')
 
+    assert version_hash == get_document_hash(result)
     assert result == {
         '_document_type': OrderSearchApp.name,
         'id': order.pk,
@@ -1,7 +1,7 @@
 from collections import defaultdict
 from itertools import chain
 
-from elasticsearch_dsl import Search
+from elasticsearch_dsl import MultiSearch, Search
 from elasticsearch_dsl.query import (
     Bool,
     Exists,
@@ -76,6 +76,69 @@ def get_basic_search_query(
     return search[offset:offset + limit]
 
 
+def get_basic_multi_search_query(
+        entity,
+        term,
+        permission_filters_by_entity=None,
+        offset=0,
+        limit=100,
+        fields_to_exclude=None,
+):
+    """
+    Alternative to get_basic_search_query() that searches each entity separately (using only
+    that entity's SEARCH_FIELDS) in a single multi-search request.
+
+    The search for the selected entity returns the requested page of results, while the
+    searches for the other entities only return the total number of matches (as size is 0).
+
+    :param permission_filters_by_entity: Dict of entity names and corresponding permission
+                                         filters. Only entities in this dict are searched, and
+                                         those entities are also filtered using the
+                                         corresponding permission filters.
+    :returns: tuple of the MultiSearch and the names of the entities searched (in the same
+              order as the searches)
+    """
+    limit = _clip_limit(offset, limit)
+    multi_search = MultiSearch()
+    entity_names = []
+
+    for search_app in get_global_search_apps_as_mapping().values():
+        es_model = search_app.es_model
+        entity_name = es_model.get_app_name()
+
+        if permission_filters_by_entity is None:
+            permission_filters = None
+        elif entity_name in permission_filters_by_entity:
+            permission_filters = permission_filters_by_entity[entity_name]
+        else:
+            continue
+
+        search = Search(
+            index=es_model.get_read_alias(),
+        ).query(
+            _build_term_query(term, fields=sorted(es_model.SEARCH_FIELDS)),
+        )
+
+        permission_query = _build_entity_permission_query(permission_filters)
+        if permission_query:
+            search = search.filter(permission_query)
+
+        if es_model is entity:
+            search = search.sort(
+                '_score',
+                'id',
+            ).source(
+                excludes=fields_to_exclude,
+            )[offset:offset + limit]
+        else:
+            search = search.extra(size=0)
+
+        multi_search = multi_search.add(search)
+        entity_names.append(entity_name)
+
+    return multi_search, entity_names
+
+
 def get_search_by_entities_query(
         entities,
         term=None,
@@ -151,12 +214,68 @@ def build_autocomplete_query(es_model, keyword_search, limit, fields_to_include,
     )
 
 
+def build_prefix_autocomplete_query(
+    es_model,
+    keyword_search,
+    limit,
+    fields_to_include,
+    permission_filters=None,
+):
+    """
+    Builds a prefix-based autocomplete query and applies source filtering.
+
+    This matches documents where each word in keyword_search is a prefix of a word in one of
+    es_model.AUTOCOMPLETE_FIELDS.
+
+    Unlike the completion suggester used by build_autocomplete_query(), this is a normal query,
+    so permission filters can be applied to it. They are applied in filter context so that
+    they can be cached by Elasticsearch and do not affect scoring.
+    """
+    index = es_model.get_read_alias()
+    autocomplete_search = es_model.search(index=index).query(
+        MultiMatch(
+            query=keyword_search,
+            fields=es_model.AUTOCOMPLETE_FIELDS,
+            operator='and',
+        ),
+    )
+
+    permission_query = _build_entity_permission_query(permission_filters)
+    if permission_query:
+        autocomplete_search = autocomplete_search.filter(permission_query)
+
+    autocomplete_search = _apply_source_filtering_to_query(
+        autocomplete_search,
+        fields_to_include=fields_to_include,
+    )
+    autocomplete_search = _apply_sorting_to_query(autocomplete_search, None)
+    return autocomplete_search[:limit]
+
+
 def limit_search_query(query, offset=0, limit=100):
     """Limits search query to the page defined by offset and limit."""
     limit = _clip_limit(offset, limit)
     return query[offset:offset + limit]
 
 
+def limit_search_query_after(query, search_after=None, limit=100):
+    """
+    Limits search query to the page of results following the hit with the sort values
+    search_after (or to the first page, if search_after is None).
+
+    Unlike limit_search_query(), this is not limited to the first MAX_RESULTS results and the
+    cost of fetching a page does not increase with its depth. The query must have a
+    deterministic ordering (which is ensured by _apply_sorting_to_query() using id as a
+    tiebreaker).
+    """
+    query = query.extra(size=min(limit, MAX_RESULTS))
+
+    if search_after:
+        query = query.extra(search_after=search_after)
+
+    return query
+
+
 def _split_range_fields(fields):
     """Finds and formats range fields."""
     filters = {}
@@ -4,7 +4,12 @@ from rest_framework.settings import api_settings
 
 from datahub.search.apps import get_global_search_apps_as_mapping
 from datahub.search.query_builder import MAX_RESULTS
-from datahub.search.utils import SearchOrdering, SortDirection
+from datahub.search.utils import (
+    decode_search_cursor,
+    encode_search_cursor,
+    SearchOrdering,
+    SortDirection,
+)
 
 
 class SingleOrListField(serializers.ListField):
@@ -89,6 +94,32 @@ class _ESOrderingField(serializers.Field):
         return f'{value.field}:{value.direction}'
 
 
+class _SearchCursorField(serializers.Field):
+    """
+    Serialiser field for an opaque search cursor (as returned in search responses).
+
+    Deserialises to the list of sort values to pass to search_after.
+    """
+
+    default_error_messages = {
+        'invalid': gettext_lazy('Invalid cursor.'),
+    }
+
+    def to_internal_value(self, data):
+        """Decodes a cursor."""
+        if not isinstance(data, str):
+            self.fail('invalid')
+
+        try:
+            return decode_search_cursor(data)
+        except ValueError:
+            self.fail('invalid')
+
+    def to_representation(self, value):
+        """Encodes a list of sort values as a cursor."""
+        return encode_search_cursor(value)
+
+
 class BaseSearchQuerySerializer(serializers.Serializer):
     """Base serialiser for basic (global) and entity search."""
 
@@ -144,6 +175,17 @@ class EntitySearchQuerySerializer(BaseSearchQuerySerializer):
     """Serialiser used to validate entity search POST bodies."""
 
     original_query = serializers.CharField(default='', allow_blank=True)
+    # If specified (null for the first page), cursor-based paging is used instead of offset
+    cursor = _SearchCursorField(required=False, allow_null=True)
+
+    def validate(self, data):
+        """Checks that offset and cursor have not both been specified."""
+        if 'cursor' in data and data['offset']:
+            raise serializers.ValidationError({
+                'offset': gettext_lazy('This field cannot be used with cursor.'),
+            })
+
+        return data
 
 
 class AutocompleteSearchQuerySerializer(serializers.Serializer):
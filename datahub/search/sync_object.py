@@ -1,11 +1,28 @@
 from logging import getLogger
 
+from django.core.cache import cache
+from django.db import transaction
+
+from datahub.core.exceptions import DataHubException
 from datahub.search.bulk_sync import sync_objects
+from datahub.search.elasticsearch import bulk
+from datahub.search.execute_query import invalidate_search_app_results
 from datahub.search.migrate_utils import delete_from_secondary_indices_callback
-from datahub.search.tasks import sync_object_task, sync_related_objects_task
+from datahub.search.models import PendingSearchSync
+from datahub.search.tasks import (
+    sync_pending_objects_task,
+    sync_related_objects_task,
+    update_denormalised_fields_task,
+)
 
 logger = getLogger(__name__)
 
+# How long to wait for more objects to be queued before draining the queue for a search app
+PENDING_SYNC_COUNTDOWN_SECS = 2
+PENDING_SYNC_INSERT_BATCH_SIZE = 5000
+PARTIAL_UPDATE_CHUNK_SIZE = 2000
+PARTIAL_UPDATE_TIMEOUT_SECS = 300
+
 
 def sync_object(search_app, pk):
     """
@@ -15,7 +32,7 @@ def sync_object(search_app, pk):
     new index and then deleted from the old index.
     """
     es_model = search_app.es_model
-    read_indices, write_index = es_model.get_read_and_write_indices()
+    read_indices, write_index = es_model.get_cached_read_and_write_indices()
 
     obj = search_app.queryset.get(pk=pk)
     sync_objects(
@@ -25,11 +42,13 @@ def sync_object(search_app, pk):
         write_index,
         post_batch_callback=delete_from_secondary_indices_callback,
     )
+    invalidate_search_app_results(search_app.name)
 
 
 def sync_object_async(search_app, pk):
     """
-    Syncs a single object to Elasticsearch asynchronously (by scheduling a Celery task).
+    Syncs a single object to Elasticsearch asynchronously (by adding it to the pending sync
+    queue).
 
     This function is normally used by signal receivers to copy new or updated objects to
     Elasticsearch.
@@ -37,13 +56,97 @@ def sync_object_async(search_app, pk):
     Syncing an object is migration-safe – if a migration is in progress, the object is
     added to the new index and then deleted from the old index.
     """
-    result = sync_object_task.apply_async(args=(search_app.name, pk))
+    sync_objects_async(search_app, [pk])
+
+
+def sync_objects_async(search_app, pks):
+    """
+    Adds objects to the pending sync queue for a search app, and schedules a Celery task to
+    drain the queue (unless one has already been scheduled).
+
+    Objects queued within PENDING_SYNC_COUNTDOWN_SECS of each other are synced together using
+    a single query and bulk request.
+    """
+    unique_pks = {str(pk) for pk in pks}
+    if not unique_pks:
+        return
+
+    entries = (
+        PendingSearchSync(search_app=search_app.name, object_id=pk) for pk in unique_pks
+    )
+    PendingSearchSync.objects.bulk_create(entries, batch_size=PENDING_SYNC_INSERT_BATCH_SIZE)
+
+    # cache.add() only adds the key if it isn't present, so only one task is scheduled per
+    # countdown period
+    scheduled_key = f'search-pending-sync-scheduled-{search_app.name}'
+    if not cache.add(scheduled_key, True, timeout=PENDING_SYNC_COUNTDOWN_SECS):
+        return
+
+    result = sync_pending_objects_task.apply_async(
+        args=(search_app.name,),
+        countdown=PENDING_SYNC_COUNTDOWN_SECS,
+    )
     logger.info(
-        f'Task {result.id} scheduled to synchronise object {pk} for search app '
+        f'Task {result.id} scheduled to synchronise pending objects for search app '
         f'{search_app.name}',
     )
 
 
+def sync_pending_objects(search_app, batch_size=None):
+    """
+    Drains the pending sync queue for a search app, syncing objects in batches of batch_size.
+
+    Queue entries are locked using SKIP LOCKED, so multiple workers can drain the same queue
+    concurrently. If syncing a batch fails, its entries stay in the queue.
+
+    Objects that no longer exist are skipped (deleted objects are handled by the deletion signal
+    receivers).
+
+    :returns: the number of queue entries processed
+    """
+    es_model = search_app.es_model
+    batch_size = batch_size or search_app.bulk_batch_size
+    num_entries_processed = 0
+
+    while True:
+        with transaction.atomic():
+            entries = list(
+                PendingSearchSync.objects.select_for_update(
+                    skip_locked=True,
+                ).filter(
+                    search_app=search_app.name,
+                ).order_by(
+                    'pk',
+                ).values_list(
+                    'pk',
+                    'object_id',
+                )[:batch_size],
+            )
+
+            if not entries:
+                break
+
+            entry_pks, object_ids = zip(*entries)
+            read_indices, write_index = es_model.get_cached_read_and_write_indices()
+
+            sync_objects(
+                es_model,
+                search_app.queryset.filter(pk__in=set(object_ids)),
+                read_indices,
+                write_index,
+                post_batch_callback=delete_from_secondary_indices_callback,
+            )
+
+            PendingSearchSync.objects.filter(pk__in=entry_pks).delete()
+
+        num_entries_processed += len(entries)
+
+    if num_entries_processed:
+        invalidate_search_app_results(search_app.name)
+
+    return num_entries_processed
+
+
 def sync_related_objects_async(related_obj, related_obj_field_name, related_obj_filter=None):
     """
     Syncs objects related to another object via a specified field.
@@ -71,3 +174,96 @@ def sync_related_objects_async(related_obj, related_obj_field_name, related_obj_
         f'Task {result.id} scheduled to synchronise {related_obj_field_name} for object'
         f' {related_obj.pk}',
     )
+
+
+def update_denormalised_fields_async(search_app, field_name, related_obj):
+    """
+    Updates the fields copied from a related object in the documents of the objects
+    referencing it, asynchronously.
+
+    For example, this function would update the company fields of a company's interactions if
+    given the following arguments:
+        search_app=InteractionSearchApp
+        field_name='company'
+        related_obj=company
+
+    The fields updated are those in search_app.es_model.DENORMALISED_FIELDS[field_name].
+
+    This function is normally used by signal receivers instead of
+    sync_related_objects_async(), when only denormalised fields of the related documents
+    could have changed.
+    """
+    result = update_denormalised_fields_task.apply_async(
+        args=(
+            search_app.name,
+            field_name,
+            str(related_obj.pk),
+        ),
+    )
+
+    logger.info(
+        f'Task {result.id} scheduled to update the {field_name} fields of {search_app.name} '
+        f'documents for object {related_obj.pk}',
+    )
+
+
+def update_denormalised_fields(search_app, field_name, related_obj_pk):
+    """
+    Updates the fields copied from a related object in the documents of the objects
+    referencing it (via the foreign key field_name), using partial updates.
+
+    The values of the fields are computed once (as they only depend on the related object),
+    so the referencing objects do not have to be loaded from the database or fully
+    re-serialised. Elasticsearch skips documents where the values have not changed (as
+    detect_noop is enabled by default for partial updates), so that saving a related object
+    without changing any of the copied fields does not cause any documents to be rewritten.
+
+    Updates are migration-safe – if a migration is in progress, the documents are updated
+    in both the new index and the old index. Documents that have not been indexed yet are
+    skipped (they will have the new values when they are synced).
+
+    :raises DataHubException: in case of non 404 errors
+    """
+    es_model = search_app.es_model
+    db_model = search_app.queryset.model
+    related_model = db_model._meta.get_field(field_name).related_model
+    related_obj = related_model.objects.get(pk=related_obj_pk)
+
+    # Only the related object is needed to compute the values of the fields
+    partial_doc = es_model.db_object_to_partial_dict(
+        db_model(**{field_name: related_obj}),
+        es_model.DENORMALISED_FIELDS[field_name],
+    )
+
+    pks = db_model.objects.filter(**{field_name: related_obj}).values_list('pk', flat=True)
+    read_indices, write_index = es_model.get_cached_read_and_write_indices()
+    doc_type = es_model._doc_type.name
+
+    update_actions = (
+        {
+            '_op_type': 'update',
+            '_index': index,
+            '_type': doc_type,
+            '_id': pk,
+            'doc': partial_doc,
+            'retry_on_conflict': 3,
+        }
+        for index in {write_index, *read_indices}
+        for pk in pks.iterator()
+    )
+
+    _, errors = bulk(
+        actions=update_actions,
+        chunk_size=PARTIAL_UPDATE_CHUNK_SIZE,
+        request_timeout=PARTIAL_UPDATE_TIMEOUT_SECS,
+        raise_on_error=False,
+    )
+
+    non_404_errors = [error for error in errors if error['update']['status'] != 404]
+    if non_404_errors:
+        raise DataHubException(
+            f'One or more errors during an Elasticsearch bulk partial update operation: '
+            f'{non_404_errors!r}',
+        )
+
+    invalidate_search_app_results(search_app.name)
@@ -1,44 +1,153 @@
-from celery import shared_task
+from celery import chord, shared_task
 from celery.utils.log import get_task_logger
 from django.apps import apps
 from django_pglocks import advisory_lock
 
 from datahub.search.apps import get_search_app, get_search_app_by_model, get_search_apps
-from datahub.search.bulk_sync import sync_app
-from datahub.search.migrate_utils import resync_after_migrate
+from datahub.search.bulk_sync import get_pk_partitions, sync_app
+from datahub.search.consistency import check_consistency
+from datahub.search.deletion import delete_pending_documents
+from datahub.search.incremental_sync import sync_app_incrementally
+from datahub.search.instrumentation import (
+    prune_slow_query_log,
+    record_slow_query,
+    SearchQueryLabels,
+)
+from datahub.search.migrate_utils import (
+    clean_up_after_resync,
+    delete_from_secondary_indices_callback,
+    resync_after_migrate,
+)
 
 
 logger = get_task_logger(__name__)
 
 
 @shared_task(acks_late=True, priority=9)
-def sync_all_models():
+def sync_all_models(incremental=False):
     """
     Task that starts sub-tasks to sync all models to Elasticsearch.
 
+    If incremental is True, only objects that have changed since the last incremental sync
+    are synced (see datahub.search.incremental_sync).
+
     acks_late is set to True so that the task restarts if interrupted.
 
     priority is set to the lowest priority (for Redis, 0 is the highest priority).
     """
+    kwargs = {'incremental': True} if incremental else {}
+
     for search_app in get_search_apps():
         sync_model.apply_async(
             args=(search_app.name,),
+            kwargs=kwargs,
         )
 
 
 @shared_task(acks_late=True, priority=9, queue='long-running')
-def sync_model(search_app_name):
+def sync_model(search_app_name, num_partitions=None, incremental=False):
     """
     Task that syncs a single model to Elasticsearch.
 
+    If num_partitions is greater than one, the model is split into primary key ranges which
+    are synced in parallel by separate sync_model_partition sub-tasks.
+
+    If incremental is True, only objects that have changed since the last incremental sync
+    are synced, and documents for deleted objects are removed (see
+    datahub.search.incremental_sync).
+
     acks_late is set to True so that the task restarts if interrupted.
 
     priority is set to the lowest priority (for Redis, 0 is the highest priority).
     """
     search_app = get_search_app(search_app_name)
+
+    if incremental:
+        sync_app_incrementally(search_app)
+        return
+
+    if num_partitions and num_partitions > 1:
+        _schedule_partitioned_sync(
+            search_app,
+            num_partitions,
+            log_partitioned_sync_completion.si(search_app_name),
+        )
+        return
+
     sync_app(search_app)
 
 
+@shared_task(
+    bind=True,
+    acks_late=True,
+    priority=9,
+    max_retries=15,
+    default_retry_delay=60,
+    queue='long-running',
+)
+def sync_model_partition(
+    self,
+    search_app_name,
+    start_pk,
+    end_pk,
+    delete_from_secondary_indices=False,
+):
+    """
+    Task that syncs a partition (primary key range) of a model to Elasticsearch.
+
+    If delete_from_secondary_indices is True, synced documents are deleted from any indices
+    being migrated from (as during a mapping migration). In this case, the migration lock for
+    the search app is held in shared mode while the partition is synced. This allows the
+    partitions to run in parallel, but stops another migration task from running at the same
+    time (and the task is retried if another migration task is in progress).
+
+    acks_late is set to True so that the task restarts if interrupted.
+    """
+    search_app = get_search_app(search_app_name)
+
+    if not delete_from_secondary_indices:
+        return sync_app(search_app, post_batch_callback=None, pk_range=(start_pk, end_pk))
+
+    with advisory_lock(
+        _get_migration_lock_id(search_app_name),
+        shared=True,
+        wait=False,
+    ) as lock_held:
+        if not lock_held:
+            logger.info(
+                f'Another migration task is in progress for the {search_app_name} search app. '
+                f'Retrying later...',
+            )
+            raise self.retry()
+
+        return sync_app(
+            search_app,
+            post_batch_callback=delete_from_secondary_indices_callback,
+            pk_range=(start_pk, end_pk),
+        )
+
+
+@shared_task(acks_late=True, priority=9)
+def log_partitioned_sync_completion(search_app_name):
+    """Task that is run once all partitions of a partitioned sync have completed."""
+    logger.info(f'Partitioned sync of the {search_app_name} search app complete')
+
+
+@shared_task(acks_late=True, priority=9, queue='long-running')
+def check_search_app_consistency(search_app_name, repair=False):
+    """
+    Task that checks that the documents for a search app match the objects in the database.
+
+    If repair is True, missing and stale documents are resynced and orphaned documents are
+    deleted (see datahub.search.consistency).
+
+    :returns: the counts of inconsistencies found as a dict
+    """
+    search_app = get_search_app(search_app_name)
+    result = check_consistency(search_app, repair=repair)
+    return result._asdict()
+
+
 @shared_task(acks_late=True, max_retries=15, autoretry_for=(Exception,), retry_backoff=1)
 def sync_object_task(search_app_name, pk):
     """
@@ -57,7 +166,6 @@ def sync_object_task(search_app_name, pk):
 
 
 @shared_task(
-    bind=True,
     acks_late=True,
     max_retries=15,
     priority=6,
@@ -65,7 +173,6 @@ def sync_object_task(search_app_name, pk):
     retry_backoff=1,
 )
 def sync_related_objects_task(
-    self,
     related_model_label,
     related_obj_pk,
     related_obj_field_name,
@@ -80,13 +187,15 @@ def sync_related_objects_task(
         related_obj_pk=company.pk
         related_obj_field_name='interactions'
 
-    Note that a lower priority (higher number) is used for syncing related objects, as syncing
-    them is less important than syncing the primary object that was modified.
+    The related objects are added to the pending sync queue, so that they are synced in
+    batches (together with any other pending objects for the same search app).
 
     If an error occurs, the task will be automatically retried with an exponential back-off.
     The wait between attempts is approximately 2 ** attempt_num seconds (with some jitter
     added).
     """
+    from datahub.search.sync_object import sync_objects_async
+
     related_model = apps.get_model(related_model_label)
     related_obj = related_model.objects.get(pk=related_obj_pk)
     manager = getattr(related_obj, related_obj_field_name)
@@ -95,8 +204,128 @@ def sync_related_objects_task(
     queryset = manager.values_list('pk', flat=True)
     search_app = get_search_app_by_model(manager.model)
 
-    for pk in queryset:
-        sync_object_task.apply_async(args=(search_app.name, pk), priority=self.priority)
+    sync_objects_async(search_app, queryset)
+
+
+@shared_task(
+    acks_late=True,
+    max_retries=15,
+    priority=6,
+    autoretry_for=(Exception,),
+    retry_backoff=1,
+)
+def update_denormalised_fields_task(search_app_name, field_name, related_obj_pk):
+    """
+    Updates the fields copied from a related object in the documents of the objects
+    referencing it (see datahub.search.sync_object.update_denormalised_fields()).
+
+    If an error occurs, the task will be automatically retried with an exponential back-off.
+    The wait between attempts is approximately 2 ** attempt_num seconds (with some jitter
+    added).
+    """
+    from datahub.search.sync_object import update_denormalised_fields
+
+    search_app = get_search_app(search_app_name)
+    update_denormalised_fields(search_app, field_name, related_obj_pk)
+
+
+@shared_task(acks_late=True, max_retries=15, autoretry_for=(Exception,), retry_backoff=1)
+def sync_pending_objects_task(search_app_name):
+    """
+    Syncs all objects in the pending sync queue for a search app to Elasticsearch in batches.
+
+    If an error occurs, the task will be automatically retried with an exponential back-off.
+    (Entries for batches that were not synced remain in the queue.)
+    """
+    from datahub.search.sync_object import sync_pending_objects
+
+    search_app = get_search_app(search_app_name)
+    num_entries_processed = sync_pending_objects(search_app)
+    logger.info(
+        f'{num_entries_processed} pending sync queue entries processed for search app '
+        f'{search_app_name}',
+    )
+
+
+@shared_task(acks_late=True, priority=6)
+def change_search_app_result_generation_task(search_app_name):
+    """
+    Discards cached search results for a search app.
+
+    This is scheduled by datahub.search.execute_query.invalidate_search_app_results() to
+    discard results that were cached before recent changes became visible in searches.
+    """
+    from datahub.search.execute_query import change_search_app_result_generation
+
+    change_search_app_result_generation(search_app_name)
+
+
+@shared_task(acks_late=True, priority=9)
+def sync_all_pending_objects():
+    """
+    Task that starts sub-tasks to drain the pending sync queues of all search apps.
+
+    This is scheduled periodically to pick up any queue entries that were missed by the
+    sync_pending_objects_task tasks scheduled by sync_objects_async() (e.g. because they were
+    added in a transaction that was committed after the task ran).
+    """
+    for search_app in get_search_apps():
+        sync_pending_objects_task.apply_async(
+            args=(search_app.name,),
+        )
+
+
+@shared_task(acks_late=True, max_retries=15, autoretry_for=(Exception,), retry_backoff=1)
+def delete_pending_documents_task(search_app_name):
+    """
+    Deletes all documents in the pending deletion queue for a search app from Elasticsearch in
+    batches.
+
+    If an error occurs, the task will be automatically retried with an exponential back-off.
+    (Entries for batches that were not deleted remain in the queue.)
+    """
+    search_app = get_search_app(search_app_name)
+    result = delete_pending_documents(search_app)
+    logger.info(
+        f'Pending deletion queue processed for search app {search_app_name}: '
+        f'{result.num_deleted} documents deleted, {result.num_not_found} not found',
+    )
+
+
+@shared_task(acks_late=True, priority=9)
+def delete_all_pending_documents():
+    """
+    Task that starts sub-tasks to drain the pending deletion queues of all search apps.
+
+    This is scheduled periodically to pick up any queue entries that were missed by the
+    delete_pending_documents_task tasks scheduled by delete_documents_async().
+    """
+    for search_app in get_search_apps():
+        delete_pending_documents_task.apply_async(
+            args=(search_app.name,),
+        )
+
+
+@shared_task(acks_late=True, priority=9)
+def record_slow_search_query_task(query_shape, took, labels, profile=None):
+    """
+    Adds a slow query to the slow query log.
+
+    This is scheduled by datahub.search.instrumentation.record_query(), so that the slow query
+    log is not written to while handling search requests.
+    """
+    record_slow_query(query_shape, took, SearchQueryLabels(*labels), profile=profile)
+
+
+@shared_task(acks_late=True, priority=9)
+def prune_slow_search_queries():
+    """
+    Deletes all but the slowest entries from the slow query log.
+
+    This is scheduled periodically.
+    """
+    num_deleted = prune_slow_query_log()
+    logger.info(f'{num_deleted} entries deleted from the slow search query log')
 
 
 @shared_task(
@@ -107,9 +336,13 @@ def sync_related_objects_task(
     default_retry_delay=60,
     queue='long-running',
 )
-def complete_model_migration(self, search_app_name, new_mapping_hash):
+def complete_model_migration(self, search_app_name, new_mapping_hash, num_partitions=None):
     """
     Completes a migration by performing a full resync, updating aliases and removing old indices.
+
+    If num_partitions is greater than one, the resync is split into primary key ranges which
+    are synced in parallel by separate sub-tasks. Aliases are then updated and old indices
+    removed by complete_partitioned_model_migration once all partitions have completed.
     """
     search_app = get_search_app(search_app_name)
     if search_app.es_model.get_target_mapping_hash() != new_mapping_hash:
@@ -122,7 +355,7 @@ Rescheduling the {search_app_name} search app migration to attempt to resolve th
         logger.warning(warning_message)
         raise self.retry()
 
-    with advisory_lock(f'leeloo-resync_after_migrate-{search_app_name}', wait=False) as lock_held:
+    with advisory_lock(_get_migration_lock_id(search_app_name), wait=False) as lock_held:
         if not lock_held:
             logger.warning(
                 f'Another complete_model_migration task is in progress for the {search_app_name} '
@@ -130,4 +363,70 @@ Rescheduling the {search_app_name} search app migration to attempt to resolve th
             )
             return
 
+        if num_partitions and num_partitions > 1:
+            _schedule_partitioned_migration_resync(search_app, num_partitions)
+            return
+
         resync_after_migrate(search_app)
+
+
+@shared_task(
+    bind=True,
+    acks_late=True,
+    priority=7,
+    max_retries=15,
+    default_retry_delay=60,
+    queue='long-running',
+)
+def complete_partitioned_model_migration(self, search_app_name):
+    """
+    Completes a partitioned migration (once all partitions have been resynced) by updating
+    aliases and removing old indices.
+
+    If another migration task is holding the migration lock for the search app, the task is
+    retried later (rather than aborted, as the old indices would otherwise never be removed).
+    """
+    search_app = get_search_app(search_app_name)
+
+    with advisory_lock(_get_migration_lock_id(search_app_name), wait=False) as lock_held:
+        if not lock_held:
+            logger.info(
+                f'Another migration task is in progress for the {search_app_name} search app. '
+                f'Retrying later...',
+            )
+            raise self.retry()
+
+        clean_up_after_resync(search_app)
+
+
+def _get_migration_lock_id(search_app_name):
+    return f'leeloo-resync_after_migrate-{search_app_name}'
+
+
+def _schedule_partitioned_sync(search_app, num_partitions, callback, **partition_kwargs):
+    partitions = get_pk_partitions(search_app, num_partitions)
+    logger.info(
+        f'Scheduling sync of the {search_app.name} search app in {len(partitions)} partitions',
+    )
+
+    header = [
+        sync_model_partition.si(search_app.name, start_pk, end_pk, **partition_kwargs)
+        for start_pk, end_pk in partitions
+    ]
+    chord(header)(callback)
+
+
+def _schedule_partitioned_migration_resync(search_app, num_partitions):
+    if not search_app.es_model.was_migration_started():
+        logger.warning(
+            f'No pending migration detected for the {search_app.name} search app, aborting '
+            f'resync...',
+        )
+        return
+
+    _schedule_partitioned_sync(
+        search_app,
+        num_partitions,
+        complete_partitioned_model_migration.si(search_app.name),
+        delete_from_secondary_indices=True,
+    )
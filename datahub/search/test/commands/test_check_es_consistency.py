@@ -0,0 +1,58 @@
+from unittest import mock
+
+import pytest
+from django.core import management
+from django.core.management.base import CommandError
+
+from datahub.search.apps import get_search_apps
+from datahub.search.management.commands import check_es_consistency
+
+
+@mock.patch(
+    'datahub.search.apps.index_exists',
+    mock.Mock(return_value=False),
+)
+def test_fails_if_index_doesnt_exist():
+    """Tests that if the index doesn't exist, check_es_consistency fails."""
+    with pytest.raises(CommandError):
+        management.call_command(check_es_consistency.Command())
+
+
+@mock.patch(
+    'datahub.search.management.commands.check_es_consistency.check_search_app_consistency',
+)
+@mock.patch(
+    'datahub.search.apps.index_exists',
+    mock.Mock(return_value=True),
+)
+def test_check_all_models(check_mock):
+    """Test that if --model is not used, all the search apps are checked."""
+    management.call_command(check_es_consistency.Command())
+
+    assert check_mock.apply_async.call_count == len(get_search_apps())
+    check_mock.apply_async.assert_any_call(args=(mock.ANY,), kwargs={'repair': False})
+
+
+@pytest.mark.parametrize('repair', (False, True))
+@mock.patch(
+    'datahub.search.management.commands.check_es_consistency.check_search_app_consistency',
+)
+@mock.patch(
+    'datahub.search.apps.index_exists',
+    mock.Mock(return_value=True),
+)
+def test_check_one_model_in_foreground(check_mock, repair):
+    """Test that --model, --repair and --foreground are passed through to the task."""
+    management.call_command(
+        check_es_consistency.Command(),
+        model=['company'],
+        repair=repair,
+        foreground=True,
+    )
+
+    check_mock.apply.assert_called_once_with(
+        args=('company',),
+        kwargs={'repair': repair},
+        throw=True,
+    )
+    assert not check_mock.apply_async.called
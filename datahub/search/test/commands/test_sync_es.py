@@ -78,3 +78,48 @@ def test_sync_invalid_model(sync_model_mock):
     management.call_command(sync_es.Command(), model='invalid')
 
     assert sync_model_mock.apply_async.call_count == 0
+
+
+@mock.patch('datahub.search.management.commands.sync_es.sync_model')
+@mock.patch(
+    'datahub.search.apps.index_exists',
+    mock.Mock(return_value=True),
+)
+def test_sync_with_partitions(sync_model_mock):
+    """Test that --partitions is passed on to the sync_model task."""
+    app = get_search_apps()[0]
+    management.call_command(sync_es.Command(), model=[app.name], partitions=4)
+
+    sync_model_mock.apply_async.assert_called_once_with(
+        args=(app.name,),
+        kwargs={'num_partitions': 4},
+    )
+
+
+@mock.patch('datahub.search.management.commands.sync_es.sync_model')
+@mock.patch(
+    'datahub.search.apps.index_exists',
+    mock.Mock(return_value=True),
+)
+def test_sync_with_partitions_in_foreground_fails(sync_model_mock):
+    """Test that --partitions can't be used with --foreground."""
+    with pytest.raises(CommandError):
+        management.call_command(sync_es.Command(), partitions=4, foreground=True)
+
+    assert not sync_model_mock.apply.called
+
+
+@mock.patch('datahub.search.management.commands.sync_es.sync_model')
+@mock.patch(
+    'datahub.search.apps.index_exists',
+    mock.Mock(return_value=True),
+)
+def test_sync_incrementally(sync_model_mock):
+    """Test that --incremental is passed on to the sync_model task."""
+    app = get_search_apps()[0]
+    management.call_command(sync_es.Command(), model=[app.name], incremental=True)
+
+    sync_model_mock.apply_async.assert_called_once_with(
+        args=(app.name,),
+        kwargs={'incremental': True},
+    )
@@ -18,6 +18,10 @@ class ESRelatedModel(BaseESModel):
         'simpleton': dict_utils.id_name_dict,
     }
 
+    DENORMALISED_FIELDS = {
+        'simpleton': ('simpleton',),
+    }
+
     SEARCH_FIELDS = ('simpleton.name',)
 
     class Meta:
@@ -5,9 +5,11 @@ import pytest
 from datahub.company.models import Company
 from datahub.company.test.factories import CompanyFactory
 from datahub.core.test_utils import MockQuerySet
-from datahub.search.bulk_sync import sync_app, sync_objects
+from datahub.search.bulk_sync import get_pk_partitions, sync_app, sync_objects
 from datahub.search.company import CompanySearchApp
 from datahub.search.signals import disable_search_signal_receivers
+from datahub.search.test.search_support.models import SimpleModel
+from datahub.search.test.search_support.simplemodel import SimpleModelSearchApp
 from datahub.search.test.utils import create_mock_search_app
 
 
@@ -64,6 +66,47 @@ def test_sync_app_logic(monkeypatch):
     assert bulk_mock.call_count == 1
 
 
+@pytest.mark.parametrize('concurrency', (1, 3))
+def test_sync_app_pipelined(monkeypatch, concurrency):
+    """Test that sync_app() sends all batches when bulk requests are sent by a thread pool."""
+    bulk_mock = Mock()
+    monkeypatch.setattr('datahub.search.bulk_sync.bulk', bulk_mock)
+    post_batch_callback_mock = Mock()
+
+    search_app = create_mock_search_app(
+        queryset=MockQuerySet([Mock(id=1), Mock(id=2), Mock(id=3)]),
+    )
+    num_objects_synced = sync_app(
+        search_app,
+        batch_size=1,
+        post_batch_callback=post_batch_callback_mock,
+        concurrency=concurrency,
+    )
+
+    assert num_objects_synced == 3
+    assert bulk_mock.call_count == 3
+    assert post_batch_callback_mock.call_count == 3
+    synced_ids = {
+        action['_id']
+        for call in bulk_mock.call_args_list
+        for action in call[1]['actions']
+    }
+    assert synced_ids == {1, 2, 3}
+
+
+def test_sync_app_pipelined_reraises_errors(monkeypatch):
+    """Test that errors in bulk request threads are re-raised by sync_app()."""
+    bulk_mock = Mock(side_effect=ValueError('bulk error'))
+    monkeypatch.setattr('datahub.search.bulk_sync.bulk', bulk_mock)
+
+    search_app = create_mock_search_app(
+        queryset=MockQuerySet([Mock(id=1), Mock(id=2), Mock(id=3)]),
+    )
+
+    with pytest.raises(ValueError, match='bulk error'):
+        sync_app(search_app, batch_size=1, concurrency=2)
+
+
 @pytest.mark.django_db
 @disable_search_signal_receivers(Company)
 def test_sync_app_uses_latest_data(monkeypatch, es):
@@ -93,3 +136,56 @@ def test_sync_app_uses_latest_data(monkeypatch, es):
         id=company.pk,
     )
     assert fetched_company['_source']['name'] == 'new name'
+
+
+@pytest.mark.parametrize(
+    'num_objects,num_partitions,expected_num_partitions',
+    (
+        (0, 3, 1),
+        (2, 3, 1),
+        (10, 1, 1),
+        (10, 3, 3),
+        (10, 5, 5),
+    ),
+)
+@pytest.mark.django_db
+def test_get_pk_partitions(num_objects, num_partitions, expected_num_partitions):
+    """
+    Test that get_pk_partitions() returns contiguous primary key ranges that cover all
+    objects.
+    """
+    SimpleModel.objects.bulk_create(SimpleModel() for _ in range(num_objects))
+
+    partitions = get_pk_partitions(SimpleModelSearchApp, num_partitions)
+
+    assert len(partitions) == expected_num_partitions
+    assert partitions[0][0] is None
+    assert partitions[-1][1] is None
+    for (_, end_pk), (next_start_pk, _) in zip(partitions, partitions[1:]):
+        assert end_pk == next_start_pk
+
+
+@pytest.mark.django_db
+def test_get_pk_partitions_boundaries():
+    """Test that get_pk_partitions() splits objects into partitions of (roughly) equal size."""
+    SimpleModel.objects.bulk_create(SimpleModel() for _ in range(10))
+    pks = [str(pk) for pk in SimpleModel.objects.order_by('pk').values_list('pk', flat=True)]
+
+    partitions = get_pk_partitions(SimpleModelSearchApp, 3)
+
+    assert partitions == [(None, pks[4]), (pks[4], pks[8]), (pks[8], None)]
+
+
+@pytest.mark.django_db
+def test_sync_app_with_pk_range(monkeypatch, es):
+    """Test that sync_app() only syncs objects in the specified primary key range."""
+    bulk_mock = Mock()
+    monkeypatch.setattr('datahub.search.bulk_sync.bulk', bulk_mock)
+    SimpleModel.objects.bulk_create(SimpleModel() for _ in range(4))
+    pks = sorted(obj.pk for obj in SimpleModel.objects.all())
+
+    num_objects_synced = sync_app(SimpleModelSearchApp, pk_range=(str(pks[1]), str(pks[3])))
+
+    assert num_objects_synced == 2
+    synced_ids = {action['_id'] for action in bulk_mock.call_args_list[0][1]['actions']}
+    assert synced_ids == {pks[1], pks[2]}
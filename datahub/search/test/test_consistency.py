@@ -0,0 +1,122 @@
+from datetime import timedelta
+
+import pytest
+from django.utils.timezone import now
+
+from datahub.search.bulk_sync import sync_objects
+from datahub.search.consistency import check_consistency, ConsistencyCheckResult
+from datahub.search.test.search_support.models import SimpleModel
+from datahub.search.test.search_support.simplemodel import SimpleModelSearchApp
+from datahub.search.test.utils import doc_exists
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def inconsistent_objects(es):
+    """
+    Creates objects where one is consistent, one is missing, one is stale and one has been
+    deleted from the database (so its document is orphaned).
+    """
+    objs = [SimpleModel.objects.create(name=f'name {index}') for index in range(3)]
+    es_model = SimpleModelSearchApp.es_model
+    read_indices, write_index = es_model.get_read_and_write_indices()
+    sync_objects(es_model, objs, read_indices, write_index)
+    es.indices.refresh()
+
+    consistent_obj, stale_obj, orphaned_obj = objs
+    missing_obj = SimpleModel.objects.create(name='missing')
+
+    # Using update() so that signal receivers don't resync the object
+    SimpleModel.objects.filter(pk=stale_obj.pk).update(
+        name='updated',
+        modified_on=now() + timedelta(minutes=1),
+    )
+    orphaned_obj_pk = orphaned_obj.pk
+    orphaned_obj.delete()
+
+    return consistent_obj.pk, missing_obj.pk, stale_obj.pk, orphaned_obj_pk
+
+
+@pytest.mark.parametrize('batch_size', (1, 2, 100))
+def test_check_consistency_without_repair(es, inconsistent_objects, batch_size):
+    """Test that inconsistencies are reported but not repaired if repair is False."""
+    _, missing_pk, _, orphaned_pk = inconsistent_objects
+
+    result = check_consistency(SimpleModelSearchApp, batch_size=batch_size)
+
+    assert result == ConsistencyCheckResult(
+        num_objects_checked=3,
+        num_missing=1,
+        num_stale=1,
+        num_orphaned=1,
+    )
+    assert not result.is_consistent
+
+    es.indices.refresh()
+    assert not doc_exists(es, SimpleModelSearchApp, missing_pk)
+    assert doc_exists(es, SimpleModelSearchApp, orphaned_pk)
+
+
+def test_check_consistency_with_repair(es, inconsistent_objects):
+    """Test that inconsistencies are repaired if repair is True."""
+    consistent_pk, missing_pk, stale_pk, orphaned_pk = inconsistent_objects
+
+    check_consistency(SimpleModelSearchApp, repair=True)
+    es.indices.refresh()
+
+    assert doc_exists(es, SimpleModelSearchApp, consistent_pk)
+    assert doc_exists(es, SimpleModelSearchApp, missing_pk)
+    assert not doc_exists(es, SimpleModelSearchApp, orphaned_pk)
+
+    stale_doc = es.get(
+        index=SimpleModelSearchApp.es_model.get_read_alias(),
+        doc_type=SimpleModelSearchApp.name,
+        id=stale_pk,
+    )
+    assert stale_doc['_source']['name'] == 'updated'
+
+    result = check_consistency(SimpleModelSearchApp)
+    assert result == ConsistencyCheckResult(num_objects_checked=3)
+    assert result.is_consistent
+
+
+def test_check_consistency_detects_changes_without_modified_on(es):
+    """
+    Test that a document is reported as stale if the content of the object has changed but
+    modified_on hasn't (as happens when embedded related objects change).
+    """
+    obj = SimpleModel.objects.create(name='name')
+    es_model = SimpleModelSearchApp.es_model
+    read_indices, write_index = es_model.get_read_and_write_indices()
+    sync_objects(es_model, [obj], read_indices, write_index)
+    es.indices.refresh()
+
+    SimpleModel.objects.filter(pk=obj.pk).update(name='updated')
+
+    result = check_consistency(SimpleModelSearchApp)
+    assert result == ConsistencyCheckResult(num_objects_checked=1, num_stale=1)
+
+
+def test_check_consistency_ignores_partially_updated_documents(es):
+    """
+    Test that a document that was partially updated (so its _version_hash is out of date) is
+    not reported as stale if its content matches the object.
+    """
+    obj = SimpleModel.objects.create(name='name')
+    es_model = SimpleModelSearchApp.es_model
+    read_indices, write_index = es_model.get_read_and_write_indices()
+    sync_objects(es_model, [obj], read_indices, write_index)
+
+    SimpleModel.objects.filter(pk=obj.pk).update(name='updated')
+    es.update(
+        index=write_index,
+        doc_type=SimpleModelSearchApp.name,
+        id=obj.pk,
+        body={'doc': {'name': 'updated'}},
+    )
+    es.indices.refresh()
+
+    result = check_consistency(SimpleModelSearchApp)
+    assert result == ConsistencyCheckResult(num_objects_checked=1)
+    assert result.is_consistent
@@ -8,14 +8,20 @@ from datahub.core.exceptions import DataHubException
 from datahub.search.deletion import (
     BULK_CHUNK_SIZE,
     BULK_DELETION_TIMEOUT_SECS,
+    BulkDeletionResult,
     Collector,
+    delete_document_async,
     delete_documents,
+    delete_documents_async,
+    delete_pending_documents,
     update_es_after_deletions,
 )
+from datahub.search.models import PendingSearchDeletion
 from datahub.search.sync_object import sync_object
 from datahub.search.test.search_support.models import SimpleModel
 from datahub.search.test.search_support.simplemodel import SimpleModelSearchApp
 from datahub.search.test.search_support.simplemodel.models import ESSimpleModel
+from datahub.search.test.utils import doc_exists
 
 
 @mock.patch('datahub.search.elasticsearch.es_bulk')
@@ -156,3 +162,95 @@ def test_update_es_after_deletions(es_with_signals):
 
     es_with_signals.indices.refresh()
     assert es_with_signals.count(read_alias, doc_type=SimpleModelSearchApp.name)['count'] == 0
+
+
+@pytest.mark.django_db
+def test_delete_document_async_deletes_using_celery(es):
+    """Test that a document can be deleted from Elasticsearch using Celery."""
+    obj = SimpleModel.objects.create()
+    sync_object(SimpleModelSearchApp, str(obj.pk))
+    es.indices.refresh()
+    assert doc_exists(es, SimpleModelSearchApp, obj.pk)
+
+    delete_document_async(SimpleModelSearchApp, obj.pk)
+    es.indices.refresh()
+
+    assert not doc_exists(es, SimpleModelSearchApp, obj.pk)
+    assert not PendingSearchDeletion.objects.exists()
+
+
+@pytest.mark.django_db
+def test_delete_documents_async_queues_documents(monkeypatch):
+    """
+    Test that delete_documents_async() adds de-duplicated entries to the pending deletion
+    queue.
+    """
+    delete_pending_documents_task_mock = mock.Mock()
+    monkeypatch.setattr(
+        'datahub.search.tasks.delete_pending_documents_task',
+        delete_pending_documents_task_mock,
+    )
+
+    delete_documents_async(SimpleModelSearchApp, [1, 2, 1])
+
+    queued_document_ids = PendingSearchDeletion.objects.filter(
+        search_app=SimpleModelSearchApp.name,
+    ).values_list('document_id', flat=True)
+    assert sorted(queued_document_ids) == ['1', '2']
+    delete_pending_documents_task_mock.apply_async.assert_called_once_with(
+        args=(SimpleModelSearchApp.name,),
+        countdown=mock.ANY,
+    )
+
+
+@pytest.mark.django_db
+@mock.patch('datahub.search.elasticsearch.es_bulk')
+def test_delete_pending_documents_deletes_from_all_indices(es_bulk, mock_es_client, monkeypatch):
+    """
+    Test that delete_pending_documents() deletes queued documents from the write index and any
+    other indices referenced by the read alias, in batches, and returns totals for the
+    deleted and not found documents.
+    """
+    es_bulk.side_effect = [
+        (3, [{'delete': {'status': 404}}]),
+        (1, [{'delete': {'status': 404}}]),
+    ]
+    monkeypatch.setattr(
+        ESSimpleModel,
+        'get_cached_read_and_write_indices',
+        mock.Mock(return_value=({'index1', 'index2'}, 'index2')),
+    )
+    PendingSearchDeletion.objects.bulk_create(
+        PendingSearchDeletion(search_app=SimpleModelSearchApp.name, document_id=document_id)
+        for document_id in ('1', '2', '3')
+    )
+
+    result = delete_pending_documents(SimpleModelSearchApp, batch_size=2)
+
+    assert result == BulkDeletionResult(num_deleted=4, num_not_found=2)
+    assert es_bulk.call_count == 2
+
+    deleted_documents = {
+        (action['_index'], action['_id'])
+        for call in es_bulk.call_args_list
+        for action in call[1]['actions']
+    }
+    assert deleted_documents == {
+        (index, document_id)
+        for index in ('index1', 'index2')
+        for document_id in ('1', '2', '3')
+    }
+    assert not PendingSearchDeletion.objects.exists()
+
+
+@pytest.mark.django_db
+@mock.patch('datahub.search.elasticsearch.es_bulk')
+def test_delete_pending_documents_keeps_failed_entries(es_bulk, mock_es_client):
+    """Test that queue entries are kept if there is an error deleting their documents."""
+    es_bulk.return_value = (0, [{'delete': {'status': 500}}])
+    PendingSearchDeletion.objects.create(search_app=SimpleModelSearchApp.name, document_id='1')
+
+    with pytest.raises(DataHubException):
+        delete_pending_documents(SimpleModelSearchApp)
+
+    assert PendingSearchDeletion.objects.count() == 1
@@ -2,6 +2,7 @@ from unittest import mock
 
 import pytest
 from django.conf import settings
+from django.core.cache import cache
 from elasticsearch_dsl import Keyword, Mapping
 
 from datahub.search import elasticsearch
@@ -174,6 +175,88 @@ def test_get_indices_for_aliases(mock_es_client, aliases, response, result):
     assert elasticsearch.get_indices_for_aliases(*aliases) == result
 
 
+@pytest.mark.usefixtures('local_memory_cache')
+class TestGetCachedIndicesForAliases:
+    """Tests for get_cached_indices_for_aliases() and invalidate_alias_cache()."""
+
+    @pytest.fixture(autouse=True)
+    def _enable_alias_cache(self, settings):
+        settings.ES_ALIAS_CACHE_TIMEOUT = 60
+        elasticsearch._alias_resolution_cache.clear()
+        yield
+        elasticsearch._alias_resolution_cache.clear()
+
+    def test_caches_alias_resolutions(self, mock_es_client):
+        """Test that aliases are only resolved once while the cached value is valid."""
+        client = mock_es_client.return_value
+        client.indices.get_alias.return_value = {
+            'index1': {'aliases': {'alias1': {}}},
+        }
+
+        assert elasticsearch.get_cached_indices_for_aliases('alias1') == [{'index1'}]
+        assert elasticsearch.get_cached_indices_for_aliases('alias1') == [{'index1'}]
+        client.indices.get_alias.assert_called_once()
+
+    def test_does_not_cache_if_disabled(self, mock_es_client, settings):
+        """Test that aliases are always resolved if ES_ALIAS_CACHE_TIMEOUT is 0."""
+        settings.ES_ALIAS_CACHE_TIMEOUT = 0
+        client = mock_es_client.return_value
+        client.indices.get_alias.return_value = {
+            'index1': {'aliases': {'alias1': {}}},
+        }
+
+        elasticsearch.get_cached_indices_for_aliases('alias1')
+        elasticsearch.get_cached_indices_for_aliases('alias1')
+        assert client.indices.get_alias.call_count == 2
+
+    def test_refetches_after_expiry(self, mock_es_client, monkeypatch):
+        """Test that aliases are resolved again once the cached value has expired."""
+        client = mock_es_client.return_value
+        client.indices.get_alias.return_value = {
+            'index1': {'aliases': {'alias1': {}}},
+        }
+        monotonic_mock = mock.Mock(return_value=1000)
+        monkeypatch.setattr('datahub.search.elasticsearch.monotonic', monotonic_mock)
+
+        elasticsearch.get_cached_indices_for_aliases('alias1')
+        monotonic_mock.return_value = 1061
+        elasticsearch.get_cached_indices_for_aliases('alias1')
+
+        assert client.indices.get_alias.call_count == 2
+
+    def test_refetches_after_version_change(self, mock_es_client):
+        """
+        Test that aliases are resolved again when the version stamp is changed by another
+        process.
+        """
+        client = mock_es_client.return_value
+        client.indices.get_alias.return_value = {
+            'index1': {'aliases': {'alias1': {}}},
+        }
+
+        elasticsearch.get_cached_indices_for_aliases('alias1')
+        # Simulate another process updating the version stamp
+        cache.set(elasticsearch.ALIAS_VERSION_CACHE_KEY, 'another-version')
+        elasticsearch.get_cached_indices_for_aliases('alias1')
+
+        assert client.indices.get_alias.call_count == 2
+
+    def test_alias_transaction_invalidates_cache(self, mock_es_client):
+        """Test that committing alias changes invalidates cached alias resolutions."""
+        client = mock_es_client.return_value
+        client.indices.get_alias.return_value = {
+            'index1': {'aliases': {'alias1': {}}},
+        }
+
+        elasticsearch.get_cached_indices_for_aliases('alias1')
+        with elasticsearch.start_alias_transaction() as alias_transaction:
+            alias_transaction.associate_indices_with_alias('alias1', ['index2'])
+        elasticsearch.get_cached_indices_for_aliases('alias1')
+
+        assert client.indices.get_alias.call_count == 2
+        assert cache.get(elasticsearch.ALIAS_VERSION_CACHE_KEY)
+
+
 def test_get_aliases_for_index(mock_es_client):
     """Test get_aliases_for_index()."""
     index = 'test-index'
@@ -1,6 +1,20 @@
 from unittest import mock
 
-from datahub.search.execute_query import execute_autocomplete_query
+import pytest
+from elasticsearch_dsl import Search
+
+from datahub.search.execute_query import (
+    _execute_search_query,
+    execute_autocomplete_query,
+    execute_search_query,
+    invalidate_search_app_results,
+    SEARCH_RESULT_REINVALIDATION_DELAY_SECS,
+    SEARCH_RESULT_REINVALIDATION_WINDOW_SECS,
+)
+from datahub.search.instrumentation import SearchQueryLabels
+from datahub.search.sync_object import sync_object
+from datahub.search.tasks import change_search_app_result_generation_task
+from datahub.search.test.search_support.models import SimpleModel
 from datahub.search.test.search_support.simplemodel.apps import SimpleModelSearchApp
 
 
@@ -23,3 +37,159 @@ class TestExecuteQueryBuilder:
             )
         assert result == fake_result
         assert mock_es_execute.called
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('local_memory_cache')
+class TestSearchResultCache:
+    """Tests for caching of search results in execute_search_query()."""
+
+    @pytest.fixture(autouse=True)
+    def enable_result_cache(self, settings):
+        """Enables the search result cache."""
+        settings.SEARCH_RESULT_CACHE_TIMEOUT = 60
+
+    @pytest.fixture
+    def mock_execute(self):
+        """Spies on the execution of queries against Elasticsearch."""
+        with mock.patch(
+            'datahub.search.execute_query._execute_search_query',
+            wraps=_execute_search_query,
+        ) as mock_execute:
+            yield mock_execute
+
+    @staticmethod
+    def _get_query(name):
+        return Search(index=SimpleModelSearchApp.es_model.get_read_alias()).filter(
+            'term',
+            **{'name.keyword': name},
+        )
+
+    def test_caches_results(self, es, mock_execute):
+        """Test that the results of an identical query are returned from the cache."""
+        _create_and_sync_simple_model(es, 'cached')
+
+        first_response = execute_search_query(
+            self._get_query('cached'),
+            search_apps=[SimpleModelSearchApp],
+        )
+        second_response = execute_search_query(
+            self._get_query('cached'),
+            search_apps=[SimpleModelSearchApp],
+        )
+
+        assert mock_execute.call_count == 1
+        assert second_response.hits.total == first_response.hits.total == 1
+        assert second_response.hits[0].name == 'cached'
+
+    def test_does_not_cache_different_queries(self, es, mock_execute):
+        """Test that queries with different bodies are cached separately."""
+        _create_and_sync_simple_model(es, 'first')
+
+        execute_search_query(self._get_query('first'), search_apps=[SimpleModelSearchApp])
+        response = execute_search_query(
+            self._get_query('second'),
+            search_apps=[SimpleModelSearchApp],
+        )
+
+        assert mock_execute.call_count == 2
+        assert response.hits.total == 0
+
+    def test_sync_invalidates_cached_results(self, es, mock_execute):
+        """Test that syncing objects discards cached results for the search app."""
+        execute_search_query(self._get_query('new'), search_apps=[SimpleModelSearchApp])
+        _create_and_sync_simple_model(es, 'new')
+
+        response = execute_search_query(
+            self._get_query('new'),
+            search_apps=[SimpleModelSearchApp],
+        )
+
+        assert mock_execute.call_count == 2
+        assert response.hits.total == 1
+
+    def test_invalidates_cached_results_again_after_refresh(self, es, mock_execute):
+        """
+        Test that results cached after objects are synced but before the index is refreshed are
+        discarded by the scheduled task.
+        """
+        with mock.patch(
+            'datahub.search.tasks.change_search_app_result_generation_task.apply_async',
+        ) as mock_apply_async:
+            obj = SimpleModel.objects.create(name='new')
+            sync_object(SimpleModelSearchApp, obj.pk)
+
+        mock_apply_async.assert_called_once_with(
+            args=(SimpleModelSearchApp.name,),
+            countdown=(
+                SEARCH_RESULT_REINVALIDATION_WINDOW_SECS + SEARCH_RESULT_REINVALIDATION_DELAY_SECS
+            ),
+        )
+
+        stale_response = execute_search_query(
+            self._get_query('new'),
+            search_apps=[SimpleModelSearchApp],
+        )
+        es.indices.refresh()
+        change_search_app_result_generation_task(SimpleModelSearchApp.name)
+
+        response = execute_search_query(
+            self._get_query('new'),
+            search_apps=[SimpleModelSearchApp],
+        )
+
+        assert mock_execute.call_count == 2
+        assert stale_response.hits.total == 0
+        assert response.hits.total == 1
+
+    def test_schedules_one_reinvalidation_per_window(self, es, mock_execute):
+        """
+        Test that repeated invalidations discard cached results each time, but only schedule
+        one delayed re-invalidation.
+        """
+        with mock.patch(
+            'datahub.search.tasks.change_search_app_result_generation_task.apply_async',
+        ) as mock_apply_async:
+            for _ in range(2):
+                execute_search_query(self._get_query('test'), search_apps=[SimpleModelSearchApp])
+                invalidate_search_app_results(SimpleModelSearchApp.name)
+
+        assert mock_execute.call_count == 2
+        mock_apply_async.assert_called_once()
+
+    def test_does_not_cache_profiled_responses(self, es, mock_execute, settings):
+        """Test that responses for queries that are profiled are not cached."""
+        settings.SEARCH_QUERY_PROFILE_SAMPLE_RATE = 100
+        labels = SearchQueryLabels(view='test', search_app=SimpleModelSearchApp.name)
+
+        for _ in range(2):
+            execute_search_query(
+                self._get_query('test'),
+                search_apps=[SimpleModelSearchApp],
+                labels=labels,
+            )
+
+        assert mock_execute.call_count == 2
+        assert all(call[1]['profile'] for call in mock_execute.call_args_list)
+
+    def test_does_not_cache_without_search_apps(self, es, mock_execute):
+        """Test that results are not cached if search_apps is not specified."""
+        for _ in range(2):
+            execute_search_query(self._get_query('test'))
+
+        assert mock_execute.call_count == 2
+
+    def test_does_not_cache_if_disabled(self, es, mock_execute, settings):
+        """Test that results are not cached if SEARCH_RESULT_CACHE_TIMEOUT is 0."""
+        settings.SEARCH_RESULT_CACHE_TIMEOUT = 0
+
+        for _ in range(2):
+            execute_search_query(self._get_query('test'), search_apps=[SimpleModelSearchApp])
+
+        assert mock_execute.call_count == 2
+
+
+def _create_and_sync_simple_model(es, name):
+    obj = SimpleModel.objects.create(name=name)
+    sync_object(SimpleModelSearchApp, obj.pk)
+    es.indices.refresh()
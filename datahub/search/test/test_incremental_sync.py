@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+import pytest
+from django.utils.timezone import now
+
+from datahub.search.bulk_sync import sync_objects
+from datahub.search.incremental_sync import delete_orphaned_documents, sync_app_incrementally
+from datahub.search.models import SearchAppSyncWatermark
+from datahub.search.test.search_support.models import SimpleModel
+from datahub.search.test.search_support.simplemodel import SimpleModelSearchApp
+from datahub.search.test.utils import doc_exists
+
+pytestmark = pytest.mark.django_db
+
+
+def test_sync_app_incrementally_without_watermark(es):
+    """Test that a full sync is performed (and a watermark saved) if there's no watermark."""
+    obj = SimpleModel.objects.create()
+    SimpleModel.objects.filter(pk=obj.pk).update(modified_on=now() - timedelta(days=30))
+
+    assert sync_app_incrementally(SimpleModelSearchApp) == 1
+    es.indices.refresh()
+
+    assert doc_exists(es, SimpleModelSearchApp, obj.pk)
+    _, write_index = SimpleModelSearchApp.es_model.get_read_and_write_indices()
+    watermark = SearchAppSyncWatermark.objects.get(search_app=SimpleModelSearchApp.name)
+    assert watermark.index_name == write_index
+
+
+def test_sync_app_incrementally_with_watermark(es):
+    """Test that only objects modified since the watermark are synced."""
+    unchanged_obj = SimpleModel.objects.create()
+    SimpleModel.objects.filter(pk=unchanged_obj.pk).update(
+        modified_on=now() - timedelta(days=30),
+    )
+    changed_obj = SimpleModel.objects.create()
+
+    _, write_index = SimpleModelSearchApp.es_model.get_read_and_write_indices()
+    SearchAppSyncWatermark.objects.create(
+        search_app=SimpleModelSearchApp.name,
+        index_name=write_index,
+        synced_up_to=now() - timedelta(days=1),
+    )
+
+    assert sync_app_incrementally(SimpleModelSearchApp) == 1
+    es.indices.refresh()
+
+    assert doc_exists(es, SimpleModelSearchApp, changed_obj.pk)
+    assert not doc_exists(es, SimpleModelSearchApp, unchanged_obj.pk)
+
+
+def test_sync_app_incrementally_with_watermark_for_different_index(es):
+    """Test that a full sync is performed if the watermark is for a different index."""
+    obj = SimpleModel.objects.create()
+    SimpleModel.objects.filter(pk=obj.pk).update(modified_on=now() - timedelta(days=30))
+    SearchAppSyncWatermark.objects.create(
+        search_app=SimpleModelSearchApp.name,
+        index_name='old-index',
+        synced_up_to=now() - timedelta(days=1),
+    )
+
+    assert sync_app_incrementally(SimpleModelSearchApp) == 1
+
+
+def test_delete_orphaned_documents(es):
+    """Test that documents for objects that no longer exist are deleted."""
+    objs = [SimpleModel.objects.create() for _ in range(3)]
+    es_model = SimpleModelSearchApp.es_model
+    read_indices, write_index = es_model.get_read_and_write_indices()
+    sync_objects(es_model, objs, read_indices, write_index)
+    es.indices.refresh()
+
+    deleted_obj_pk = objs[0].pk
+    objs[0].delete()
+
+    assert delete_orphaned_documents(SimpleModelSearchApp, batch_size=2) == 1
+    es.indices.refresh()
+
+    assert not doc_exists(es, SimpleModelSearchApp, deleted_obj_pk)
+    assert doc_exists(es, SimpleModelSearchApp, objs[1].pk)
+    assert doc_exists(es, SimpleModelSearchApp, objs[2].pk)
@@ -0,0 +1,238 @@
+from unittest import mock
+
+import pytest
+from elasticsearch_dsl import MultiSearch, Search
+from freezegun import freeze_time
+
+from datahub.search.execute_query import execute_multi_search_query, execute_search_query
+from datahub.search.instrumentation import (
+    get_query_shape,
+    LITERAL_PLACEHOLDER,
+    prune_slow_query_log,
+    record_query,
+    record_slow_query,
+    SearchQueryLabels,
+)
+from datahub.search.models import SlowSearchQuery
+
+LABELS = SearchQueryLabels(view='SearchView', search_app='company', sort_field='name.keyword')
+
+
+def _get_query(name):
+    return {
+        'query': {
+            'bool': {
+                'filter': [
+                    {'term': {'name.keyword': name}},
+                    {'terms': {'id': [name, f'{name}-2']}},
+                ],
+            },
+        },
+        'sort': [{'name.keyword': {'order': 'asc', 'missing': '_last'}}],
+        'from': 0,
+        'size': 10,
+    }
+
+
+def _mock_response(took, profile=None):
+    response_dict = {'took': took}
+    if profile:
+        response_dict['profile'] = profile
+    return mock.Mock(took=took, to_dict=mock.Mock(return_value=response_dict))
+
+
+class TestGetQueryShape:
+    """Tests for get_query_shape()."""
+
+    def test_replaces_literals(self):
+        """Test that literal values are replaced, and structural values are kept."""
+        assert get_query_shape(_get_query('test')) == {
+            'query': {
+                'bool': {
+                    'filter': [
+                        {'term': {'name.keyword': LITERAL_PLACEHOLDER}},
+                        {'terms': {'id': [LITERAL_PLACEHOLDER]}},
+                    ],
+                },
+            },
+            'sort': [{'name.keyword': {'order': 'asc', 'missing': '_last'}}],
+            'from': LITERAL_PLACEHOLDER,
+            'size': LITERAL_PLACEHOLDER,
+        }
+
+    def test_keeps_field_names_in_lists(self):
+        """Test that field names specified in lists are kept."""
+        query = {'multi_match': {'query': 'test', 'fields': ['name', 'name.trigram']}}
+        assert get_query_shape(query) == {
+            'multi_match': {'query': LITERAL_PLACEHOLDER, 'fields': ['name', 'name.trigram']},
+        }
+
+    def test_queries_with_different_values_have_the_same_shape(self):
+        """Test that queries that only differ by literal values have the same shape."""
+        assert get_query_shape(_get_query('one')) == get_query_shape(_get_query('two'))
+
+
+@pytest.mark.django_db
+class TestRecordSlowQuery:
+    """Tests for record_slow_query()."""
+
+    def test_creates_entry(self):
+        """Test that an entry is created for a query shape that has not been seen before."""
+        with freeze_time('2020-01-01 10:00'):
+            record_slow_query(_get_query('test'), 1500, LABELS, profile={'shards': []})
+
+        entry = SlowSearchQuery.objects.get()
+        assert entry.shape == get_query_shape(_get_query('test'))
+        assert entry.view == LABELS.view
+        assert entry.search_app == LABELS.search_app
+        assert entry.sort_field == LABELS.sort_field
+        assert entry.max_took == 1500
+        assert entry.last_took == 1500
+        assert entry.num_occurrences == 1
+        assert entry.profile == {'shards': []}
+        assert entry.last_seen_on.isoformat() == '2020-01-01T10:00:00+00:00'
+
+    def test_updates_existing_entry(self):
+        """Test that queries with the same shape update the same entry."""
+        record_slow_query(_get_query('one'), 2000, LABELS, profile={'shards': []})
+
+        with freeze_time('2020-01-02 10:00'):
+            record_slow_query(_get_query('two'), 1500, LABELS)
+
+        entry = SlowSearchQuery.objects.get()
+        assert entry.max_took == 2000
+        assert entry.last_took == 1500
+        assert entry.num_occurrences == 2
+        # The previous profile should be kept if the query was not profiled
+        assert entry.profile == {'shards': []}
+        assert entry.last_seen_on.isoformat() == '2020-01-02T10:00:00+00:00'
+
+    def test_different_views_have_different_entries(self):
+        """Test that the same query shape from different views is recorded separately."""
+        record_slow_query(_get_query('test'), 1500, LABELS)
+        record_slow_query(_get_query('test'), 1500, LABELS._replace(view='OtherView'))
+
+        assert SlowSearchQuery.objects.count() == 2
+
+
+@pytest.mark.django_db
+class TestPruneSlowQueryLog:
+    """Tests for prune_slow_query_log()."""
+
+    def test_only_keeps_slowest_entries(self, settings):
+        """Test that only the SEARCH_SLOW_QUERY_LOG_SIZE slowest entries are kept."""
+        settings.SEARCH_SLOW_QUERY_LOG_SIZE = 2
+
+        for took, size in ((3000, 1), (1000, 2), (2000, 3)):
+            query = {'query': {'match_all': {}}, 'size': size, f'key{size}': 'value'}
+            record_slow_query(query, took, LABELS)
+
+        assert prune_slow_query_log() == 1
+        assert sorted(SlowSearchQuery.objects.values_list('max_took', flat=True)) == [2000, 3000]
+
+
+@pytest.mark.django_db
+class TestRecordQuery:
+    """Tests for record_query()."""
+
+    @pytest.fixture(autouse=True)
+    def enable_slow_query_log(self, settings):
+        """Enables the slow query log."""
+        settings.SEARCH_SLOW_QUERY_LOG_SIZE = 10
+        settings.SEARCH_SLOW_QUERY_LOG_THRESHOLD = 1000
+
+    @mock.patch('datahub.search.instrumentation.statsd')
+    def test_sends_timings(self, mock_statsd):
+        """Test that query timings are sent to statsd."""
+        record_query(_get_query('test'), _mock_response(50), LABELS)
+
+        assert mock_statsd.timing.call_args_list == [
+            mock.call('search.query.view.SearchView', 50),
+            mock.call('search.query.app.company', 50),
+            mock.call('search.query.sort.company.name_keyword', 50),
+        ]
+
+    @pytest.mark.parametrize(
+        'took,log_size,should_record',
+        (
+            (999, 10, False),
+            (1000, 10, True),
+            (1000, 0, False),
+        ),
+    )
+    def test_records_slow_queries(self, settings, took, log_size, should_record):
+        """Test that only queries over the threshold are added to the slow query log."""
+        settings.SEARCH_SLOW_QUERY_LOG_SIZE = log_size
+        response = _mock_response(took, profile={'shards': []})
+
+        record_query(_get_query('test'), response, LABELS)
+
+        assert SlowSearchQuery.objects.exists() == should_record
+        if should_record:
+            assert SlowSearchQuery.objects.get().profile == {'shards': []}
+
+
+class TestExecuteSearchQueryInstrumentation:
+    """Tests for the instrumentation of queries in execute_search_query()."""
+
+    @pytest.mark.parametrize(
+        'labels,sample_rate,should_profile',
+        (
+            (LABELS, 100, True),
+            (LABELS, 0, False),
+            (None, 100, False),
+        ),
+    )
+    @mock.patch('datahub.search.execute_query.record_query')
+    def test_profiles_sampled_queries(
+        self,
+        mock_record_query,
+        settings,
+        labels,
+        sample_rate,
+        should_profile,
+    ):
+        """Test that queries are profiled according to SEARCH_QUERY_PROFILE_SAMPLE_RATE."""
+        settings.SEARCH_QUERY_PROFILE_SAMPLE_RATE = sample_rate
+        query = Search().filter('term', name='test')
+
+        with mock.patch('elasticsearch_dsl.Search.execute', autospec=True) as mock_execute:
+            mock_execute.return_value = _mock_response(10)
+            execute_search_query(query, labels=labels)
+
+        executed_query = mock_execute.call_args[0][0]
+        assert executed_query.to_dict().get('profile', False) == should_profile
+        # The original query should not be modified
+        assert 'profile' not in query.to_dict()
+
+        if labels:
+            mock_record_query.assert_called_once_with(
+                query.to_dict(),
+                mock_execute.return_value,
+                labels,
+            )
+        else:
+            mock_record_query.assert_not_called()
+
+
+class TestExecuteMultiSearchQueryInstrumentation:
+    """Tests for the instrumentation of searches in execute_multi_search_query()."""
+
+    @pytest.mark.parametrize('labels', (None, [LABELS, LABELS._replace(search_app='contact')]))
+    @mock.patch('datahub.search.execute_query.record_query')
+    def test_records_each_search(self, mock_record_query, labels):
+        """Test that metrics are recorded for each search if labels are specified."""
+        searches = [Search().filter('term', name='one'), Search().filter('term', name='two')]
+        multi_search = MultiSearch().add(searches[0]).add(searches[1])
+        responses = [_mock_response(10), _mock_response(20)]
+
+        with mock.patch('elasticsearch_dsl.MultiSearch.execute', return_value=responses):
+            assert execute_multi_search_query(multi_search, labels=labels) == responses
+
+        if labels:
+            assert mock_record_query.call_args_list == [
+                mock.call(search.to_dict(), response, search_labels)
+                for search, response, search_labels in zip(searches, responses, labels)
+            ]
+        else:
+            mock_record_query.assert_not_called()
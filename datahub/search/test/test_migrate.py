@@ -124,9 +124,44 @@ def test_migrate_app_with_app_needing_migration(monkeypatch, mock_es_client):
 
     migrate_model_task_mock.apply_async.assert_called_once_with(
         args=(mock_app.name, target_hash),
+        kwargs={},
     )
 
 
+@pytest.mark.parametrize('bulk_load_mode', (True, False))
+def test_migrate_app_with_bulk_load_mode(monkeypatch, mock_es_client, settings, bulk_load_mode):
+    """
+    Test that migrate_app() applies bulk load settings to the new index only if
+    ES_MIGRATION_BULK_LOAD_MODE is True.
+    """
+    settings.ES_MIGRATION_BULK_LOAD_MODE = bulk_load_mode
+    monkeypatch.setattr('datahub.search.migrate.complete_model_migration', Mock())
+    monkeypatch.setattr('datahub.search.migrate.create_index', Mock())
+
+    mock_client = mock_es_client.return_value
+    new_index = 'test-index-target-hash'
+    mock_app = create_mock_search_app(
+        current_mapping_hash='current-hash',
+        target_mapping_hash='target-hash',
+        write_index='test-index',
+    )
+
+    migrate_app(mock_app)
+
+    if bulk_load_mode:
+        mock_client.indices.put_settings.assert_called_once_with(
+            index=new_index,
+            body={
+                'index': {
+                    'refresh_interval': '-1',
+                    'number_of_replicas': 0,
+                },
+            },
+        )
+    else:
+        mock_client.indices.put_settings.assert_not_called()
+
+
 def test_migrate_app_with_app_not_needing_migration(monkeypatch, mock_es_client):
     """Test that migrate_app() migrates an app needing migration."""
     migrate_model_task_mock = Mock()
@@ -179,6 +214,7 @@ def test_migrate_app_with_app_in_inconsistent_state(monkeypatch, mock_es_client)
 
     migrate_model_task_mock.apply_async.assert_called_once_with(
         args=(mock_app.name, target_hash),
+        kwargs={},
     )
 
 
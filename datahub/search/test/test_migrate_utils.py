@@ -1,3 +1,4 @@
+from collections import defaultdict
 from unittest.mock import ANY, Mock
 
 import pytest
@@ -5,8 +6,12 @@ import pytest
 from datahub.core.exceptions import DataHubException
 from datahub.core.test_utils import MockQuerySet
 from datahub.search.migrate_utils import (
+    clean_up_after_resync,
     delete_from_secondary_indices_callback,
+    finish_bulk_load,
+    is_bulk_load_in_progress,
     resync_after_migrate,
+    start_bulk_load,
 )
 from datahub.search.test.utils import create_mock_search_app
 
@@ -94,6 +99,11 @@ class TestResyncAfterMigrate:
         assert mock_client.indices.delete.call_count == 1
         mock_client.indices.delete.assert_any_call('index2')
 
+        # The new index should have been refreshed before the aliases were updated
+        mock_client.indices.refresh.assert_called_once_with(index='index1')
+        # The new index wasn't bulk loaded, so its settings should not have been changed
+        mock_client.indices.put_settings.assert_not_called()
+
     def test_resync_with_deletion_error(self, monkeypatch, mock_es_client):
         """
         Test that resync_after_migrate() raises an exception when there is an error deleting
@@ -222,3 +232,137 @@ class TestResyncAfterMigrate:
             mock_app,
             post_batch_callback=delete_from_secondary_indices_callback,
         )
+
+
+class TestBulkLoad:
+    """Tests for start_bulk_load() and finish_bulk_load()."""
+
+    @pytest.fixture
+    def mock_client(self, mock_es_client):
+        """Returns a mock Elasticsearch client that keeps track of the settings of indices."""
+        index_settings = defaultdict(lambda: {'number_of_replicas': '1'})
+
+        def put_settings(index, body):
+            for setting, value in body['index'].items():
+                if value is None:
+                    index_settings[index].pop(setting, None)
+                else:
+                    index_settings[index][setting] = str(value)
+
+        def get_settings(index):
+            return {index: {'settings': {'index': index_settings[index]}}}
+
+        mock_client = mock_es_client.return_value
+        mock_client.indices.put_settings.side_effect = put_settings
+        mock_client.indices.get_settings.side_effect = get_settings
+        return mock_client
+
+    def test_start_bulk_load(self, mock_client):
+        """Test that start_bulk_load() applies the bulk load settings to the index."""
+        start_bulk_load('index1')
+
+        mock_client.indices.put_settings.assert_called_once_with(
+            index='index1',
+            body={
+                'index': {
+                    'refresh_interval': '-1',
+                    'number_of_replicas': 0,
+                },
+            },
+        )
+        assert is_bulk_load_in_progress('index1')
+        assert not is_bulk_load_in_progress('index2')
+
+    @pytest.mark.parametrize('max_num_segments', (0, 1))
+    def test_finish_bulk_load(self, mock_client, settings, max_num_segments):
+        """
+        Test that finish_bulk_load() refreshes the index, restores its normal settings and
+        force merges it if configured to.
+        """
+        settings.ES_INDEX_SETTINGS = {'number_of_replicas': 2}
+        settings.ES_MIGRATION_FORCE_MERGE_MAX_NUM_SEGMENTS = max_num_segments
+
+        start_bulk_load('index1')
+        mock_client.indices.put_settings.reset_mock()
+        finish_bulk_load('index1')
+
+        mock_client.indices.refresh.assert_called_once_with(index='index1')
+        mock_client.indices.put_settings.assert_called_once_with(
+            index='index1',
+            body={
+                'index': {
+                    'refresh_interval': None,
+                    'number_of_replicas': 2,
+                },
+            },
+        )
+        if max_num_segments:
+            mock_client.indices.forcemerge.assert_called_once_with(
+                index='index1',
+                max_num_segments=max_num_segments,
+                request_timeout=ANY,
+            )
+        else:
+            mock_client.indices.forcemerge.assert_not_called()
+
+        assert not is_bulk_load_in_progress('index1')
+
+    def test_is_bulk_load_in_progress_ignores_normal_settings(self, mock_client, settings):
+        """
+        Test that is_bulk_load_in_progress() returns False for an index that has a bulk load
+        setting as one of its normal settings.
+        """
+        settings.ES_INDEX_SETTINGS = {'refresh_interval': -1}
+        mock_client.indices.put_settings(index='index1', body={'index': {'refresh_interval': -1}})
+
+        assert not is_bulk_load_in_progress('index1')
+
+    @pytest.mark.parametrize('bulk_loaded', (False, True))
+    def test_clean_up_only_finishes_bulk_loaded_indices(
+        self,
+        monkeypatch,
+        mock_client,
+        bulk_loaded,
+    ):
+        """
+        Test that clean_up_after_resync() refreshes the write index, and only restores its
+        settings if it was bulk loaded.
+        """
+        monkeypatch.setattr(
+            'datahub.search.migrate_utils.get_aliases_for_index',
+            Mock(return_value=set()),
+        )
+        mock_app = create_mock_search_app(read_indices={'index1', 'index2'}, write_index='index1')
+        if bulk_loaded:
+            start_bulk_load('index1')
+            mock_client.indices.put_settings.reset_mock()
+
+        clean_up_after_resync(mock_app)
+
+        mock_client.indices.refresh.assert_called_once_with(index='index1')
+        assert mock_client.indices.put_settings.called == bulk_loaded
+        assert not is_bulk_load_in_progress('index1')
+
+    def test_does_not_delete_from_secondary_indices_during_bulk_load(
+        self,
+        monkeypatch,
+        mock_client,
+    ):
+        """
+        Test that delete_from_secondary_indices_callback() does not delete documents while the
+        write index is being bulk loaded.
+        """
+        delete_documents_mock = Mock()
+        monkeypatch.setattr(
+            'datahub.search.migrate_utils.delete_documents_from_indices',
+            delete_documents_mock,
+        )
+
+        start_bulk_load('index1')
+        delete_from_secondary_indices_callback({'index1', 'index2'}, 'index1', [Mock()])
+        delete_documents_mock.assert_not_called()
+
+        finish_bulk_load('index1')
+        actions = [Mock()]
+        delete_from_secondary_indices_callback({'index1', 'index2'}, 'index1', actions)
+        delete_documents_mock.assert_called_once_with({'index2'}, actions)
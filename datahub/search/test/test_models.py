@@ -3,9 +3,19 @@ import inspect
 import pytest
 from django.utils.functional import cached_property
 
+from datahub.company.test.factories import CompanyFactory
+from datahub.interaction.test.factories import CompanyInteractionFactory
+from datahub.investment.project.test.factories import InvestmentProjectFactory
+from datahub.search.company import CompanySearchApp
+from datahub.search.interaction import InteractionSearchApp
+from datahub.search.investment import InvestmentSearchApp
 from datahub.search.test.search_support.models import SimpleModel
 from datahub.search.test.search_support.simplemodel.models import ESSimpleModel
-from datahub.search.utils import get_model_field_names
+from datahub.search.utils import (
+    get_document_hash,
+    get_model_field_names,
+    get_model_non_mapped_field_names,
+)
 
 
 class TestBaseESModel:
@@ -21,12 +31,16 @@ class TestBaseESModel:
             include_index=include_index,
             include_source=include_source,
         )
-        source = {
+        content = {
             '_document_type': 'simplemodel',
             'id': obj.pk,
             'name': 'test-name',
             'date': None,
         }
+        source = {
+            **content,
+            '_version_hash': get_document_hash(content),
+        }
 
         expected_doc = {
             '_id': obj.pk,
@@ -38,6 +52,44 @@ class TestBaseESModel:
         assert doc == expected_doc
 
 
+@pytest.mark.parametrize(
+    'search_app,factory',
+    (
+        (CompanySearchApp, CompanyFactory),
+        (InteractionSearchApp, CompanyInteractionFactory),
+        (InvestmentSearchApp, InvestmentProjectFactory),
+    ),
+)
+@pytest.mark.django_db
+def test_db_object_to_dict(search_app, factory):
+    """
+    Test that db_object_to_dict() applies MAPPINGS, COMPUTED_MAPPINGS and non-mapped fields
+    (with COMPUTED_MAPPINGS taking precedence over MAPPINGS).
+    """
+    obj = factory()
+    db_object = search_app.queryset.get(pk=obj.pk)
+    es_model = search_app.es_model
+
+    mapped_values = {
+        field: fn(getattr(db_object, field)) if getattr(db_object, field) is not None else None
+        for field, fn in es_model.MAPPINGS.items()
+    }
+    expected_result = {
+        **mapped_values,
+        **{field: fn(db_object) for field, fn in es_model.COMPUTED_MAPPINGS.items()},
+        **{
+            field: getattr(db_object, field)
+            for field in get_model_non_mapped_field_names(es_model)
+        },
+        '_document_type': search_app.name,
+    }
+
+    result = es_model.db_object_to_dict(db_object)
+    result.pop('_version_hash')
+
+    assert result == expected_result
+
+
 def test_validate_model_fields(search_app):
     """Test that all top-level fields defined in search models are valid."""
     es_model = search_app.es_model
@@ -49,7 +101,12 @@ def test_validate_model_fields(search_app):
     db_model_properties = _get_object_properties(db_model)
     db_model_fields = _get_db_model_fields(db_model)
 
-    valid_fields = computed_fields | db_model_properties | db_model_fields | {'_document_type'}
+    valid_fields = (
+        computed_fields
+        | db_model_properties
+        | db_model_fields
+        | {'_document_type', '_version_hash'}
+    )
     invalid_fields = fields - valid_fields
 
     assert not invalid_fields
@@ -97,6 +154,21 @@ def test_validate_model_search_fields(search_app):
     )
 
 
+def test_validate_model_autocomplete_fields(search_app):
+    """Test that all field paths in AUTOCOMPLETE_FIELDS exist on the ES model."""
+    es_model = search_app.es_model
+    mapping = es_model._doc_type.mapping
+    invalid_fields = {
+        field for field in es_model.AUTOCOMPLETE_FIELDS
+        if not mapping.resolve_field(field)
+    }
+
+    assert not invalid_fields, (
+        f'Invalid autocomplete fields {invalid_fields} detected on {es_model.__name__} '
+        f'search model'
+    )
+
+
 def _get_db_model_fields(db_model):
     return {field.name for field in db_model._meta.get_fields()}
 
@@ -107,3 +179,17 @@ def _get_object_properties(obj):
 
 def _is_property(obj):
     return isinstance(obj, (property, cached_property))
+
+
+def test_validate_model_denormalised_fields(search_app):
+    """
+    Test that DENORMALISED_FIELDS only references foreign keys of the DB model and fields in
+    MAPPINGS or COMPUTED_MAPPINGS.
+    """
+    es_model = search_app.es_model
+    db_model = search_app.queryset.model
+    converted_fields = es_model.MAPPINGS.keys() | es_model.COMPUTED_MAPPINGS.keys()
+
+    for field_name, fields in es_model.DENORMALISED_FIELDS.items():
+        assert db_model._meta.get_field(field_name).many_to_one
+        assert not set(fields) - converted_fields
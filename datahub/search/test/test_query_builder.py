@@ -11,6 +11,7 @@ from datahub.search.query_builder import (
     _build_term_query,
     _split_range_fields,
     build_autocomplete_query,
+    build_prefix_autocomplete_query,
     get_basic_search_query,
     get_search_by_entities_query,
 )
@@ -383,6 +384,61 @@ def test_build_autocomplete_search_query(keyword, size, only_fields, context, ex
     assert query._index == [SimpleModelSearchApp.es_model.get_read_alias()]
 
 
+@pytest.mark.parametrize(
+    'permission_filters,expected_filter',
+    (
+        (None, None),
+        (
+            [('permitted_team_ids', 'team-id')],
+            {
+                'bool': {
+                    'should': [
+                        {'term': {'permitted_team_ids': 'team-id'}},
+                    ],
+                },
+            },
+        ),
+    ),
+)
+def test_build_prefix_autocomplete_query(permission_filters, expected_filter):
+    """Test for building a prefix-based autocomplete query."""
+    with mock.patch.object(
+        SimpleModelSearchApp.es_model,
+        'AUTOCOMPLETE_FIELDS',
+        ('name.autocomplete',),
+    ):
+        query = build_prefix_autocomplete_query(
+            SimpleModelSearchApp.es_model,
+            'hello',
+            5,
+            ['id', 'name'],
+            permission_filters,
+        )
+
+    expected_bool_query = {
+        'must': [
+            {
+                'multi_match': {
+                    'query': 'hello',
+                    'fields': ('name.autocomplete',),
+                    'operator': 'and',
+                },
+            },
+        ],
+    }
+    if expected_filter:
+        expected_bool_query['filter'] = [expected_filter]
+
+    assert query.to_dict() == {
+        '_source': {'includes': ['id', 'name']},
+        'from': 0,
+        'query': {'bool': expected_bool_query},
+        'size': 5,
+        'sort': ['_score', 'id'],
+    }
+    assert query._index == [SimpleModelSearchApp.es_model.get_read_alias()]
+
+
 @pytest.mark.parametrize(
     (
         'term',
@@ -1,7 +1,7 @@
 import pytest
 from rest_framework import serializers
 
-from datahub.search.serializers import SingleOrListField
+from datahub.search.serializers import _SearchCursorField, SingleOrListField
 
 
 class TestSingleOrListField:
@@ -32,3 +32,24 @@ class TestSingleOrListField:
             field.run_validation(['', ''])
 
         assert excinfo.value.get_codes() == {0: ['blank'], 1: ['blank']}
+
+
+class TestSearchCursorField:
+    """Tests _SearchCursorField."""
+
+    def test_round_trip(self):
+        """Test that a serialised cursor deserialises to the original sort values."""
+        field = _SearchCursorField()
+        sort_values = ['2020-01-01T00:00:00+00:00', 'abc']
+
+        cursor = field.to_representation(sort_values)
+        assert field.run_validation(cursor) == sort_values
+
+    @pytest.mark.parametrize('cursor', (1, 'not base64!'))
+    def test_invalid_cursor(self, cursor):
+        """Test that an invalid cursor fails validation."""
+        field = _SearchCursorField()
+        with pytest.raises(serializers.ValidationError) as excinfo:
+            field.run_validation(cursor)
+
+        assert excinfo.value.get_codes() == ['invalid']
@@ -1,10 +1,21 @@
+from unittest.mock import Mock
+
 import pytest
 
-from datahub.search.sync_object import sync_object_async, sync_related_objects_async
+from datahub.search.bulk_sync import sync_objects
+from datahub.search.models import PendingSearchSync
+from datahub.search.sync_object import (
+    sync_object_async,
+    sync_objects_async,
+    sync_pending_objects,
+    sync_related_objects_async,
+    update_denormalised_fields,
+    update_denormalised_fields_async,
+)
 from datahub.search.test.search_support.models import RelatedModel, SimpleModel
 from datahub.search.test.search_support.relatedmodel import RelatedModelSearchApp
 from datahub.search.test.search_support.simplemodel import SimpleModelSearchApp
-from datahub.search.test.utils import doc_exists
+from datahub.search.test.utils import doc_exists, get_documents_by_ids
 
 
 @pytest.mark.django_db
@@ -31,3 +42,104 @@ def test_sync_related_objects_syncs_using_celery(es):
     assert doc_exists(es, RelatedModelSearchApp, relation_1.pk)
     assert doc_exists(es, RelatedModelSearchApp, relation_2.pk)
     assert not doc_exists(es, RelatedModelSearchApp, unrelated_obj.pk)
+
+
+@pytest.mark.django_db
+def test_sync_objects_async_queues_objects(monkeypatch):
+    """Test that sync_objects_async() adds de-duplicated entries to the pending sync queue."""
+    sync_pending_objects_task_mock = Mock()
+    monkeypatch.setattr(
+        'datahub.search.sync_object.sync_pending_objects_task',
+        sync_pending_objects_task_mock,
+    )
+    objs = SimpleModel.objects.bulk_create([SimpleModel(), SimpleModel()])
+    pks = [obj.pk for obj in objs]
+
+    sync_objects_async(SimpleModelSearchApp, [*pks, *pks])
+
+    queued_object_ids = PendingSearchSync.objects.filter(
+        search_app=SimpleModelSearchApp.name,
+    ).values_list('object_id', flat=True)
+    assert sorted(queued_object_ids) == sorted(str(pk) for pk in pks)
+    sync_pending_objects_task_mock.apply_async.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_sync_pending_objects_drains_queue_in_batches(es, monkeypatch):
+    """
+    Test that sync_pending_objects() syncs queued objects in batches, coalesces duplicate
+    entries and empties the queue.
+    """
+    sync_objects_mock = Mock(wraps=sync_objects)
+    monkeypatch.setattr('datahub.search.sync_object.sync_objects', sync_objects_mock)
+
+    objs = [SimpleModel.objects.create() for _ in range(3)]
+    PendingSearchSync.objects.bulk_create(
+        PendingSearchSync(search_app=SimpleModelSearchApp.name, object_id=str(obj.pk))
+        for obj in (*objs, objs[0])
+    )
+
+    num_entries_processed = sync_pending_objects(SimpleModelSearchApp, batch_size=2)
+    es.indices.refresh()
+
+    assert num_entries_processed == 4
+    assert sync_objects_mock.call_count == 2
+    assert not PendingSearchSync.objects.exists()
+    assert all(doc_exists(es, SimpleModelSearchApp, obj.pk) for obj in objs)
+
+
+@pytest.mark.django_db
+def test_sync_pending_objects_skips_deleted_objects(es):
+    """Test that entries for objects that no longer exist are removed from the queue."""
+    PendingSearchSync.objects.create(search_app=SimpleModelSearchApp.name, object_id='123456')
+
+    assert sync_pending_objects(SimpleModelSearchApp) == 1
+    assert not PendingSearchSync.objects.exists()
+
+
+@pytest.mark.django_db
+def test_update_denormalised_fields_updates_related_documents_using_celery(es, monkeypatch):
+    """
+    Test that the denormalised fields of related documents are updated using partial updates
+    (without syncing the related objects).
+    """
+    simpleton = SimpleModel.objects.create(name='old name')
+    relations = [RelatedModel.objects.create(simpleton=simpleton) for _ in range(2)]
+    unrelated_obj = RelatedModel.objects.create(simpleton=SimpleModel.objects.create(name='other'))
+
+    es_model = RelatedModelSearchApp.es_model
+    read_indices, write_index = es_model.get_read_and_write_indices()
+    sync_objects(es_model, RelatedModel.objects.all(), read_indices, write_index)
+
+    sync_objects_mock = Mock()
+    monkeypatch.setattr('datahub.search.sync_object.sync_objects', sync_objects_mock)
+
+    simpleton.name = 'new name'
+    simpleton.save()
+    update_denormalised_fields_async(RelatedModelSearchApp, 'simpleton', simpleton)
+    es.indices.refresh()
+
+    result = get_documents_by_ids(
+        es,
+        RelatedModelSearchApp,
+        [*[obj.pk for obj in relations], unrelated_obj.pk],
+    )
+    names_by_id = {doc['_id']: doc['_source']['simpleton']['name'] for doc in result['docs']}
+
+    assert names_by_id == {
+        **{str(obj.pk): 'new name' for obj in relations},
+        str(unrelated_obj.pk): 'other',
+    }
+    assert not sync_objects_mock.called
+
+
+@pytest.mark.django_db
+def test_update_denormalised_fields_skips_documents_not_indexed(es):
+    """Test that objects that have not been synced yet are skipped."""
+    simpleton = SimpleModel.objects.create(name='name')
+    relation = RelatedModel.objects.create(simpleton=simpleton)
+
+    update_denormalised_fields(RelatedModelSearchApp, 'simpleton', simpleton.pk)
+    es.indices.refresh()
+
+    assert not doc_exists(es, RelatedModelSearchApp, relation.pk)
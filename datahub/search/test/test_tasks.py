@@ -1,14 +1,19 @@
-from unittest.mock import call, MagicMock, Mock
+from unittest.mock import MagicMock, Mock
 from uuid import uuid4
 
 import pytest
 
 from datahub.search.apps import get_search_apps
+from datahub.search.migrate_utils import delete_from_secondary_indices_callback
 from datahub.search.tasks import (
     complete_model_migration,
+    complete_partitioned_model_migration,
     sync_all_models,
+    sync_all_pending_objects,
     sync_model,
+    sync_model_partition,
     sync_object_task,
+    sync_pending_objects_task,
     sync_related_objects_task,
 )
 from datahub.search.test.search_support.models import RelatedModel, SimpleModel
@@ -32,6 +37,66 @@ def test_sync_model(monkeypatch):
     sync_app_mock.assert_called_once_with(get_search_app_mock.return_value)
 
 
+def test_sync_model_with_partitions(monkeypatch):
+    """Test that the sync_model task schedules a chord of partition sub-tasks if requested."""
+    monkeypatch.setattr(
+        'datahub.search.tasks.get_pk_partitions',
+        Mock(return_value=[(None, '5'), ('5', None)]),
+    )
+    sync_app_mock = Mock()
+    monkeypatch.setattr('datahub.search.tasks.sync_app', sync_app_mock)
+    chord_mock = Mock()
+    monkeypatch.setattr('datahub.search.tasks.chord', chord_mock)
+
+    sync_model.apply(args=(SimpleModelSearchApp.name,), kwargs={'num_partitions': 2})
+
+    sync_app_mock.assert_not_called()
+    header = chord_mock.call_args[0][0]
+    assert [signature.args for signature in header] == [
+        (SimpleModelSearchApp.name, None, '5'),
+        (SimpleModelSearchApp.name, '5', None),
+    ]
+    chord_mock.return_value.assert_called_once()
+
+
+@pytest.mark.parametrize('delete_from_secondary_indices', (True, False))
+@pytest.mark.django_db
+def test_sync_model_partition(monkeypatch, delete_from_secondary_indices):
+    """Test that the sync_model_partition task syncs the specified primary key range."""
+    sync_app_mock = Mock(return_value=2)
+    monkeypatch.setattr('datahub.search.tasks.sync_app', sync_app_mock)
+
+    result = sync_model_partition.apply(
+        args=(SimpleModelSearchApp.name, '1', '10'),
+        kwargs={'delete_from_secondary_indices': delete_from_secondary_indices},
+    )
+
+    assert result.get() == 2
+    sync_app_mock.assert_called_once_with(
+        SimpleModelSearchApp,
+        post_batch_callback=(
+            delete_from_secondary_indices_callback if delete_from_secondary_indices else None
+        ),
+        pk_range=('1', '10'),
+    )
+
+
+def test_sync_model_incrementally(monkeypatch):
+    """Test that the sync_model task performs an incremental sync if requested."""
+    sync_app_incrementally_mock = Mock()
+    monkeypatch.setattr(
+        'datahub.search.tasks.sync_app_incrementally',
+        sync_app_incrementally_mock,
+    )
+    sync_app_mock = Mock()
+    monkeypatch.setattr('datahub.search.tasks.sync_app', sync_app_mock)
+
+    sync_model.apply(args=(SimpleModelSearchApp.name,), kwargs={'incremental': True})
+
+    sync_app_incrementally_mock.assert_called_once_with(SimpleModelSearchApp)
+    sync_app_mock.assert_not_called()
+
+
 def test_sync_all_models(monkeypatch):
     """Test that the sync_all_models task starts sub-tasks to sync all models."""
     sync_model_mock = Mock()
@@ -71,9 +136,12 @@ def test_sync_object_task_retries_on_error(monkeypatch, es):
 )
 @pytest.mark.django_db
 def test_sync_related_objects_task_syncs(related_obj_filter, monkeypatch):
-    """Test that related objects are synced to Elasticsearch."""
-    sync_object_task_mock = Mock()
-    monkeypatch.setattr('datahub.search.tasks.sync_object_task', sync_object_task_mock)
+    """Test that related objects are added to the pending sync queue."""
+    sync_objects_async_mock = Mock()
+    monkeypatch.setattr(
+        'datahub.search.sync_object.sync_objects_async',
+        sync_objects_async_mock,
+    )
 
     simpleton = SimpleModel.objects.create(name='hello')
     relation_1 = RelatedModel.objects.create(simpleton=simpleton)
@@ -89,10 +157,39 @@ def test_sync_related_objects_task_syncs(related_obj_filter, monkeypatch):
         ),
     )
 
-    assert sync_object_task_mock.apply_async.call_args_list == [
-        call(args=(RelatedModelSearchApp.name, relation_1.pk), priority=6),
-        call(args=(RelatedModelSearchApp.name, relation_2.pk), priority=6),
-    ]
+    sync_objects_async_mock.assert_called_once()
+    search_app, pks = sync_objects_async_mock.call_args[0]
+    assert search_app is RelatedModelSearchApp
+    assert set(pks) == {relation_1.pk, relation_2.pk}
+
+
+def test_sync_pending_objects_task(monkeypatch):
+    """Test that the sync_pending_objects_task task drains the queue for a search app."""
+    sync_pending_objects_mock = Mock(return_value=0)
+    monkeypatch.setattr(
+        'datahub.search.sync_object.sync_pending_objects',
+        sync_pending_objects_mock,
+    )
+
+    sync_pending_objects_task.apply(args=(SimpleModelSearchApp.name,))
+
+    sync_pending_objects_mock.assert_called_once_with(SimpleModelSearchApp)
+
+
+def test_sync_all_pending_objects(monkeypatch):
+    """Test that the sync_all_pending_objects task starts sub-tasks for all search apps."""
+    sync_pending_objects_task_mock = Mock()
+    monkeypatch.setattr(
+        'datahub.search.tasks.sync_pending_objects_task',
+        sync_pending_objects_task_mock,
+    )
+
+    sync_all_pending_objects.apply()
+    tasks_created = {
+        call[1]['args'][0]
+        for call in sync_pending_objects_task_mock.apply_async.call_args_list
+    }
+    assert tasks_created == {app.name for app in get_search_apps()}
 
 
 @pytest.mark.django_db
@@ -169,3 +266,103 @@ def test_complete_model_migration_with_mapping_hash_mismatch(monkeypatch):
     retry_mock.assert_called_once()
 
     resync_after_migrate_mock.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_complete_model_migration_with_partitions(monkeypatch):
+    """
+    Test that the complete_model_migration task schedules a partitioned resync (instead of
+    calling resync_after_migrate()) if requested.
+    """
+    resync_after_migrate_mock = Mock()
+    monkeypatch.setattr('datahub.search.tasks.resync_after_migrate', resync_after_migrate_mock)
+    monkeypatch.setattr(
+        'datahub.search.tasks.get_pk_partitions',
+        Mock(return_value=[(None, '5'), ('5', None)]),
+    )
+    chord_mock = Mock()
+    monkeypatch.setattr('datahub.search.tasks.chord', chord_mock)
+    mock_app = create_mock_search_app(
+        current_mapping_hash='current-hash',
+        target_mapping_hash='target-hash',
+        read_indices=('current-index', 'target-index'),
+        write_index='target-index',
+    )
+    monkeypatch.setattr('datahub.search.tasks.get_search_app', Mock(return_value=mock_app))
+
+    complete_model_migration.apply(
+        args=('test-app', 'target-hash'),
+        kwargs={'num_partitions': 2},
+    )
+
+    resync_after_migrate_mock.assert_not_called()
+    header = chord_mock.call_args[0][0]
+    assert len(header) == 2
+    assert all(signature.kwargs == {'delete_from_secondary_indices': True} for signature in header)
+    callback = chord_mock.return_value.call_args[0][0]
+    assert callback.task == complete_partitioned_model_migration.name
+
+
+@pytest.mark.django_db
+def test_complete_partitioned_model_migration(monkeypatch):
+    """Test that complete_partitioned_model_migration calls clean_up_after_resync()."""
+    clean_up_after_resync_mock = Mock()
+    monkeypatch.setattr('datahub.search.tasks.clean_up_after_resync', clean_up_after_resync_mock)
+    mock_app = create_mock_search_app()
+    monkeypatch.setattr('datahub.search.tasks.get_search_app', Mock(return_value=mock_app))
+
+    complete_partitioned_model_migration.apply(args=('test-app',))
+
+    clean_up_after_resync_mock.assert_called_once_with(mock_app)
+
+
+@pytest.mark.django_db
+def test_sync_model_partition_retries_if_migration_lock_held(monkeypatch):
+    """
+    Test that a migration partition is retried if another migration task holds the migration
+    lock.
+    """
+    sync_app_mock = Mock()
+    monkeypatch.setattr('datahub.search.tasks.sync_app', sync_app_mock)
+    advisory_lock_mock = MagicMock()
+    advisory_lock_mock.return_value.__enter__.return_value = False
+    monkeypatch.setattr('datahub.search.tasks.advisory_lock', advisory_lock_mock)
+    retry_mock = Mock(side_effect=MockRetryError())
+    monkeypatch.setattr(sync_model_partition, 'retry', retry_mock)
+
+    result = sync_model_partition.apply(
+        args=(SimpleModelSearchApp.name, '1', '10'),
+        kwargs={'delete_from_secondary_indices': True},
+    )
+
+    with pytest.raises(MockRetryError):
+        result.get()
+
+    assert advisory_lock_mock.call_args[1]['shared']
+    sync_app_mock.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_complete_partitioned_model_migration_retries_if_lock_held(monkeypatch):
+    """
+    Test that complete_partitioned_model_migration is retried (rather than aborted) if another
+    migration task holds the migration lock.
+    """
+    clean_up_after_resync_mock = Mock()
+    monkeypatch.setattr('datahub.search.tasks.clean_up_after_resync', clean_up_after_resync_mock)
+    monkeypatch.setattr(
+        'datahub.search.tasks.get_search_app',
+        Mock(return_value=create_mock_search_app()),
+    )
+    advisory_lock_mock = MagicMock()
+    advisory_lock_mock.return_value.__enter__.return_value = False
+    monkeypatch.setattr('datahub.search.tasks.advisory_lock', advisory_lock_mock)
+    retry_mock = Mock(side_effect=MockRetryError())
+    monkeypatch.setattr(complete_partitioned_model_migration, 'retry', retry_mock)
+
+    result = complete_partitioned_model_migration.apply(args=('test-app',))
+
+    with pytest.raises(MockRetryError):
+        result.get()
+
+    clean_up_after_resync_mock.assert_not_called()
@@ -1,8 +1,16 @@
 from collections import Counter
+from datetime import datetime
+from uuid import uuid4
 
 import pytest
+from django.utils.timezone import utc
 
-from datahub.search.utils import get_unique_values_and_exclude_nulls_from_list
+from datahub.search.utils import (
+    decode_search_cursor,
+    encode_search_cursor,
+    get_document_hash,
+    get_unique_values_and_exclude_nulls_from_list,
+)
 
 
 @pytest.mark.parametrize(
@@ -25,3 +33,55 @@ from datahub.search.utils import get_unique_values_and_exclude_nulls_from_list
 def test_get_unique_values_and_exclude_nulls_from_list(data, expected_result):
     """Test given a list of values filter unique and remove null values."""
     assert Counter(get_unique_values_and_exclude_nulls_from_list(data)) == Counter(expected_result)
+
+
+@pytest.mark.parametrize(
+    'sort_values',
+    (
+        [1.5, 'abc'],
+        [None, '5b8c8c2e-6f2e-4d36-9a49-2c4f1fd1e1a1'],
+        [-9223372036854775808, 'x'],
+    ),
+)
+def test_search_cursor_round_trip(sort_values):
+    """Test that sort values survive being encoded as a cursor and decoded."""
+    assert decode_search_cursor(encode_search_cursor(sort_values)) == sort_values
+
+
+@pytest.mark.parametrize(
+    'cursor',
+    (
+        'not base64!',
+        'e30=',  # {}
+        'W10=',  # []
+        '',
+    ),
+)
+def test_decode_search_cursor_with_invalid_cursor(cursor):
+    """Test that decode_search_cursor() raises ValueError for invalid cursors."""
+    with pytest.raises(ValueError):
+        decode_search_cursor(cursor)
+
+
+def test_get_document_hash_ignores_list_order():
+    """Test that the order of items in lists doesn't affect the hash of a document."""
+    document = {'id': 1, 'contacts': [{'id': 'a', 'name': 'A'}, {'id': 'b', 'name': 'B'}]}
+    reordered_document = {
+        'contacts': [{'name': 'B', 'id': 'b'}, {'name': 'A', 'id': 'a'}],
+        'id': 1,
+    }
+
+    assert get_document_hash(document) == get_document_hash(reordered_document)
+    assert get_document_hash(document) != get_document_hash({**document, 'id': 2})
+
+
+def test_get_document_hash_matches_serialised_document():
+    """
+    Test that a document and its serialised form (as would be returned by Elasticsearch)
+    have the same hash.
+    """
+    created_on = datetime(2020, 1, 1, 12, 30, tzinfo=utc)
+    document = {'id': uuid4(), 'created_on': created_on}
+    serialised_document = {'id': str(document['id']), 'created_on': created_on.isoformat()}
+
+    assert get_document_hash(document) == get_document_hash(serialised_document)
@@ -1,4 +1,6 @@
 import datetime
+from csv import DictReader
+from io import StringIO
 
 import pytest
 from django.utils.timezone import utc
@@ -9,10 +11,12 @@ from rest_framework.reverse import reverse
 from datahub.company.test.factories import CompanyFactory, ContactFactory
 from datahub.core.test_utils import APITestMixin, create_test_user
 from datahub.event.test.factories import EventFactory
+from datahub.feature_flag.test.factories import FeatureFlagFactory
 from datahub.interaction.test.factories import CompanyInteractionFactory
 from datahub.investment.project.test.factories import InvestmentProjectFactory
 from datahub.metadata.test.factories import TeamFactory
 from datahub.omis.order.test.factories import OrderFactory
+from datahub.search.constants import BASIC_SEARCH_MULTI_SEARCH_FEATURE_FLAG
 from datahub.search.sync_object import sync_object
 from datahub.search.test.search_support.models import RelatedModel, SimpleModel
 from datahub.search.test.search_support.simplemodel import SimpleModelSearchApp
@@ -97,24 +101,17 @@ class TestValidateViewSortByAttributes:
         assert not invalid_fields
 
 
-class TestValidateExportViewAttributes:
-    """Validates the field names specified in class attributes on export views."""
-
-    def test_validate_db_sort_by_remappings_keys(self, search_view):
-        """Validate that the keys of db_sort_by_remappings are valid sort by fields."""
-        if not hasattr(search_view, 'db_sort_by_remappings'):
-            return
-
-        serializer_class = search_view.serializer_class
-        invalid_fields = (
-            search_view.db_sort_by_remappings.keys() - set(serializer_class.SORT_BY_FIELDS)
-        )
-        assert not invalid_fields
-
-
 class TestBasicSearch(APITestMixin):
     """Tests for SearchBasicAPIView."""
 
+    @pytest.fixture(autouse=True, params=(False, True), ids=('single-query', 'multi-search'))
+    def use_multi_search(self, request):
+        """Runs each test with both the single query and multi-search implementations."""
+        if request.param:
+            FeatureFlagFactory(code=BASIC_SEARCH_MULTI_SEARCH_FEATURE_FLAG)
+
+        return request.param
+
     def test_pagination(self, es_with_collector, search_support_user):
         """Tests the pagination."""
         total_records = 9
@@ -424,6 +421,38 @@ class TestBasicSearch(APITestMixin):
         assert len(response_data['aggregations']) == 0
 
 
+class TestBasicSearchImplementations(APITestMixin):
+    """Compares the single query and multi-search implementations of SearchBasicAPIView."""
+
+    @pytest.mark.parametrize('term', ('', 'shared', 'shared company'))
+    def test_implementations_give_the_same_results(self, es_with_collector, term):
+        """Test that both implementations return the same results, counts and aggregations."""
+        companies = CompanyFactory.create_batch(3, name='Shared company')
+        ContactFactory.create_batch(2, company=companies[0], first_name='Shared')
+        CompanyInteractionFactory.create_batch(2, company=companies[1], subject='Shared')
+        InvestmentProjectFactory.create_batch(2, investor_company=companies[2], name='Shared')
+        es_with_collector.flush_and_refresh()
+
+        url = reverse('api-v3:search:basic')
+        request_data = {'term': term, 'entity': 'company'}
+
+        single_query_response = self.api_client.get(url, data=request_data)
+        FeatureFlagFactory(code=BASIC_SEARCH_MULTI_SEARCH_FEATURE_FLAG)
+        multi_search_response = self.api_client.get(url, data=request_data)
+
+        assert single_query_response.status_code == status.HTTP_200_OK
+        assert multi_search_response.status_code == status.HTTP_200_OK
+
+        single_query_data = single_query_response.json()
+        multi_search_data = multi_search_response.json()
+
+        assert multi_search_data['count'] == single_query_data['count']
+        assert multi_search_data['aggregations'] == single_query_data['aggregations']
+        assert {result['id'] for result in multi_search_data['results']} == {
+            result['id'] for result in single_query_data['results']
+        }
+
+
 class TestEntitySearch(APITestMixin):
     """Tests for `SearchAPIView`."""
 
@@ -485,6 +514,78 @@ class TestEntitySearch(APITestMixin):
             for obj in response_data['results']
         ]
 
+    @pytest.mark.parametrize('sortby', (None, 'name', 'date:desc'))
+    def test_cursor_pagination(self, es_with_collector, search_support_user, sortby):
+        """Tests that all results can be retrieved by following next_cursor."""
+        total_records = 9
+        page_size = 2
+        objects = [
+            SimpleModel.objects.create(
+                name=f'cursor {index % 3}',
+                date=datetime.date(2010, 1, index + 1) if index % 2 else None,
+            )
+            for index in range(total_records)
+        ]
+
+        es_with_collector.flush_and_refresh()
+
+        api_client = self.create_api_client(user=search_support_user)
+        url = reverse('api-v3:search:simplemodel')
+        request_data = {
+            'original_query': '',
+            'limit': page_size,
+            'cursor': None,
+            **({'sortby': sortby} if sortby else {}),
+        }
+
+        offset_response = api_client.post(url, data={**request_data, 'limit': total_records})
+        expected_ids = [
+            result['id'] for result in offset_response.json()['results']
+        ]
+
+        ids = []
+        num_pages = 0
+        while True:
+            response = api_client.post(url, data=request_data)
+            assert response.status_code == status.HTTP_200_OK
+
+            response_data = response.json()
+            assert response_data['count'] == total_records
+            ids.extend(result['id'] for result in response_data['results'])
+            num_pages += 1
+
+            if not response_data['next_cursor']:
+                break
+
+            request_data['cursor'] = response_data['next_cursor']
+
+        assert ids == expected_ids
+        assert set(ids) == {str(obj.pk) for obj in objects}
+        assert num_pages == (total_records + page_size - 1) // page_size
+
+    @pytest.mark.parametrize(
+        'request_data,expected_errors',
+        (
+            (
+                {'cursor': 'invalid'},
+                {'cursor': ['Invalid cursor.']},
+            ),
+            (
+                {'cursor': None, 'offset': 10},
+                {'offset': ['This field cannot be used with cursor.']},
+            ),
+        ),
+    )
+    def test_cursor_validation(self, es, search_support_user, request_data, expected_errors):
+        """Tests that invalid cursors, and cursors combined with offset, are rejected."""
+        api_client = self.create_api_client(user=search_support_user)
+        url = reverse('api-v3:search:simplemodel')
+
+        response = api_client.post(url, data=request_data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == expected_errors
+
 
 class TestSearchExportAPIView(APITestMixin):
     """Tests for SearchExportAPIView."""
@@ -529,3 +630,34 @@ class TestSearchExportAPIView(APITestMixin):
             },
             'num_results': 1,
         }
+
+    @pytest.mark.parametrize('sortby', ('name:asc', 'name:desc'))
+    def test_export_preserves_search_order_across_chunks(
+        self,
+        es_with_collector,
+        settings,
+        sortby,
+    ):
+        """
+        Tests that rows are in search result order when they are fetched from the database in
+        multiple chunks.
+        """
+        settings.SEARCH_EXPORT_DB_CHUNK_SIZE = 2
+        settings.SEARCH_EXPORT_SCROLL_CHUNK_SIZE = 3
+
+        user = create_test_user(permission_codenames=['view_simplemodel'])
+        api_client = self.create_api_client(user=user)
+        objects = [SimpleModel.objects.create(name=f'export {index}') for index in range(7)]
+        es_with_collector.flush_and_refresh()
+        objects[3].delete()
+
+        url = reverse('api-v3:search:simplemodel-export')
+        response = api_client.post(url, data={'sortby': sortby})
+
+        assert response.status_code == status.HTTP_200_OK
+        reader = DictReader(StringIO(response.getvalue().decode('utf-8-sig')))
+        expected_names = sorted(
+            (obj.name for index, obj in enumerate(objects) if index != 3),
+            reverse=sortby.endswith('desc'),
+        )
+        assert [row['Name'] for row in reader] == expected_names
@@ -66,6 +66,7 @@ def _create_mock_es_model(
         get_current_mapping_hash=Mock(return_value=current_mapping_hash),
         get_target_mapping_hash=Mock(return_value=target_mapping_hash),
         get_read_and_write_indices=Mock(return_value=(set(read_indices), write_index)),
+        get_cached_read_and_write_indices=Mock(return_value=(set(read_indices), write_index)),
         get_write_index=Mock(return_value=write_index),
         get_read_alias=Mock(return_value='test-read-alias'),
         get_write_alias=Mock(return_value='test-write-alias'),
@@ -1,6 +1,9 @@
 import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from hashlib import blake2b
 from typing import NamedTuple
 
+from elasticsearch_dsl.serializer import serializer
 
 from datahub.core.utils import StrEnum
 
@@ -40,10 +43,71 @@ def get_model_non_mapped_field_names(es_model):
         get_model_field_names(es_model)
         - es_model.MAPPINGS.keys()
         - es_model.COMPUTED_MAPPINGS.keys()
-        - {'_document_type'}
+        - {'_document_type', '_version_hash'}
     )
 
 
+def get_document_hash(document):
+    """
+    Gets a short hash digest of the content of a document (as a dict, excluding _version_hash).
+
+    This is stored in documents (in the _version_hash field), so that stale documents can be
+    detected without fetching and comparing entire documents.
+
+    The document is first serialised as it would be when sent to Elasticsearch, so the same
+    digest is obtained for a document converted from a DB object and for the _source of the
+    indexed document. Lists are sorted, as the order of related objects is not significant.
+    """
+    normalised_document = _normalise_document_value(json.loads(serializer.dumps(document)))
+    data = json.dumps(
+        normalised_document,
+        ensure_ascii=False,
+        separators=(',', ':'),
+        sort_keys=True,
+    ).encode('utf-8')
+    return blake2b(data, digest_size=8).hexdigest()
+
+
+def _normalise_document_value(value):
+    if isinstance(value, dict):
+        return {key: _normalise_document_value(item) for key, item in value.items()}
+
+    if isinstance(value, list):
+        return sorted(
+            (_normalise_document_value(item) for item in value),
+            key=lambda item: json.dumps(item, sort_keys=True),
+        )
+
+    return value
+
+
+def encode_search_cursor(sort_values):
+    """
+    Encodes the sort values of a search hit as an opaque cursor.
+
+    The cursor can be passed back to get the next page of results (using search_after).
+    """
+    data = json.dumps(sort_values, separators=(',', ':')).encode('utf-8')
+    return urlsafe_b64encode(data).decode('ascii')
+
+
+def decode_search_cursor(cursor):
+    """
+    Decodes a cursor created using encode_search_cursor().
+
+    :raises ValueError: if the cursor is not valid
+    """
+    try:
+        sort_values = json.loads(urlsafe_b64decode(cursor.encode('ascii')))
+    except ValueError as exc:
+        raise ValueError('Invalid cursor') from exc
+
+    if not isinstance(sort_values, list) or not sort_values:
+        raise ValueError('Invalid cursor')
+
+    return sort_values
+
+
 def serialise_mapping(mapping_dict):
     """Serialises a mapping as JSON."""
     return json.dumps(mapping_dict, sort_keys=True, separators=(',', ':')).encode('utf-8')
@@ -14,25 +14,40 @@ from rest_framework.views import APIView
 
 from datahub.core.csv import create_csv_response
 from datahub.core.exceptions import DataHubException
+from datahub.core.utils import slice_iterable_into_chunks
+from datahub.feature_flag.utils import is_feature_flag_active
 from datahub.oauth.scopes import Scope
-from datahub.search.apps import get_global_search_apps_as_mapping
-from datahub.search.execute_query import execute_autocomplete_query, execute_search_query
+from datahub.search.apps import (
+    get_global_search_apps_as_mapping,
+    get_search_app_by_search_model,
+)
+from datahub.search.constants import BASIC_SEARCH_MULTI_SEARCH_FEATURE_FLAG
+from datahub.search.execute_query import (
+    execute_autocomplete_query,
+    execute_multi_search_query,
+    execute_prefix_autocomplete_query,
+    execute_search_query,
+)
+from datahub.search.instrumentation import SearchQueryLabels
 from datahub.search.permissions import (
     has_permissions_for_app,
     SearchAndExportPermissions,
     SearchPermissions,
 )
 from datahub.search.query_builder import (
+    get_basic_multi_search_query,
     get_basic_search_query,
     get_search_by_entities_query,
     limit_search_query,
+    limit_search_query_after,
+    MAX_RESULTS,
 )
 from datahub.search.serializers import (
     AutocompleteSearchQuerySerializer,
     BasicSearchQuerySerializer,
     EntitySearchQuerySerializer,
 )
-from datahub.search.utils import SearchOrdering
+from datahub.search.utils import encode_search_cursor, SearchOrdering
 from datahub.user_event_log.constants import UserEventType
 from datahub.user_event_log.utils import record_user_event
 
@@ -102,7 +117,7 @@ EntitySearch = namedtuple('EntitySearch', ['model', 'name'])
 v3_view_registry = {}
 v4_view_registry = {}
 
-SHARED_FIELDS_TO_EXCLUDE = ('_document_type',)
+SHARED_FIELDS_TO_EXCLUDE = ('_document_type', '_version_hash')
 
 
 class SearchBasicAPIView(APIView):
@@ -116,6 +131,7 @@ class SearchBasicAPIView(APIView):
 
     fields_to_exclude = (
         'export_countries',
+        'permitted_team_ids',
         'were_countries_discussed',
     )
 
@@ -130,27 +146,75 @@ class SearchBasicAPIView(APIView):
             *(self.fields_to_exclude or ()),
         )
 
-        query = get_basic_search_query(
-            entity=validated_params['entity'],
-            term=validated_params['term'],
-            permission_filters_by_entity=dict(_get_global_search_permission_filters(request)),
-            offset=validated_params['offset'],
-            limit=validated_params['limit'],
-            fields_to_exclude=fields_to_exclude,
-        )
-
-        results = execute_search_query(query)
-
-        response = {
-            'count': results.hits.total,
-            'results': [result.to_dict() for result in results.hits],
-            'aggregations': [{'count': x['doc_count'], 'entity': x['key']}
-                             for x in results.aggregations['count_by_type']['buckets']],
+        query_kwargs = {
+            'entity': validated_params['entity'],
+            'term': validated_params['term'],
+            'permission_filters_by_entity': dict(_get_global_search_permission_filters(request)),
+            'offset': validated_params['offset'],
+            'limit': validated_params['limit'],
+            'fields_to_exclude': fields_to_exclude,
         }
 
+        if is_feature_flag_active(BASIC_SEARCH_MULTI_SEARCH_FEATURE_FLAG):
+            response = _get_basic_search_response_using_multi_search(**query_kwargs)
+        else:
+            response = _get_basic_search_response(**query_kwargs)
+
         return Response(data=response)
 
 
+def _get_basic_search_response(**query_kwargs):
+    """Performs basic search using a single query across all entities."""
+    query = get_basic_search_query(**query_kwargs)
+    labels = SearchQueryLabels(
+        view=SearchBasicAPIView.__name__,
+        search_app=query_kwargs['entity'].get_app_name(),
+    )
+    results = execute_search_query(query, labels=labels)
+
+    return {
+        'count': results.hits.total,
+        'results': [result.to_dict() for result in results.hits],
+        'aggregations': [{'count': x['doc_count'], 'entity': x['key']}
+                         for x in results.aggregations['count_by_type']['buckets']],
+    }
+
+
+def _get_basic_search_response_using_multi_search(entity, **query_kwargs):
+    """
+    Performs basic search using a separate search for each entity in a single multi-search
+    request.
+
+    The response has the same format as _get_basic_search_response(). Aggregations are
+    ordered in the same way as a terms aggregation (by descending count, and then by entity).
+    """
+    multi_search, entity_names = get_basic_multi_search_query(entity, **query_kwargs)
+    labels = [
+        SearchQueryLabels(view=SearchBasicAPIView.__name__, search_app=entity_name)
+        for entity_name in entity_names
+    ]
+    # No searches are made if the user doesn't have access to any entities
+    responses = execute_multi_search_query(multi_search, labels=labels) if entity_names else []
+    responses_by_entity = dict(zip(entity_names, responses))
+    selected_response = responses_by_entity.get(entity.get_app_name())
+
+    counts_by_entity = (
+        (entity_name, response.hits.total)
+        for entity_name, response in responses_by_entity.items()
+    )
+    aggregations = [
+        {'count': count, 'entity': entity_name}
+        for entity_name, count in sorted(counts_by_entity, key=lambda item: (-item[1], item[0]))
+        if count
+    ]
+
+    return {
+        'count': selected_response.hits.total if selected_response else 0,
+        'results': [hit.to_dict() for hit in selected_response.hits] if selected_response else [],
+        'aggregations': aggregations,
+    }
+
+
 def _get_global_search_permission_filters(request):
     """
     Gets the permissions filters that should be applied to each search entity (to enforce
@@ -186,6 +250,8 @@ class SearchAPIView(APIView):
     serializer_class = EntitySearchQuerySerializer
     fields_to_include = None
     fields_to_exclude = None
+    # Whether to cache results for identical queries (see execute_search_query())
+    cache_results = False
 
     http_method_names = ('post',)
 
@@ -202,6 +268,15 @@ class SearchAPIView(APIView):
         """Returns entities"""
         return [self.search_app.es_model]
 
+    def _get_query_labels(self, validated_data):
+        ordering = validated_data['sortby']
+
+        return SearchQueryLabels(
+            view=self.__class__.__name__,
+            search_app=self.search_app.name,
+            sort_field=ordering.field if ordering else '_score',
+        )
+
     def validate_data(self, data):
         """Validate and clean data."""
         serializer = self.serializer_class(data=data)
@@ -243,24 +318,46 @@ class SearchAPIView(APIView):
 
         validated_data = self.validate_data(data)
         query = self.get_base_query(request, validated_data)
+        use_cursor = 'cursor' in validated_data
 
-        limited_query = limit_search_query(
-            query,
-            offset=validated_data['offset'],
-            limit=validated_data['limit'],
-        )
+        if use_cursor:
+            limited_query = limit_search_query_after(
+                query,
+                search_after=validated_data['cursor'],
+                limit=validated_data['limit'],
+            )
+        else:
+            limited_query = limit_search_query(
+                query,
+                offset=validated_data['offset'],
+                limit=validated_data['limit'],
+            )
 
-        results = execute_search_query(limited_query)
+        results = execute_search_query(
+            limited_query,
+            search_apps=self._get_cached_search_apps(),
+            labels=self._get_query_labels(validated_data),
+        )
 
         response = {
             'count': results.hits.total,
             'results': [x.to_dict() for x in results.hits],
         }
 
+        if use_cursor:
+            response['next_cursor'] = _get_next_cursor(results, validated_data['limit'])
+
         response = self.enhance_response(results, response)
 
         return Response(data=response)
 
+    def _get_cached_search_apps(self):
+        """Gets the search apps to key cached results on (or None if caching is disabled)."""
+        if not self.cache_results:
+            return None
+
+        return [get_search_app_by_search_model(entity) for entity in self.get_entities()]
+
     def enhance_response(self, results, response):
         """Placeholder for a method to enhance the response with custom data."""
         return response
@@ -270,31 +367,50 @@ class SearchAPIView(APIView):
         return self.serializer_class()
 
 
+def _get_next_cursor(results, limit):
+    """
+    Gets the cursor for the page of results following the current one.
+
+    None is returned if this is the last page.
+    """
+    hits = results.hits
+    if len(hits) < min(limit, MAX_RESULTS):
+        return None
+
+    return encode_search_cursor(list(hits[-1].meta.sort))
+
+
 class SearchExportAPIView(SearchAPIView):
-    """Returns CSV file with all search results."""
+    """
+    Returns CSV file with all search results.
+
+    The CSV file is streamed: search result IDs are fetched from Elasticsearch using the scroll
+    API and the corresponding rows are fetched from the database in chunks as the response is
+    written, so memory usage does not grow with the number of results.
+    """
 
     permission_classes = (IsAuthenticatedOrTokenHasScope, SearchAndExportPermissions)
     queryset = None
     field_titles = None
-    db_sort_by_remappings = {}
 
     def post(self, request, format=None):
         """Performs search and returns CSV file."""
         validated_data = self.validate_data(request.data)
 
-        es_query = self._get_es_query(request, validated_data)
-        ids = tuple(self._get_ids(es_query))
-        db_queryset = self._get_rows(ids, validated_data['sortby'])
+        base_query = self.get_base_query(request, validated_data)
+        num_results = min(base_query.count(), settings.SEARCH_EXPORT_MAX_RESULTS)
+        es_query = self._get_es_query(base_query)
+        rows = self._get_rows(self._get_ids(es_query))
         base_filename = self._get_base_filename()
 
         user_event_data = {
-            'num_results': len(ids),
+            'num_results': num_results,
             'args': validated_data,
         }
 
         record_user_event(request, UserEventType.SEARCH_EXPORT, data=user_event_data)
 
-        return create_csv_response(db_queryset, self.field_titles, base_filename)
+        return create_csv_response(rows, self.field_titles, base_filename)
 
     def _get_base_filename(self):
         """Gets the filename (without the .csv suffix) for the CSV file download."""
@@ -314,12 +430,9 @@ class SearchExportAPIView(SearchAPIView):
         for hit in islice(es_query.scan(), settings.SEARCH_EXPORT_MAX_RESULTS):
             yield hit.meta.id
 
-    def _get_es_query(self, request, validated_data):
-        """Gets a scannable Elasticsearch query for the current request."""
-        return self.get_base_query(
-            request,
-            validated_data,
-        ).source(
+    def _get_es_query(self, base_query):
+        """Gets a scannable Elasticsearch query from a base search query."""
+        return base_query.source(
             # Stops _source from being returned in the responses
             fields=False,
         ).params(
@@ -329,46 +442,36 @@ class SearchExportAPIView(SearchAPIView):
             size=settings.SEARCH_EXPORT_SCROLL_CHUNK_SIZE,
         )
 
-    def _get_rows(self, ids, search_ordering):
+    def _get_rows(self, ids):
         """
-        Returns an iterable using QuerySet.iterator() over the search results.
-
-        The search sort-by value is translated to a value compatible with the Django ORM and
-        applied to the query set to preserve the original sort order.
+        Returns an iterator over the database rows for the search results, in the order of the
+        search results.
 
-        At the moment, all rows are fetched in one query (using a server-side cursor) as
-        settings.SEARCH_EXPORT_MAX_RESULTS is set to a (relatively) low value.
+        IDs are consumed lazily, and the rows for each chunk of
+        settings.SEARCH_EXPORT_DB_CHUNK_SIZE IDs are fetched using a separate query and then put
+        back into search result order. Rows for objects that no longer exist are skipped.
         """
-        db_ordering = self._translate_search_ordering_to_django_ordering(search_ordering)
+        field_names = self.field_titles.keys()
+        include_pk = 'pk' in field_names
 
-        return self.queryset.filter(
-            pk__in=ids,
-        ).order_by(
-            *db_ordering,
-        ).values(
-            *self.field_titles.keys(),
-        ).iterator()
+        for id_chunk in slice_iterable_into_chunks(ids, settings.SEARCH_EXPORT_DB_CHUNK_SIZE):
+            rows = self.queryset.filter(pk__in=id_chunk).values('pk', *field_names)
+            rows_by_id = {
+                str(row['pk'] if include_pk else row.pop('pk')): row
+                for row in rows
+            }
 
-    def _translate_search_ordering_to_django_ordering(self, ordering):
-        """
-        Converts a sort-by value as used in the search API to a tuple of values that can be
-        passed to QuerySet.order_by().
-
-        Note that this relies on the same field names having been used; if they differ then you
-        should manually specify a remapping in the db_sort_by_remappings class attribute.
-        """
-        if not ordering:
-            return ()
-
-        auto_translated_field = ordering.field.replace('.', '__')
-        db_field = self.db_sort_by_remappings.get(ordering.field, auto_translated_field)
-        prefix = '-' if ordering.is_descending else ''
-
-        return f'{prefix}{db_field}', 'pk'
+            yield from (rows_by_id[id_] for id_ in id_chunk if id_ in rows_by_id)
 
 
 class AutocompleteSearchListAPIView(ListAPIView):
-    """Autocomplete search base list view for type ahead."""
+    """
+    Autocomplete search base list view for type ahead.
+
+    If the search app's ES model defines AUTOCOMPLETE_FIELDS, a prefix-based query (which
+    respects the search app's permission filters) is used. Otherwise, the completion suggester
+    is used (which supports context filters but not permission filters).
+    """
 
     search_app = None
     permission_classes = (IsAuthenticatedOrTokenHasScope, SearchPermissions)
@@ -381,22 +484,35 @@ class AutocompleteSearchListAPIView(ListAPIView):
         serializer.is_valid(raise_exception=True)
         validated_params = serializer.validated_data
 
-        self.check_permission_filters()
-        results = execute_autocomplete_query(
-            self.search_app.es_model,
-            validated_params['term'],
-            validated_params['limit'],
-            self.document_fields,
-            self.get_search_context(request.query_params),
-        )
+        if self.search_app.es_model.AUTOCOMPLETE_FIELDS:
+            results = execute_prefix_autocomplete_query(
+                self.search_app.es_model,
+                validated_params['term'],
+                validated_params['limit'],
+                self.document_fields,
+                self._get_permission_filters(),
+            )
+        else:
+            self.check_permission_filters()
+            suggestions = execute_autocomplete_query(
+                self.search_app.es_model,
+                validated_params['term'],
+                validated_params['limit'],
+                self.document_fields,
+                self.get_search_context(request.query_params),
+            )
+            results = [suggestion['_source'].to_dict() for suggestion in suggestions]
+
         return Response(data={
             'count': len(results),
-            'results': [result['_source'].to_dict() for result in results],
+            'results': results,
         })
 
     def get_search_context(self, query_params):
         """
         Add context (filters) to the autocomplete search if provided.
+
+        (Only used with the completion suggester.)
         """
         if not self.autocomplete_context_serializer_class:
             return {}